@@ -1,14 +1,14 @@
+import secrets
 from datetime import date, timedelta
-from io import BytesIO
-import html
 
-import qrcode
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import HTMLResponse, StreamingResponse
-from fpdf import FPDF
+from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
 
-from app.controllers.v2.licenses.licenses_receipt import generate_multi_license_pdf
+from app.controllers.v2.licenses.licenses_receipt import (
+    generate_multi_license_pdf,
+    render_single_license_pdf,
+)
 from app.db.database import get_db
 from app.models.licenses.licenses_model import (
     LicenseCreate,
@@ -18,6 +18,19 @@ from app.models.licenses.licenses_model import (
 )
 from app.schema.licenses.licenses_schema import License, OwnerLicense
 from app.utils.blob_upload import upload_to_blob
+from app.utils.qr_service import generate_qr_response
+from app.utils.receipt_store import (
+    from_iso,
+    publish_receipt,
+    register_receipt_renderer,
+)
+from app.utils.receipt_templates import (
+    datetime_text,
+    money,
+    render_receipt_html,
+    render_rows,
+)
+from app.utils.short_links import create_short_link
 
 
 router = APIRouter(
@@ -30,18 +43,6 @@ router = APIRouter(
 # HELPERS
 # =========================================================
 
-def _safe_html(value, fallback="-"):
-    if value is None:
-        return fallback
-
-    text = str(value).strip()
-
-    if not text:
-        return fallback
-
-    return html.escape(text)
-
-
 def _safe_amount(value):
     try:
         return float(value or 0)
@@ -49,568 +50,22 @@ def _safe_amount(value):
         return 0.0
 
 
-def _format_date(value):
-    if not value:
-        return "-"
-
-    try:
-        return value.strftime("%d/%m/%Y")
-    except (AttributeError, ValueError):
-        return _safe_html(value)
-
-
-def _generate_qr_response(url):
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-
-    qr.add_data(url)
-    qr.make(fit=True)
-
-    image = qr.make_image(
-        fill_color="black",
-        back_color="white",
-    )
-
-    buffer = BytesIO()
-    image.save(buffer, "PNG")
-    buffer.seek(0)
-
-    return StreamingResponse(
-        buffer,
-        media_type="image/png",
-    )
-
-
 def _build_single_license_html(
     license_obj,
     owner_name,
     pdf_url,
 ):
-    return f"""
-<!DOCTYPE html>
-<html lang="ms">
-<head>
-    <meta charset="utf-8">
-
-    <meta
-        name="viewport"
-        content="width=device-width, initial-scale=1"
-    >
-
-    <meta name="color-scheme" content="only light">
-
-    <title>
-        E-Resit Lesen /
-        License E-Receipt
-    </title>
-
-    <style>
-        * {{
-            box-sizing: border-box;
-        }}
-
-        html {{
-            color-scheme: only light;
-            background: #eef3f8;
-        }}
-
-        body {{
-            margin: 0;
-            padding: 28px 16px;
-            min-height: 100vh;
-            background:
-                linear-gradient(
-                    180deg,
-                    #eaf2ff 0%,
-                    #f7f9fc 100%
-                );
-            color: #111827;
-            font-family:
-                "Segoe UI",
-                Arial,
-                sans-serif;
-        }}
-
-        .page {{
-            width: 100%;
-            max-width: 860px;
-            margin: 0 auto;
-        }}
-
-        .receipt {{
-            background: #ffffff;
-            border: 1px solid #dfe7f2;
-            border-radius: 22px;
-            overflow: hidden;
-            box-shadow:
-                0 18px 45px
-                rgba(15, 23, 42, 0.12);
-        }}
-
-        .header {{
-            position: relative;
-            overflow: hidden;
-            padding: 34px 30px;
-            text-align: center;
-            color: #ffffff;
-            background:
-                linear-gradient(
-                    135deg,
-                    #003b8e,
-                    #0a66d8
-                );
-        }}
-
-        .header::after {{
-            content: "";
-            position: absolute;
-            width: 220px;
-            height: 220px;
-            right: -70px;
-            top: -90px;
-            border-radius: 50%;
-            background:
-                rgba(255, 255, 255, 0.08);
-        }}
-
-        .header-content {{
-            position: relative;
-            z-index: 1;
-        }}
-
-        .ms {{
-            font-weight: 700;
-        }}
-
-        .en {{
-            margin-top: 3px;
-            font-style: italic;
-            font-weight: 400;
-            color: #6b7280;
-            font-size: 0.88em;
-        }}
-
-        .header .ms {{
-            color: #ffffff;
-        }}
-
-        .header .en {{
-            color:
-                rgba(
-                    255,
-                    255,
-                    255,
-                    0.86
-                );
-        }}
-
-        .title .ms {{
-            font-size: 30px;
-            line-height: 1.1;
-        }}
-
-        .title .en {{
-            margin-top: 7px;
-            font-size: 17px;
-        }}
-
-        .subtitle {{
-            margin-top: 15px;
-        }}
-
-        .subtitle .ms {{
-            font-size: 14px;
-        }}
-
-        .subtitle .en {{
-            font-size: 12px;
-        }}
-
-        .content {{
-            padding: 30px;
-        }}
-
-        .summary-grid {{
-            display: grid;
-            grid-template-columns:
-                repeat(2, minmax(0, 1fr));
-            gap: 16px;
-        }}
-
-        .summary-card {{
-            padding: 16px;
-            border: 1px solid #dce8f8;
-            border-radius: 14px;
-            background: #f8fbff;
-        }}
-
-        .summary-card.full {{
-            grid-column: 1 / -1;
-        }}
-
-        .label {{
-            margin-bottom: 8px;
-        }}
-
-        .label .ms {{
-            color: #0f3f83;
-            font-size: 14px;
-        }}
-
-        .label .en {{
-            font-size: 12px;
-        }}
-
-        .value {{
-            color: #111827;
-            font-size: 16px;
-            font-weight: 600;
-            line-height: 1.45;
-            word-break: break-word;
-        }}
-
-        .amount-card {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            gap: 20px;
-            margin-top: 22px;
-            padding: 20px 22px;
-            border: 1px solid #bfd7ff;
-            border-left: 6px solid #0a66d8;
-            border-radius: 16px;
-            background:
-                linear-gradient(
-                    135deg,
-                    #eaf3ff,
-                    #f5f9ff
-                );
-        }}
-
-        .amount-label .ms {{
-            color: #0f3f83;
-            font-size: 17px;
-        }}
-
-        .amount-label .en {{
-            font-size: 13px;
-        }}
-
-        .amount-value {{
-            color: #0a56c2;
-            font-size: 30px;
-            font-weight: 800;
-            white-space: nowrap;
-        }}
-
-        .thank-you {{
-            margin-top: 28px;
-            text-align: center;
-            color: #15803d;
-        }}
-
-        .thank-you .ms {{
-            font-size: 19px;
-        }}
-
-        .thank-you .en {{
-            color: #2f855a;
-            font-size: 14px;
-        }}
-
-        .pdf-button {{
-            margin-top: 28px;
-            text-align: center;
-        }}
-
-        .pdf-button a {{
-            display: inline-block;
-            min-width: 260px;
-            padding: 14px 24px;
-            border-radius: 12px;
-            background:
-                linear-gradient(
-                    135deg,
-                    #16a34a,
-                    #22c55e
-                );
-            color: #ffffff;
-            text-decoration: none;
-            box-shadow:
-                0 8px 18px
-                rgba(34, 197, 94, 0.25);
-        }}
-
-        .pdf-button .ms,
-        .pdf-button .en {{
-            color: #ffffff;
-        }}
-
-        .footer {{
-            margin-top: 30px;
-            padding-top: 22px;
-            border-top: 1px solid #e5e7eb;
-            text-align: center;
-            color: #6b7280;
-            font-size: 13px;
-            line-height: 1.5;
-        }}
-
-        .footer .ms {{
-            color: #374151;
-        }}
-
-        @media (max-width: 680px) {{
-            body {{
-                padding: 12px;
-            }}
-
-            .header {{
-                padding: 28px 18px;
-            }}
-
-            .title .ms {{
-                font-size: 24px;
-            }}
-
-            .title .en {{
-                font-size: 15px;
-            }}
-
-            .content {{
-                padding: 20px 16px;
-            }}
-
-            .summary-grid {{
-                grid-template-columns: 1fr;
-            }}
-
-            .summary-card.full {{
-                grid-column: auto;
-            }}
-
-            .amount-card {{
-                display: block;
-                text-align: center;
-            }}
-
-            .amount-value {{
-                margin-top: 10px;
-                font-size: 27px;
-            }}
-
-            .pdf-button a {{
-                width: 100%;
-                min-width: 0;
-            }}
-        }}
-
-        @media print {{
-            body {{
-                padding: 0;
-                background: #ffffff;
-            }}
-
-            .receipt {{
-                border: none;
-                border-radius: 0;
-                box-shadow: none;
-            }}
-
-            .pdf-button {{
-                display: none;
-            }}
-        }}
-    </style>
-</head>
-
-<body>
-    <div class="page">
-        <div class="receipt">
-            <div class="header">
-                <div class="header-content">
-                    <div class="title">
-                        <div class="ms">
-                            E-Resit Lesen
-                        </div>
-
-                        <div class="en">
-                            License E-Receipt
-                        </div>
-                    </div>
-
-                    <div class="subtitle">
-                        <div class="ms">
-                            Rekod Transaksi Rasmi
-                        </div>
-
-                        <div class="en">
-                            Official Transaction Record
-                        </div>
-                    </div>
-                </div>
-            </div>
-
-            <div class="content">
-                <div class="summary-grid">
-                    <div class="summary-card">
-                        <div class="label">
-                            <div class="ms">
-                                No. Lesen
-                            </div>
-
-                            <div class="en">
-                                License No.
-                            </div>
-                        </div>
-
-                        <div class="value">
-                            {_safe_html(license_obj.licensenum)}
-                        </div>
-                    </div>
-
-                    <div class="summary-card">
-                        <div class="label">
-                            <div class="ms">
-                                Jenis Lesen
-                            </div>
-
-                            <div class="en">
-                                License Type
-                            </div>
-                        </div>
-
-                        <div class="value">
-                            {_safe_html(license_obj.licensetype)}
-                        </div>
-                    </div>
-
-                    <div class="summary-card">
-                        <div class="label">
-                            <div class="ms">
-                                No. IC Pemilik
-                            </div>
-
-                            <div class="en">
-                                Owner IC
-                            </div>
-                        </div>
-
-                        <div class="value">
-                            {_safe_html(license_obj.ic)}
-                        </div>
-                    </div>
-
-                    <div class="summary-card">
-                        <div class="label">
-                            <div class="ms">
-                                Nama Pemilik
-                            </div>
-
-                            <div class="en">
-                                Owner Name
-                            </div>
-                        </div>
-
-                        <div class="value">
-                            {_safe_html(owner_name)}
-                        </div>
-                    </div>
-
-                    <div class="summary-card">
-                        <div class="label">
-                            <div class="ms">
-                                Tarikh Mula
-                            </div>
-
-                            <div class="en">
-                                Start Date
-                            </div>
-                        </div>
-
-                        <div class="value">
-                            {_format_date(license_obj.start_date)}
-                        </div>
-                    </div>
-
-                    <div class="summary-card">
-                        <div class="label">
-                            <div class="ms">
-                                Tarikh Tamat
-                            </div>
-
-                            <div class="en">
-                                End Date
-                            </div>
-                        </div>
-
-                        <div class="value">
-                            {_format_date(license_obj.end_date)}
-                        </div>
-                    </div>
-                </div>
-
-                <div class="amount-card">
-                    <div class="amount-label">
-                        <div class="ms">
-                            Jumlah Dibayar
-                        </div>
-
-                        <div class="en">
-                            Total Paid
-                        </div>
-                    </div>
-
-                    <div class="amount-value">
-                        RM {_safe_amount(license_obj.amount):,.2f}
-                    </div>
-                </div>
-
-                <div class="thank-you">
-                    <div class="ms">
-                        Terima kasih atas pembayaran anda.
-                    </div>
-
-                    <div class="en">
-                        Thank you for your payment.
-                    </div>
-                </div>
-
-                <div class="pdf-button">
-                    <a
-                        href="{pdf_url}"
-                        target="_blank"
-                    >
-                        <div class="ms">
-                            Muat Turun Resit PDF
-                        </div>
-
-                        <div class="en">
-                            Download PDF Receipt
-                        </div>
-                    </a>
-                </div>
-
-                <div class="footer">
-                    <div class="ms">
-                        © 2026 Juara Inovasi Pasifik System
-                        · Hak Cipta Terpelihara
-                    </div>
-
-                    <div class="en">
-                        All Rights Reserved
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
+    return render_receipt_html(
+        "license_single",
+        licensenum=license_obj.licensenum,
+        licensetype=license_obj.licensetype,
+        ic=license_obj.ic,
+        owner_name=owner_name,
+        start_date=datetime_text(license_obj.start_date),
+        end_date=datetime_text(license_obj.end_date),
+        amount=money(license_obj.amount),
+        pdf_url=pdf_url,
+    )
 
 
 def _build_multi_license_html(
@@ -618,490 +73,27 @@ def _build_multi_license_html(
     total_amount,
     pdf_url,
 ):
-    rows_html = ""
-
-    for license_item in licenses_data:
-        rows_html += f"""
-        <tr>
-            <td>
-                {_safe_html(license_item.get("licensenumber"))}
-            </td>
-
-            <td>
-                {_safe_html(license_item.get("licensetype"))}
-            </td>
-
-            <td>
-                {_format_date(license_item.get("expired_date"))}
-            </td>
-
-            <td class="money">
-                RM {_safe_amount(license_item.get("amount")):,.2f}
-            </td>
-        </tr>
-        """
-
-    return f"""
-<!DOCTYPE html>
-<html lang="ms">
-<head>
-    <meta charset="utf-8">
-
-    <meta
-        name="viewport"
-        content="width=device-width, initial-scale=1"
-    >
-
-    <meta name="color-scheme" content="only light">
-
-    <title>
-        Resit Pelbagai Lesen /
-        Multiple License Receipt
-    </title>
-
-    <style>
-        * {{
-            box-sizing: border-box;
-        }}
-
-        html {{
-            color-scheme: only light;
-            background: #eef3f8;
-        }}
-
-        body {{
-            margin: 0;
-            padding: 28px 16px;
-            min-height: 100vh;
-            background:
-                linear-gradient(
-                    180deg,
-                    #eaf2ff 0%,
-                    #f7f9fc 100%
-                );
-            color: #111827;
-            font-family:
-                "Segoe UI",
-                Arial,
-                sans-serif;
-        }}
-
-        .page {{
-            width: 100%;
-            max-width: 980px;
-            margin: 0 auto;
-        }}
-
-        .receipt {{
-            background: #ffffff;
-            border: 1px solid #dfe7f2;
-            border-radius: 22px;
-            overflow: hidden;
-            box-shadow:
-                0 18px 45px
-                rgba(15, 23, 42, 0.12);
-        }}
-
-        .header {{
-            position: relative;
-            overflow: hidden;
-            padding: 34px 30px;
-            text-align: center;
-            color: #ffffff;
-            background:
-                linear-gradient(
-                    135deg,
-                    #003b8e,
-                    #0a66d8
-                );
-        }}
-
-        .header::after {{
-            content: "";
-            position: absolute;
-            width: 220px;
-            height: 220px;
-            right: -70px;
-            top: -90px;
-            border-radius: 50%;
-            background:
-                rgba(255, 255, 255, 0.08);
-        }}
-
-        .header-content {{
-            position: relative;
-            z-index: 1;
-        }}
-
-        .ms {{
-            font-weight: 700;
-        }}
-
-        .en {{
-            margin-top: 3px;
-            font-style: italic;
-            font-weight: 400;
-            color: #6b7280;
-            font-size: 0.88em;
-        }}
-
-        .header .ms {{
-            color: #ffffff;
-        }}
-
-        .header .en {{
-            color:
-                rgba(
-                    255,
-                    255,
-                    255,
-                    0.86
-                );
-        }}
-
-        .title .ms {{
-            font-size: 30px;
-            line-height: 1.1;
-        }}
-
-        .title .en {{
-            margin-top: 7px;
-            font-size: 17px;
-        }}
-
-        .subtitle {{
-            margin-top: 15px;
-        }}
-
-        .content {{
-            padding: 30px;
-        }}
-
-        .table-container {{
-            width: 100%;
-            overflow-x: auto;
-            border: 1px solid #dce8f8;
-            border-radius: 14px;
-        }}
-
-        table {{
-            width: 100%;
-            min-width: 760px;
-            border-collapse: collapse;
-        }}
-
-        th {{
-            padding: 14px 13px;
-            text-align: left;
-            vertical-align: middle;
-            color: #ffffff;
-            background: #0a66d8;
-        }}
-
-        th .ms {{
-            color: #ffffff;
-        }}
-
-        th .en {{
-            color:
-                rgba(
-                    255,
-                    255,
-                    255,
-                    0.85
-                );
-            font-size: 11px;
-        }}
-
-        td {{
-            padding: 14px 13px;
-            border-bottom: 1px solid #e5e7eb;
-            vertical-align: top;
-            font-size: 14px;
-        }}
-
-        tbody tr:nth-child(even) {{
-            background: #f8fbff;
-        }}
-
-        tbody tr:last-child td {{
-            border-bottom: none;
-        }}
-
-        .money {{
-            text-align: right;
-            white-space: nowrap;
-            color: #0a56c2;
-            font-weight: 700;
-        }}
-
-        .total-card {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            gap: 20px;
-            margin-top: 22px;
-            padding: 20px 22px;
-            border: 1px solid #bfd7ff;
-            border-left: 6px solid #0a66d8;
-            border-radius: 16px;
-            background:
-                linear-gradient(
-                    135deg,
-                    #eaf3ff,
-                    #f5f9ff
-                );
-        }}
-
-        .total-label .ms {{
-            color: #0f3f83;
-            font-size: 17px;
-        }}
-
-        .total-label .en {{
-            font-size: 13px;
-        }}
-
-        .total-value {{
-            color: #0a56c2;
-            font-size: 30px;
-            font-weight: 800;
-            white-space: nowrap;
-        }}
-
-        .thank-you {{
-            margin-top: 28px;
-            text-align: center;
-            color: #15803d;
-        }}
-
-        .thank-you .ms {{
-            font-size: 19px;
-        }}
-
-        .thank-you .en {{
-            color: #2f855a;
-            font-size: 14px;
-        }}
-
-        .pdf-button {{
-            margin-top: 28px;
-            text-align: center;
-        }}
-
-        .pdf-button a {{
-            display: inline-block;
-            min-width: 260px;
-            padding: 14px 24px;
-            border-radius: 12px;
-            background:
-                linear-gradient(
-                    135deg,
-                    #16a34a,
-                    #22c55e
-                );
-            color: #ffffff;
-            text-decoration: none;
-            box-shadow:
-                0 8px 18px
-                rgba(34, 197, 94, 0.25);
-        }}
-
-        .pdf-button .ms,
-        .pdf-button .en {{
-            color: #ffffff;
-        }}
-
-        .footer {{
-            margin-top: 30px;
-            padding-top: 22px;
-            border-top: 1px solid #e5e7eb;
-            text-align: center;
-            color: #6b7280;
-            font-size: 13px;
-            line-height: 1.5;
-        }}
-
-        .footer .ms {{
-            color: #374151;
-        }}
-
-        @media (max-width: 680px) {{
-            body {{
-                padding: 12px;
-            }}
-
-            .header {{
-                padding: 28px 18px;
-            }}
-
-            .title .ms {{
-                font-size: 24px;
-            }}
-
-            .title .en {{
-                font-size: 15px;
-            }}
-
-            .content {{
-                padding: 20px 16px;
-            }}
-
-            .total-card {{
-                display: block;
-                text-align: center;
-            }}
-
-            .total-value {{
-                margin-top: 10px;
-                font-size: 27px;
-            }}
-
-            .pdf-button a {{
-                width: 100%;
-                min-width: 0;
-            }}
-        }}
-    </style>
-</head>
-
-<body>
-    <div class="page">
-        <div class="receipt">
-            <div class="header">
-                <div class="header-content">
-                    <div class="title">
-                        <div class="ms">
-                            Resit Pelbagai Lesen
-                        </div>
-
-                        <div class="en">
-                            Multiple License Receipt
-                        </div>
-                    </div>
-
-                    <div class="subtitle">
-                        <div class="ms">
-                            Rekod Transaksi Rasmi
-                        </div>
-
-                        <div class="en">
-                            Official Transaction Record
-                        </div>
-                    </div>
-                </div>
-            </div>
-
-            <div class="content">
-                <div class="table-container">
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>
-                                    <div class="ms">
-                                        No. Lesen
-                                    </div>
-
-                                    <div class="en">
-                                        License Number
-                                    </div>
-                                </th>
-
-                                <th>
-                                    <div class="ms">
-                                        Jenis Lesen
-                                    </div>
-
-                                    <div class="en">
-                                        License Type
-                                    </div>
-                                </th>
-
-                                <th>
-                                    <div class="ms">
-                                        Tarikh Luput
-                                    </div>
-
-                                    <div class="en">
-                                        Expiry Date
-                                    </div>
-                                </th>
-
-                                <th style="text-align: right;">
-                                    <div class="ms">
-                                        Jumlah (RM)
-                                    </div>
-
-                                    <div class="en">
-                                        Amount (RM)
-                                    </div>
-                                </th>
-                            </tr>
-                        </thead>
-
-                        <tbody>
-                            {rows_html}
-                        </tbody>
-                    </table>
-                </div>
-
-                <div class="total-card">
-                    <div class="total-label">
-                        <div class="ms">
-                            Jumlah Keseluruhan
-                        </div>
-
-                        <div class="en">
-                            Total Amount
-                        </div>
-                    </div>
-
-                    <div class="total-value">
-                        RM {_safe_amount(total_amount):,.2f}
-                    </div>
-                </div>
-
-                <div class="thank-you">
-                    <div class="ms">
-                        Terima kasih atas pembayaran anda.
-                    </div>
-
-                    <div class="en">
-                        Thank you for your payment.
-                    </div>
-                </div>
-
-                <div class="pdf-button">
-                    <a
-                        href="{pdf_url}"
-                        target="_blank"
-                    >
-                        <div class="ms">
-                            Muat Turun Resit PDF
-                        </div>
-
-                        <div class="en">
-                            Download PDF Receipt
-                        </div>
-                    </a>
-                </div>
-
-                <div class="footer">
-                    <div class="ms">
-                        © 2026 Juara Inovasi Pasifik System
-                        · Hak Cipta Terpelihara
-                    </div>
-
-                    <div class="en">
-                        All Rights Reserved
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
+    rows = render_rows(
+        "license_multi_row",
+        (
+            {
+                "licensenumber": license_item.get("licensenumber"),
+                "licensetype": license_item.get("licensetype"),
+                "expired_date": datetime_text(
+                    license_item.get("expired_date")
+                ),
+                "amount": money(license_item.get("amount")),
+            }
+            for license_item in licenses_data
+        ),
+    )
+
+    return render_receipt_html(
+        "license_multi",
+        rows=rows,
+        total_amount=money(total_amount),
+        pdf_url=pdf_url,
+    )
 
 
 # =========================================================
@@ -1456,116 +448,27 @@ def view_license_receipt(
         else "N/A"
     )
 
-    pdf = FPDF()
-    pdf.add_page()
-
-    pdf.set_font(
-        "Arial",
-        "B",
-        16,
-    )
-
-    pdf.cell(
-        0,
-        10,
-        "E-Resit Lesen / License E-Receipt",
-        ln=True,
-        align="C",
-    )
-
-    pdf.ln(10)
-
-    pdf.set_font(
-        "Arial",
-        "",
-        12,
-    )
-
-    pdf.cell(
-        0,
-        8,
-        (
-            f"No. Lesen / License No: "
-            f"{license_obj.licensenum}"
-        ),
-        ln=True,
-    )
-
-    pdf.cell(
-        0,
-        8,
-        (
-            f"Jenis Lesen / License Type: "
-            f"{license_obj.licensetype}"
-        ),
-        ln=True,
-    )
-
-    pdf.cell(
-        0,
-        8,
-        (
-            f"No. IC Pemilik / Owner IC: "
-            f"{license_obj.ic}"
-        ),
-        ln=True,
-    )
-
-    pdf.cell(
-        0,
-        8,
-        (
-            f"Nama Pemilik / Owner Name: "
-            f"{owner_name}"
-        ),
-        ln=True,
-    )
-
-    pdf.cell(
-        0,
-        8,
-        (
-            f"Jumlah / Amount: "
-            f"RM {_safe_amount(license_obj.amount):.2f}"
-        ),
-        ln=True,
-    )
-
-    pdf.cell(
-        0,
-        8,
-        (
-            f"Tarikh Mula / Start Date: "
-            f"{_format_date(license_obj.start_date)}"
-        ),
-        ln=True,
-    )
-
-    pdf.cell(
-        0,
-        8,
-        (
-            f"Tarikh Tamat / End Date: "
-            f"{_format_date(license_obj.end_date)}"
-        ),
-        ln=True,
-    )
-
-    pdf_bytes = (
-        pdf.output(dest="S")
-        .encode("latin1")
+    pdf_bytes = render_single_license_pdf(
+        license_obj,
+        owner_name,
     )
 
     pdf_filename = (
         f"license_{license_obj.licensenum}.pdf"
     )
 
-    pdf_url = upload_to_blob(
+    upload_to_blob(
         pdf_filename,
         pdf_bytes,
         content_type="application/pdf",
     )
 
+    # Short link: the page may stay open past the SAS expiry.
+    pdf_url = create_short_link(
+        db,
+        pdf_filename,
+    )
+
     receipt_html = _build_single_license_html(
         license_obj,
         owner_name,
@@ -1581,6 +484,46 @@ def view_license_receipt(
 # MULTIPLE LICENSE RECEIPT QR
 # =========================================================
 
+def _stored_licenses(payload):
+    return [
+        {
+            **license_item,
+            "expired_date": from_iso(
+                license_item.get("expired_date"),
+                date.fromisoformat,
+            ),
+        }
+        for license_item in payload["licenses"]
+    ]
+
+
+def _render_multi_license_pdf(payload):
+    return generate_multi_license_pdf(
+        _stored_licenses(payload),
+        payload["total_amount"],
+    ).getvalue()
+
+
+def _render_multi_license_html(payload, pdf_url):
+    return _build_multi_license_html(
+        _stored_licenses(payload),
+        payload["total_amount"],
+        pdf_url,
+    )
+
+
+register_receipt_renderer(
+    "license_multi",
+    render_pdf=_render_multi_license_pdf,
+    render_html=_render_multi_license_html,
+    # No natural key: one blob pair per receipt, so an earlier
+    # link never shows a later receipt.
+    filename=lambda payload: (
+        f"multi_license_receipt_{secrets.token_urlsafe(9)}"
+    ),
+)
+
+
 @router.post("/receipt/qr/multi")
 def generate_multi_license_receipt(
     payload: dict,
@@ -1660,39 +603,17 @@ def generate_multi_license_receipt(
             license_obj.amount
         )
 
-    pdf_buffer = generate_multi_license_pdf(
-        licenses_data,
-        total_amount,
-    )
-
-    pdf_filename = (
-        "multi_license_receipt.pdf"
-    )
-
-    pdf_url = upload_to_blob(
-        pdf_filename,
-        pdf_buffer.getvalue(),
-        content_type="application/pdf",
-    )
-
-    receipt_html = _build_multi_license_html(
-        licenses_data,
-        total_amount,
-        pdf_url,
-    )
-
-    html_filename = (
-        "multi_license_receipt.html"
-    )
-
-    html_url = upload_to_blob(
-        html_filename,
-        receipt_html.encode("utf-8"),
-        content_type="text/html",
+    receipt_url = publish_receipt(
+        db,
+        "license_multi",
+        {
+            "licenses": licenses_data,
+            "total_amount": total_amount,
+        },
     )
 
-    return _generate_qr_response(
-        html_url
+    return generate_qr_response(
+        receipt_url
     )
 
 
@@ -1,113 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException 
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request 
 from fastapi.responses import HTMLResponse, StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from datetime import timedelta
 from app.db.database import get_db
 from app.schema.parking.parking_schema import Parking, PaymentStatusEnum
 # from app.utils.Malaysia_time import malaysia_now
 from app.utils.sirim_time import sirim_now_naive
-from app.schema.parking.transaction_parking_schema import TransactionParking, TicketOverviewEnum
 from app.models.parking.parking_model import (
+    ParkingBulkCheck,
     ParkingCheck,
     ParkingCreate,
     ParkingExtend,
+    ParkingQuote,
     ParkingResponse
 )
 
-import re
-
-from sqlalchemy import func
-
 import qrcode
 from io import BytesIO
 
 from app.utils.blob_upload import upload_to_blob
+from app.utils.parking_index import (
+    PARKING_FIELDS,
+    is_index_ready,
+    lookup_active_parking,
+    lookup_active_timeouts,
+)
+from app.utils.parking_expiry import (
+    expiring_now,
+    subscribe_expiry_events,
+    unsubscribe_expiry_events,
+)
+from app.utils.parking_payments import record_parking_payment
+from app.utils.plates import normalize_plate
+from app.utils.tariffs import quote_parking
+from app.utils.ticket_sequences import clean_terminal_id
 
 # ----------------- CONFIG -----------------
-from app.utils.config import BASE_URL, RATE_PER_HOUR
+from app.utils.config import BASE_URL
 
 router = APIRouter(prefix="/parking", tags=["Parking V2"])
 
-def calculate_amount(hours: float) -> float:
-    """Convert parking hours into RM amount."""
-    return round(hours * RATE_PER_HOUR, 2)
-
-
-def clean_terminal_id(terminal: str) -> str:
-    """
-    Clean terminal ID before placing it inside the ticket ID.
-
-    Examples:
-        "TIP 01" -> "TIP01"
-        "tip-01" -> "TIP-01"
-        "TIP_01" -> "TIP_01"
-    """
-    cleaned_terminal = re.sub(
-        r"[^A-Za-z0-9_-]",
-        "",
-        terminal.strip(),
-    ).upper()
-
-    return cleaned_terminal or "UNKNOWN"
-
-
-def generate_ticket_id(
-    db: Session,
-    terminal: str,
-    current_time=None,
-) -> str:
-    """
-    Ticket format:
-
-    P-YYYYMMDD-HHMMSS-TERMINAL-DAILYNUMBER
-
-    Daily number is separate for each terminal.
-
-    Examples:
-        P-20260710-103000-TIP01-01
-        P-20260710-103500-TIP01-02
-        P-20260710-104000-TIP02-01
-    """
-
-    # SIRIM time is the first priority.
-    now = current_time or sirim_now_naive()
-
-    date_part = now.strftime("%Y%m%d")
-    time_part = now.strftime("%H%M%S")
-    terminal_part = clean_terminal_id(terminal)
-
-    # Match tickets for this date and this exact terminal.
-    ticket_pattern = (
-        f"P-{date_part}-%-{terminal_part}-%"
-    )
-
-    terminal_daily_count = (
-        db.query(func.count(TransactionParking.id))
-        .filter(
-            TransactionParking.terminal == terminal_part,
-            TransactionParking.ticket_id.like(ticket_pattern),
-        )
-        .scalar()
-        or 0
-    )
-
-    next_daily_number = terminal_daily_count + 1
-    sequence_part = f"{next_daily_number:02d}"
-
-    return (
-        f"P-{date_part}-"
-        f"{time_part}-"
-        f"{terminal_part}-"
-        f"{sequence_part}"
-    )
-
-
-
-
 def get_latest_paid(db: Session, plate: str):
     return (
         db.query(Parking)
-        .filter(Parking.plate == plate, Parking.payment_status == PaymentStatusEnum.yes)  
+        .filter(Parking.plate_norm == normalize_plate(plate), Parking.payment_status == PaymentStatusEnum.yes)  
         .order_by(Parking.timeout.desc())
         .first()
     )
@@ -115,12 +54,38 @@ def get_latest_paid(db: Session, plate: str):
 
 def check_active_parking(db: Session, plate: str):
     now = sirim_now_naive()
+    # Answered from memory while the active-parking index is in sync.
+    if is_index_ready():
+        return lookup_active_parking(plate, now)
     latest = get_latest_paid(db, plate)
     if latest and now < latest.timeout:
-        return latest
+        return {field: getattr(latest, field) for field in PARKING_FIELDS}
     return None
 
 
+# Plates per IN (...) list when the bulk check has to query the database.
+BULK_CHECK_CHUNK = 1000
+
+def check_active_parkings(db: Session, plates: list[str], now):
+    """{plate_norm: timeout} for the (normalized) plates that have active paid parking."""
+    if is_index_ready():
+        return lookup_active_timeouts(plates, now)
+    active = {}
+    for start in range(0, len(plates), BULK_CHECK_CHUNK):
+        rows = (
+            db.query(Parking.plate_norm, func.max(Parking.timeout))
+            .filter(
+                Parking.plate_norm.in_(plates[start:start + BULK_CHECK_CHUNK]),
+                Parking.payment_status == PaymentStatusEnum.yes,
+                Parking.timeout > now,
+            )
+            .group_by(Parking.plate_norm)
+            .all()
+        )
+        active.update(rows)
+    return active
+
+
 
 def add_new_parking(
     db: Session,
@@ -131,50 +96,17 @@ def add_new_parking(
     order_no: str = None,
     bank_trx_no: str = None,
 ):
-    now = sirim_now_naive()
-    timeout = now + timedelta(hours=time_used)
-    amount = calculate_amount(time_used)
-
-    # Clean the terminal ID received from the frontend.
-    cleaned_terminal = clean_terminal_id(terminal)
-
-    new_parking = Parking(
-        plate=plate,
-        terminal=cleaned_terminal,
-        time_used=time_used,
-        timein=now,
-        timeout=timeout,
-        payment_status=PaymentStatusEnum.yes,
-        amount=amount,
-    )
-
-    db.add(new_parking)
-    db.commit()
-    db.refresh(new_parking)
-
-    next_ticket = generate_ticket_id(
-        db=db,
-        terminal=cleaned_terminal,
-        current_time=now,
-    )
-
-    transaction = TransactionParking(
-        ticket_id=next_ticket,
+    # Parking row, ticket number and transaction in one commit.
+    return record_parking_payment(
+        db,
         plate=plate,
-        terminal=cleaned_terminal,
         hours=time_used,
-        amount=amount,
+        terminal=terminal,
         transaction_type=transaction_type,
-        Ticket_Overview=TicketOverviewEnum.new,
         order_no=order_no,
         bank_trx_no=bank_trx_no,
-    )
+    )["parking"]
 
-    db.add(transaction)
-    db.commit()
-    db.refresh(transaction)
-
-    return new_parking
 
 def extend_parking(
     db: Session,
@@ -185,57 +117,17 @@ def extend_parking(
     order_no: str = None,
     bank_trx_no: str = None,
 ):
-    active = check_active_parking(db, plate)
-
-    # If parking is expired, create it as a new parking transaction.
-    if not active:
-        return add_new_parking(
-            db=db,
-            plate=plate,
-            time_used=hours,
-            terminal=terminal,
-            transaction_type=transaction_type,
-            order_no=order_no,
-            bank_trx_no=bank_trx_no,
-        )
-
-    now = sirim_now_naive()
-
-    # Clean the terminal ID received from the frontend.
-    cleaned_terminal = clean_terminal_id(terminal)
-
-    active.time_used += hours
-    active.timeout += timedelta(hours=hours)
-    active.amount = calculate_amount(active.time_used)
-    active.terminal = cleaned_terminal
-
-    db.commit()
-    db.refresh(active)
-
-    next_ticket = generate_ticket_id(
-        db=db,
-        terminal=cleaned_terminal,
-        current_time=now,
-    )
-
-    transaction = TransactionParking(
-        ticket_id=next_ticket,
-        terminal=cleaned_terminal,
+    # Starts a new parking when the active one has expired.
+    return record_parking_payment(
+        db,
         plate=plate,
         hours=hours,
-        amount=calculate_amount(hours),
+        terminal=terminal,
         transaction_type=transaction_type,
-        Ticket_Overview=TicketOverviewEnum.extend,
         order_no=order_no,
         bank_trx_no=bank_trx_no,
-    )
-
-    db.add(transaction)
-    db.commit()
-    db.refresh(transaction)
-
-    return active
-
+        extend=True,
+    )["parking"]
 
 
 def get_all_parkings(db: Session):
@@ -266,14 +158,84 @@ def check_parking_by_plate(plate: str, db: Session = Depends(get_db)):
         return active
     raise HTTPException(status_code=404, detail="Plate not active or new, proceed to payment")
 
+# Enforcement handhelds / ANPR cameras: many plates per request
+@router.post("/check/bulk")
+def check_parking_bulk(check: ParkingBulkCheck, db: Session = Depends(get_db)):
+    """
+    Check up to 5000 plates at once.
+    Streams one JSON line per plate (application/x-ndjson):
+    {"plate", "status": "active" | "inactive", "timeout", "remaining_minutes"}
+    """
+    plates = list(dict.fromkeys(check.plates))
+    now = sirim_now_naive()
+    active = check_active_parkings(db, list({normalize_plate(plate) for plate in plates}), now)
+
+    def lines():
+        for start in range(0, len(plates), 500):
+            chunk = []
+            for plate in plates[start:start + 500]:
+                timeout = active.get(normalize_plate(plate))
+                chunk.append(json.dumps({
+                    "plate": plate,
+                    "status": "active" if timeout else "inactive",
+                    "timeout": timeout.isoformat() if timeout else None,
+                    "remaining_minutes": int((timeout - now).total_seconds() // 60) if timeout else 0,
+                }))
+            yield "\n".join(chunk) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+# Enforcement officers: live feed instead of polling /parking/
+@router.get("/expiring/stream")
+async def stream_expiring_parkings(request: Request):
+    """
+    Server-sent events: "expiring" (EXPIRY_WARNING_MINUTES before the
+    timeout) and "expired", data = {id, event, plate, terminal, timeout,
+    remaining_minutes}. Starts with the plates already about to expire.
+    """
+    subscriber = subscribe_expiry_events()
+
+    async def events():
+        try:
+            for event in expiring_now():
+                yield f"event: {event['event']}\nid: {event['id']}\ndata: {json.dumps(event)}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscriber[1].get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['event']}\nid: {event['id']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            unsubscribe_expiry_events(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+# Kiosk price table: many durations priced in one call
+@router.post("/quote")
+def quote_parking_prices(quote: ParkingQuote, db: Session = Depends(get_db)):
+    """
+    Price each of quote.hours at the terminal's tariff, starting now.
+    With a plate that has active parking, prices extending it instead.
+    """
+    terminal = clean_terminal_id(quote.terminal)
+    active = check_active_parking(db, quote.plate) if quote.plate else None
+    if active:
+        quotes = quote_parking(db, active["tariff_terminal"] or active["terminal"], active["timein"], quote.hours, used_hours=active["time_used"])
+    else:
+        quotes = quote_parking(db, terminal, sirim_now_naive(), quote.hours)
+    return {"terminal": terminal, "plate": quote.plate, "extend": bool(active), "quotes": quotes}
+
 @router.post("/pay", response_model=ParkingResponse)
 def pay_parking(parking: ParkingCreate, db: Session = Depends(get_db)):
     """
     Pay for new parking. Will create new record only if no active paid parking exists.
     """
-    active = check_active_parking(db, parking.plate)  
-    if active:
-        raise HTTPException(status_code=400, detail=f"Parking already active until {active.timeout}")
+    # Fails with 400 while the plate still has active parking.
     return add_new_parking(db, parking.plate, parking.time_used, parking.terminal, parking.transaction_type,parking.order_no,parking.bank_trx_no,)  
 
 # ✅ changed path param name from parking_id -> plate
@@ -2,10 +2,8 @@ import re
 import requests
 import time
 
-from pathlib import Path
-
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, Response
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
@@ -18,7 +16,9 @@ from app.schema.pegepay.pegepay_schema import (
     PegepayOrder,
     PegepayToken,
 )
+from app.utils.assets import qr_guide_png
 from app.utils.config import refresh_token
+from app.utils.settlements import record_pegepay_settlement
 from app.utils.sirim_time import sirim_now_naive
 
 
@@ -357,46 +357,25 @@ def get_pegepay_token(db: Session):
 # QR GUIDE IMAGE
 # =========================================================
 
-# @router.get("/qr-guide")
-# def qr_guide():
-#     return FileResponse(
-#         "app/resources/images/qr_guide2.png",
-#         media_type="image/png",
-#     )
-
-
-APP_DIR = (
-    Path(__file__)
-    .resolve()
-    .parent          # pegepay
-    .parent          # v2
-    .parent          # controllers
-    .parent          # app
-)
-
-QR_GUIDE_IMAGE = APP_DIR / "resources" / "images" / "qr_guide2.png"
-
-
 @router.get("/qr-guide")
 def qr_guide():
-    print("APP DIR:", APP_DIR)
-    print("IMAGE PATH:", QR_GUIDE_IMAGE)
-    print("IMAGE EXISTS:", QR_GUIDE_IMAGE.is_file())
+    image_bytes = qr_guide_png()
 
-    if not QR_GUIDE_IMAGE.is_file():
+    if image_bytes is None:
         raise HTTPException(
             status_code=404,
-            detail=f"QR guide image not found: {QR_GUIDE_IMAGE}",
+            detail="QR guide image not found.",
         )
 
-    return FileResponse(
-        path=str(QR_GUIDE_IMAGE),
+    return Response(
+        content=image_bytes,
         media_type="image/png",
         headers={
             "Cache-Control": "no-store, no-cache, must-revalidate",
         },
     )
 
+
 # =========================================================
 # CREATE PEGE PAY ORDER
 # =========================================================
@@ -553,6 +532,16 @@ def create_order(
 
         if existing_order:
             existing_order.order_status = "successful"
+
+            # Counted like every successful order (settlements
+            # mirror the table).
+            record_pegepay_settlement(
+                db,
+                existing_order.order_no,
+                existing_order.terminal_id,
+                existing_order.order_amount,
+            )
+
             db.commit()
 
             print(
@@ -746,21 +735,41 @@ def check_order_status(
             ),
         }
 
-    db.query(PegepayOrder).filter_by(
-        order_no=body.order_no
-    ).update(
-        {
-            PegepayOrder.order_status:
-                order_status,
-            PegepayOrder.order_amount:
-                content.get("order_amount"),
-            PegepayOrder.store_id:
-                content.get("store_id"),
-            PegepayOrder.terminal_id:
-                content.get("terminal_id"),
-        }
+    values = {
+        PegepayOrder.order_status:
+            order_status,
+        PegepayOrder.order_amount:
+            content.get("order_amount"),
+        PegepayOrder.store_id:
+            content.get("store_id"),
+        PegepayOrder.terminal_id:
+            content.get("terminal_id"),
+    }
+
+    # Kiosks poll repeatedly: only the update that moves the
+    # order to successful adds it to the settlement rollup.
+    newly_successful = (
+        db.query(PegepayOrder)
+        .filter(
+            PegepayOrder.order_no == body.order_no,
+            PegepayOrder.order_status != order_status,
+        )
+        .update(values)
     )
 
+    if newly_successful:
+        record_pegepay_settlement(
+            db,
+            body.order_no,
+            content.get("terminal_id"),
+            content.get("order_amount"),
+        )
+
+    else:
+        db.query(PegepayOrder).filter_by(
+            order_no=body.order_no
+        ).update(values)
+
     db.commit()
 
     return {
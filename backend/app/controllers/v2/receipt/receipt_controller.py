@@ -0,0 +1,212 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import HTMLResponse, RedirectResponse
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.schema.receipt.receipt_schema import ReceiptRecord
+from app.security.receipt_signing import (
+    require_valid_receipt_signature,
+)
+from app.utils.receipt_store import (
+    RECEIPT_RENDERERS,
+    get_cached_receipt,
+    get_receipt_html,
+    get_receipt_pdf_url,
+)
+from app.utils.receipt_templates import (
+    STYLESHEET_CACHE_CONTROL,
+    receipt_stylesheet,
+)
+
+
+router = APIRouter(
+    prefix="/receipts",
+    tags=["Receipt V2"],
+)
+
+
+# =========================================================
+# HELPERS
+# =========================================================
+
+def _get_receipt_record(
+    db: Session,
+    receipt_id: str,
+):
+    """
+    Stored receipt, or 404. The caller checks the signature.
+    """
+
+    record = (
+        db.query(ReceiptRecord)
+        .filter(
+            ReceiptRecord.receipt_id
+            == receipt_id
+        )
+        .first()
+    )
+
+    if (
+        not record
+        or record.receipt_type
+        not in RECEIPT_RENDERERS
+    ):
+        raise HTTPException(
+            status_code=404,
+            detail=(
+                "Resit tidak dijumpai / "
+                "Receipt not found"
+            ),
+        )
+
+    return record
+
+
+def _etag_matches(
+    if_none_match: str | None,
+    etag: str,
+) -> bool:
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return etag in (
+        candidate.strip().removeprefix("W/")
+        for candidate in if_none_match.split(",")
+    )
+
+
+# =========================================================
+# RECEIPT STYLESHEET
+# =========================================================
+#
+# Shared by every HTML receipt (eager uploads included), so it
+# is public and needs no signature. Declared before the
+# /{receipt_id} routes.
+# =========================================================
+
+@router.get("/assets/receipt.{fingerprint}.css")
+def get_receipt_stylesheet(
+    fingerprint: str,
+    accept_encoding: str = Header(None),
+    if_none_match: str = Header(None),
+):
+    stylesheet = receipt_stylesheet()
+    etag = f'"{stylesheet["fingerprint"]}"'
+
+    # Receipts uploaded before a style change still link the
+    # old fingerprint: give them the current styles, but only
+    # cache them briefly.
+    headers = {
+        "Cache-Control": (
+            STYLESHEET_CACHE_CONTROL
+            if fingerprint == stylesheet["fingerprint"]
+            else "public, max-age=300"
+        ),
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+    }
+
+    if _etag_matches(if_none_match, etag):
+        return Response(
+            status_code=304,
+            headers=headers,
+        )
+
+    content = stylesheet["css"]
+
+    if "gzip" in (accept_encoding or ""):
+        content = stylesheet["gzip"]
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(
+        content=content,
+        media_type="text/css",
+        headers=headers,
+    )
+
+
+# =========================================================
+# VIEW RECEIPT HTML
+# =========================================================
+
+# Browsers keep the page but ask again on every open; an
+# unchanged receipt is answered with 304 and no body.
+RECEIPT_CACHE_CONTROL = "private, no-cache"
+
+
+@router.get(
+    "/{receipt_id}",
+    response_class=HTMLResponse,
+)
+def view_receipt(
+    receipt_id: str,
+    sig: str = None,
+    if_none_match: str = Header(None),
+    db: Session = Depends(get_db),
+):
+    require_valid_receipt_signature(
+        receipt_id,
+        sig,
+    )
+
+    # Repeat opens are served from memory without a query.
+    rendered = get_cached_receipt(receipt_id)
+
+    if rendered is None:
+        record = _get_receipt_record(
+            db,
+            receipt_id,
+        )
+
+        db.expunge(record)
+        db.close()
+
+        rendered = get_receipt_html(record)
+
+    headers = {
+        "ETag": rendered["etag"],
+        "Cache-Control": RECEIPT_CACHE_CONTROL,
+    }
+
+    if _etag_matches(if_none_match, rendered["etag"]):
+        return Response(
+            status_code=304,
+            headers=headers,
+        )
+
+    return HTMLResponse(
+        content=rendered["html"],
+        headers=headers,
+    )
+
+
+# =========================================================
+# DOWNLOAD RECEIPT PDF
+# =========================================================
+
+@router.get("/{receipt_id}/pdf")
+def download_receipt_pdf(
+    receipt_id: str,
+    sig: str = None,
+    db: Session = Depends(get_db),
+):
+    require_valid_receipt_signature(
+        receipt_id,
+        sig,
+    )
+
+    record = _get_receipt_record(
+        db,
+        receipt_id,
+    )
+
+    return RedirectResponse(
+        url=get_receipt_pdf_url(
+            db,
+            record,
+        ),
+        status_code=302,
+    )
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import RedirectResponse
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.utils.short_links import SHORT_LINK_ROUTE, resolve_short_link
+
+
+# Mounted at the root, outside /api/v2: the code itself is
+# the credential, and phones cannot sign requests.
+router = APIRouter(
+    prefix=SHORT_LINK_ROUTE,
+    tags=["Short Link"],
+)
+
+
+# =========================================================
+# RESOLVE SHORT LINK
+# =========================================================
+
+@router.get("/{code}")
+def open_short_link(
+    code: str,
+    db: Session = Depends(get_db),
+):
+    url = resolve_short_link(
+        db,
+        code,
+    )
+
+    if not url:
+        raise HTTPException(
+            status_code=404,
+            detail=(
+                "Pautan tidak dijumpai / "
+                "Link not found"
+            ),
+        )
+
+    # The target is re-signed over time, never cache the redirect.
+    return RedirectResponse(
+        url=url,
+        status_code=302,
+        headers={
+            "Cache-Control": "no-store",
+        },
+    )
@@ -0,0 +1,54 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.utils.settlements import read_settlement
+
+
+router = APIRouter(
+    prefix="/settlements",
+    tags=["Settlement V2"],
+)
+
+
+# =========================================================
+# DAILY SETTLEMENT
+# =========================================================
+
+@router.get("/{day}")
+def get_daily_settlement(
+    day: date,
+    terminal: str | None = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Payments taken on a day (YYYY-MM-DD), per terminal, module
+    and payment type, from the settlement rollups. Pass
+    ?terminal= for one terminal; terminal "" holds the modules
+    that do not record one.
+    """
+
+    rows = read_settlement(
+        db,
+        day,
+        terminal,
+    )
+
+    return {
+        "day": day,
+        "terminal": terminal,
+        "total_count": sum(
+            row["count"]
+            for row in rows
+        ),
+        "total_amount": round(
+            sum(
+                row["amount"]
+                for row in rows
+            ),
+            2,
+        ),
+        "rows": rows,
+    }
@@ -1,16 +1,14 @@
-from datetime import datetime, timedelta
-from io import BytesIO
-from typing import List
-import html
+import secrets
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 
-import qrcode
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.controllers.v2.tax.tax_receipt import generate_multi_tax_pdf
 from app.controllers.v2.tax.tax_receipt_bentong import generate_tax_receipt_bentong
-from app.db.database import get_db
+from app.db.database import SessionLocal, get_db
 from app.models.tax.tax_model import (
     OwnerCreate,
     PropertyCreate,
@@ -23,7 +21,28 @@ from app.schema.tax.tax_schema import (
     PaymentUpdatesCukaiTaksiranBentong,
     Property,
 )
-from app.utils.blob_upload import upload_to_blob
+from app.utils.bulk_receipts import (
+    count_bentong_tax_orders,
+    iter_bentong_tax_batches,
+    print_progress,
+    render_bentong_tax_job,
+    stream_receipt_zip,
+)
+from app.utils.qr_service import generate_qr_response
+from app.utils.receipt_store import (
+    from_iso,
+    publish_receipt,
+    register_receipt_renderer,
+)
+from app.utils.receipt_templates import (
+    SafeHTML,
+    datetime_text,
+    money,
+    render_fragment,
+    render_receipt_html,
+    render_rows,
+)
+from app.utils.settlements import record_settlement
 
 
 router = APIRouter(
@@ -36,18 +55,6 @@ router = APIRouter(
 # HELPERS
 # =========================================================
 
-def _safe_html(value, fallback="-"):
-    if value is None:
-        return fallback
-
-    text = str(value).strip()
-
-    if not text:
-        return fallback
-
-    return html.escape(text)
-
-
 def _safe_float(value):
     try:
         return float(value or 0)
@@ -71,32 +78,6 @@ def _parse_paid_date(value):
         )
 
 
-def _generate_qr_response(url):
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-
-    qr.add_data(url)
-    qr.make(fit=True)
-
-    image = qr.make_image(
-        fill_color="black",
-        back_color="white",
-    )
-
-    buffer = BytesIO()
-    image.save(buffer, "PNG")
-    buffer.seek(0)
-
-    return StreamingResponse(
-        buffer,
-        media_type="image/png",
-    )
-
-
 # =========================================================
 # OWNER
 # =========================================================
@@ -335,624 +316,84 @@ def generate_tax_receipt_bentong_html(
         for item in tax_items
     )
 
-    rows_html = ""
-
-    for index, item in enumerate(
-        tax_items,
-        start=1,
-    ):
-        account_number = _safe_html(
-            item.get("account_number")
-        )
-
-        owner_name = _safe_html(
-            item.get("owner_name")
-        )
-
-        property_address = _safe_html(
-            item.get("property_address")
-        )
+    rows = render_rows(
+        "tax_bentong_row",
+        (
+            {
+                "index": index,
+                "account_number": item.get("account_number"),
+                "owner_name": item.get("owner_name"),
+                "property_address": item.get("property_address"),
+                "amount": money(item.get("amount")),
+            }
+            for index, item in enumerate(
+                tax_items,
+                start=1,
+            )
+        ),
+    )
 
-        amount = _safe_float(
-            item.get("amount")
+    bank_row = (
+        render_fragment(
+            "tax_bentong_bank",
+            bank_trx_no=bank_trx_no,
         )
+        if bank_trx_no
+        else SafeHTML()
+    )
 
-        rows_html += f"""
-        <tr>
-            <td class="number-cell">{index}</td>
-
-            <td class="item-cell">
-                <div class="item-title">
-                    <div class="ms">Cukai Taksiran</div>
-                    <div class="en">Assessment Tax</div>
-                </div>
-
-                <div class="field">
-                    <div class="field-label">
-                        <div class="ms">Nombor Akaun</div>
-                        <div class="en">Account Number</div>
-                    </div>
-
-                    <div class="field-value">
-                        {account_number}
-                    </div>
-                </div>
-
-                <div class="field">
-                    <div class="field-label">
-                        <div class="ms">Nama Pemilik</div>
-                        <div class="en">Owner Name</div>
-                    </div>
-
-                    <div class="field-value">
-                        {owner_name}
-                    </div>
-                </div>
-
-                <div class="field address-field">
-                    <div class="field-label">
-                        <div class="ms">Alamat Harta</div>
-                        <div class="en">Property Address</div>
-                    </div>
-
-                    <div class="field-value address">
-                        {property_address}
-                    </div>
-                </div>
-            </td>
-
-            <td class="amount-cell">
-                RM {amount:,.2f}
-            </td>
-        </tr>
-        """
-
-    bank_html = ""
-
-    if bank_trx_no:
-        bank_html = f"""
-        <div class="meta-row">
-            <div class="meta-label">
-                <div class="ms">No. Transaksi Bank</div>
-                <div class="en">Bank Transaction No.</div>
-            </div>
-
-            <div class="meta-value">
-                {_safe_html(bank_trx_no)}
-            </div>
-        </div>
-        """
-
-    return f"""
-<!DOCTYPE html>
-<html lang="ms">
-<head>
-    <meta charset="utf-8">
-
-    <meta
-        name="viewport"
-        content="width=device-width, initial-scale=1"
-    >
-
-    <meta name="color-scheme" content="only light">
-
-    <title>
-        Resit Cukai Taksiran /
-        Assessment Tax Receipt
-    </title>
-
-    <style>
-        * {{
-            box-sizing: border-box;
-        }}
-
-        body {{
-            margin: 0;
-            padding: 30px;
-            background: #eef3f8;
-            font-family: Arial, Helvetica, sans-serif;
-            color: #222222;
-        }}
-
-        .receipt {{
-            max-width: 880px;
-            margin: auto;
-            background: #ffffff;
-            border-radius: 18px;
-            overflow: hidden;
-            box-shadow: 0 8px 25px rgba(0, 0, 0, 0.10);
-        }}
-
-        .header {{
-            background:
-                linear-gradient(
-                    135deg,
-                    #12a8e0,
-                    #083b73
-                );
-            color: #ffffff;
-            padding: 30px 40px;
-            text-align: center;
-        }}
-
-        .header .ms {{
-            color: #ffffff;
-        }}
-
-        .header .en {{
-            color: rgba(255, 255, 255, 0.88);
-        }}
-
-        .council-title {{
-            font-size: 23px;
-            margin-bottom: 6px;
-        }}
-
-        .header-address {{
-            margin-top: 10px;
-            font-size: 13px;
-            line-height: 1.5;
-        }}
-
-        .content {{
-            padding: 35px 40px;
-        }}
-
-        .ms {{
-            font-weight: 700;
-        }}
-
-        .en {{
-            margin-top: 2px;
-            font-style: italic;
-            font-weight: 400;
-            color: #6b7280;
-            font-size: 0.88em;
-        }}
-
-        .title-row {{
-            display: flex;
-            justify-content: space-between;
-            gap: 30px;
-            border-bottom: 1px solid #e5e7eb;
-            padding-bottom: 24px;
-            flex-wrap: wrap;
-        }}
-
-        .receipt-title .ms {{
-            color: #083b73;
-            font-size: 34px;
-            line-height: 1;
-        }}
-
-        .receipt-title .en {{
-            color: #2f80ed;
-            font-size: 18px;
-            margin-top: 6px;
-        }}
-
-        .receipt-no {{
-            color: #4b5563;
-            font-weight: 700;
-            margin-top: 12px;
-        }}
-
-        .meta {{
-            min-width: 300px;
-        }}
-
-        .meta-row {{
-            display: grid;
-            grid-template-columns: 150px 1fr;
-            gap: 18px;
-            margin-bottom: 13px;
-            align-items: start;
-        }}
-
-        .meta-label {{
-            color: #111827;
-        }}
-
-        .meta-value {{
-            color: #374151;
-            word-break: break-word;
-        }}
-
-        .table-container {{
-            width: 100%;
-            overflow-x: auto;
-            margin-top: 30px;
-            border: 1px solid #e5e7eb;
-            border-radius: 12px;
-        }}
-
-        table {{
-            width: 100%;
-            min-width: 720px;
-            border-collapse: collapse;
-        }}
-
-        th {{
-            background: #083b73;
-            color: #ffffff;
-            padding: 14px 13px;
-            text-align: left;
-            vertical-align: middle;
-        }}
-
-        th .ms {{
-            color: #ffffff;
-        }}
-
-        th .en {{
-            color: rgba(255, 255, 255, 0.85);
-        }}
-
-        td {{
-            padding: 18px 13px;
-            border-bottom: 1px solid #eeeeee;
-            vertical-align: top;
-            font-size: 14px;
-        }}
-
-        tbody tr:nth-child(even) {{
-            background: #f8fbff;
-        }}
-
-        tbody tr:last-child td {{
-            border-bottom: none;
-        }}
-
-        .number-cell {{
-            width: 55px;
-            font-weight: 700;
-            color: #083b73;
-        }}
-
-        .item-cell {{
-            min-width: 440px;
-        }}
-
-        .item-title {{
-            margin-bottom: 14px;
-        }}
-
-        .item-title .ms {{
-            color: #083b73;
-            font-size: 16px;
-        }}
-
-        .item-title .en {{
-            font-size: 13px;
-        }}
-
-        .field {{
-            display: grid;
-            grid-template-columns: 160px 1fr;
-            gap: 18px;
-            margin-top: 10px;
-            align-items: start;
-        }}
-
-        .field-label {{
-            color: #111827;
-        }}
-
-        .field-value {{
-            color: #374151;
-            line-height: 1.45;
-            word-break: break-word;
-        }}
-
-        .address {{
-            color: #4b5563;
-        }}
-
-        .amount-cell {{
-            width: 145px;
-            text-align: right;
-            white-space: nowrap;
-            font-weight: 700;
-            color: #083b73;
-        }}
-
-        .total {{
-            background: #083b73;
-            color: #ffffff;
-            margin-top: 25px;
-            padding: 18px 20px;
-            border-radius: 12px;
-            display: flex;
-            justify-content: space-between;
-            gap: 20px;
-            align-items: center;
-        }}
-
-        .total .ms,
-        .total .en {{
-            color: #ffffff;
-        }}
-
-        .total-value {{
-            font-size: 24px;
-            font-weight: 700;
-            white-space: nowrap;
-        }}
-
-        .note {{
-            text-align: center;
-            color: #666666;
-            font-size: 12px;
-            margin-top: 27px;
-            line-height: 1.5;
-            padding: 0 20px;
-        }}
-
-        .note .ms {{
-            color: #4b5563;
-        }}
-
-        .note .en {{
-            margin-top: 7px;
-            color: #6b7280;
-        }}
-
-        .download {{
-            text-align: center;
-            margin-top: 30px;
-        }}
-
-        .download a {{
-            display: inline-block;
-            background: #27ae60;
-            color: #ffffff;
-            padding: 14px 26px;
-            border-radius: 12px;
-            text-decoration: none;
-            font-size: 17px;
-        }}
-
-        .download a .ms,
-        .download a .en {{
-            color: #ffffff;
-        }}
-
-        .footer {{
-            background: #f6f8fb;
-            text-align: center;
-            padding: 24px;
-            color: #666666;
-            font-size: 13px;
-            line-height: 1.5;
-        }}
-
-        .footer .ms {{
-            color: #083b73;
-        }}
-
-        .footer .en {{
-            margin-bottom: 8px;
-        }}
-
-        @media (max-width: 650px) {{
-            body {{
-                padding: 12px;
-            }}
-
-            .header {{
-                padding: 25px 18px;
-            }}
-
-            .content {{
-                padding: 25px 18px;
-            }}
-
-            .meta {{
-                min-width: 100%;
-            }}
-
-            .meta-row {{
-                display: block;
-            }}
-
-            .meta-value {{
-                margin-top: 5px;
-            }}
-
-            .total {{
-                display: block;
-                text-align: center;
-            }}
-
-            .total-value {{
-                margin-top: 10px;
-            }}
-        }}
-    </style>
-</head>
-
-<body>
-    <div class="receipt">
-        <div class="header">
-            <div class="council-title">
-                <div class="ms">
-                    Majlis Perbandaran Bentong
-                </div>
-
-                <div class="en">
-                    Bentong Municipal Council
-                </div>
-            </div>
-
-            <div class="header-address">
-                Jalan Ketari,
-                28700 Bentong,
-                Pahang Darul Makmur
-            </div>
-        </div>
-
-        <div class="content">
-            <div class="title-row">
-                <div class="receipt-title">
-                    <div class="ms">Resit</div>
-                    <div class="en">Receipt</div>
-
-                    <div class="receipt-no">
-                        #{_safe_html(order_no)}
-                    </div>
-                </div>
-
-                <div class="meta">
-                    <div class="meta-row">
-                        <div class="meta-label">
-                            <div class="ms">
-                                Dibayar pada
-                            </div>
-
-                            <div class="en">
-                                Paid at
-                            </div>
-                        </div>
-
-                        <div class="meta-value">
-                            {paid_date.strftime("%d %b %Y")}
-                        </div>
-                    </div>
-
-                    <div class="meta-row">
-                        <div class="meta-label">
-                            <div class="ms">
-                                Kaedah Pembayaran
-                            </div>
-
-                            <div class="en">
-                                Payment Method
-                            </div>
-                        </div>
-
-                        <div class="meta-value">
-                            {_safe_html(payment_method)}
-                        </div>
-                    </div>
-
-                    {bank_html}
-                </div>
-            </div>
-
-            <div class="table-container">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>
-                                <div class="ms">Bil.</div>
-                                <div class="en">No.</div>
-                            </th>
-
-                            <th>
-                                <div class="ms">Butiran</div>
-                                <div class="en">Item</div>
-                            </th>
-
-                            <th style="text-align: right;">
-                                <div class="ms">Jumlah</div>
-                                <div class="en">Amount</div>
-                            </th>
-                        </tr>
-                    </thead>
-
-                    <tbody>
-                        {rows_html}
-                    </tbody>
-                </table>
-            </div>
-
-            <div class="total">
-                <div>
-                    <div class="ms">
-                        Jumlah Keseluruhan
-                    </div>
-
-                    <div class="en">
-                        Total Amount
-                    </div>
-                </div>
-
-                <div class="total-value">
-                    RM {total_amount:,.2f}
-                </div>
-            </div>
-
-            <div class="note">
-                <div class="ms">
-                    Sila maklum bahawa bagi pelanggan yang
-                    membuat pembayaran, kemas kini baki akaun
-                    akan diproses pada hari berikutnya.
-                </div>
-
-                <div class="en">
-                    Please be informed that for customers making
-                    payments, the account balance update will be
-                    processed on the following day.
-                </div>
-            </div>
-
-            <div class="download">
-                <a
-                    href="{pdf_url}"
-                    target="_blank"
-                    download
-                >
-                    <div class="ms">
-                        Muat Turun Resit PDF
-                    </div>
-
-                    <div class="en">
-                        Download PDF Receipt
-                    </div>
-                </a>
-            </div>
-        </div>
-
-        <div class="footer">
-            <div class="ms">
-                Majlis Perbandaran Bentong
-            </div>
-
-            <div class="en">
-                Bentong Municipal Council
-            </div>
-
-            Jalan Ketari,
-            28700 Bentong,
-            Pahang Darul Makmur
-
-            <br>
-
-            <strong>Telefon:</strong>
-            04-5497555
-            &nbsp;|&nbsp;
-            <strong>Aplikasi:</strong>
-            TIP Bentong
-
-            <br>
-
-            <em>
-                Telephone: 04-5497555 |
-                Application: TIP Bentong
-            </em>
-        </div>
-    </div>
-</body>
-</html>
-"""
+    return render_receipt_html(
+        "tax_bentong",
+        order_no=order_no,
+        paid_date=datetime_text(paid_date, "%d %b %Y"),
+        payment_method=payment_method,
+        bank_row=bank_row,
+        rows=rows,
+        total_amount=money(total_amount),
+        pdf_url=pdf_url,
+    )
 
 
 # =========================================================
 # BENTONG TAX RECEIPT PDF + HTML + QR
 # =========================================================
 
+def _render_bentong_tax_pdf(payload):
+    return generate_tax_receipt_bentong(
+        paid_date=from_iso(payload["paid_date"]),
+        payment_method=payload["payment_method"],
+        tax_items=payload["tax_items"],
+        order_no=payload["order_no"],
+        bank_trx_no=payload["bank_trx_no"],
+    )
+
+
+def _render_bentong_tax_html(payload, pdf_url):
+    return generate_tax_receipt_bentong_html(
+        paid_date=from_iso(payload["paid_date"]),
+        payment_method=payload["payment_method"],
+        tax_items=payload["tax_items"],
+        pdf_url=pdf_url,
+        order_no=payload["order_no"],
+        bank_trx_no=payload["bank_trx_no"],
+    )
+
+
+register_receipt_renderer(
+    "tax_bentong",
+    render_pdf=_render_bentong_tax_pdf,
+    render_html=_render_bentong_tax_html,
+    filename=lambda payload: (
+        f"bentong_tax_receipt_{payload['order_no']}"
+    ),
+)
+
+
 @router.post("/receipt/qr/bentong")
-def generate_bentong_tax_receipt(payload: dict):
+def generate_bentong_tax_receipt(
+    payload: dict,
+    db: Session = Depends(get_db),
+):
     order_no = payload.get("order_no")
     paid_date_raw = payload.get("paid_date")
     payment_method = payload.get(
@@ -1024,47 +465,20 @@ def generate_bentong_tax_receipt(payload: dict):
         paid_date_raw
     )
 
-    pdf_bytes = generate_tax_receipt_bentong(
-        paid_date=paid_date,
-        payment_method=payment_method,
-        tax_items=tax_items,
-        order_no=order_no,
-        bank_trx_no=bank_trx_no,
+    receipt_url = publish_receipt(
+        db,
+        "tax_bentong",
+        {
+            "order_no": order_no,
+            "paid_date": paid_date,
+            "payment_method": payment_method,
+            "bank_trx_no": bank_trx_no,
+            "tax_items": tax_items,
+        },
     )
 
-    pdf_filename = (
-        f"bentong_tax_receipt_{order_no}.pdf"
-    )
-
-    pdf_url = upload_to_blob(
-        pdf_filename,
-        pdf_bytes,
-        content_type="application/pdf",
-    )
-
-    html_receipt = (
-        generate_tax_receipt_bentong_html(
-            paid_date=paid_date,
-            payment_method=payment_method,
-            tax_items=tax_items,
-            pdf_url=pdf_url,
-            order_no=order_no,
-            bank_trx_no=bank_trx_no,
-        )
-    )
-
-    html_filename = (
-        f"bentong_tax_receipt_{order_no}.html"
-    )
-
-    html_url = upload_to_blob(
-        html_filename,
-        html_receipt.encode("utf-8"),
-        content_type="text/html",
-    )
-
-    return _generate_qr_response(
-        html_url
+    return generate_qr_response(
+        receipt_url
     )
 
 
@@ -1184,6 +598,19 @@ def create_payment_updates_cukaitaksiran_bentong(
             payment_update
         )
 
+    record_settlement(
+        db,
+        "tax_bentong",
+        None,
+        paid_date.date(),
+        payment_method,
+        sum(
+            payment_update.amount
+            for payment_update in created_updates
+        ),
+        count=len(created_updates),
+    )
+
     db.commit()
 
     for payment_update in created_updates:
@@ -1261,11 +688,172 @@ def semakan_payment_updates_cukaitaksiran_bentong(
     return results
 
 
+# =========================================================
+# BULK RECEIPT EXPORT - BENTONG TAX
+# =========================================================
+
+@router.get(
+    "/payment-updates-cukaitaksiran-bentong/receipts.zip"
+)
+def export_bentong_tax_receipts(
+    date_from: date,
+    date_to: date,
+    cursor: int = 0,
+    limit: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Stream every Bentong tax receipt paid between date_from and
+    date_to (inclusive) as one ZIP, one PDF per order.
+
+    Entries are named "<cursor>_<order_no>.pdf". To resume an
+    interrupted download, call again with cursor set to the
+    prefix of the last complete entry. The final manifest.json
+    entry holds next_cursor for limited exports.
+    """
+
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "date_to mestilah selepas date_from / "
+                "date_to must not be before date_from"
+            ),
+        )
+
+    available = count_bentong_tax_orders(
+        db,
+        date_from,
+        date_to,
+        cursor,
+    )
+
+    total = (
+        available
+        if limit is None
+        else min(available, limit)
+    )
+
+    if not total:
+        raise HTTPException(
+            status_code=404,
+            detail=(
+                "Tiada rekod pembayaran dijumpai / "
+                "No payment update found"
+            ),
+        )
+
+    def zip_chunks():
+        # The request session is closed before streaming starts.
+        export_db = SessionLocal()
+
+        try:
+            yield from stream_receipt_zip(
+                iter_bentong_tax_batches(
+                    export_db,
+                    date_from,
+                    date_to,
+                    cursor=cursor,
+                    limit=limit,
+                ),
+                render_bentong_tax_job,
+                total=total,
+                on_progress=print_progress,
+                manifest={"has_more": available > total},
+            )
+
+        finally:
+            export_db.close()
+
+    filename = (
+        f"bentong_tax_receipts_{date_from:%Y%m%d}_"
+        f"{date_to:%Y%m%d}_{cursor}.zip"
+    )
+
+    return StreamingResponse(
+        zip_chunks(),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename}"'
+            ),
+            "X-Total-Receipts": str(total),
+        },
+    )
+
+
 # =========================================================
 # MULTIPLE TAX RECEIPT
 # TESTING / DEMO ONLY
 # =========================================================
 
+TAX_ADDRESS_FIELDS = [
+    "lot_no",
+    "house_no",
+    "street",
+    "address1",
+    "address2",
+    "zone",
+]
+
+
+def _build_multi_tax_html(
+    taxes_data,
+    total_amount,
+    pdf_url,
+):
+    rows = render_rows(
+        "tax_multi_row",
+        (
+            {
+                "bill_no": tax["bill_no"],
+                "property_type": tax["property_type"],
+                "full_address": ", ".join(
+                    str(tax[field])
+                    for field in TAX_ADDRESS_FIELDS
+                    if tax.get(field)
+                ),
+                "amount": money(tax["amount"]),
+            }
+            for tax in taxes_data
+        ),
+    )
+
+    return render_receipt_html(
+        "tax_multi",
+        rows=rows,
+        total_amount=money(total_amount),
+        pdf_url=pdf_url,
+    )
+
+
+def _render_multi_tax_pdf(payload):
+    return generate_multi_tax_pdf(
+        payload["taxes"],
+        payload["total_amount"],
+    ).getvalue()
+
+
+def _render_multi_tax_html(payload, pdf_url):
+    return _build_multi_tax_html(
+        payload["taxes"],
+        payload["total_amount"],
+        pdf_url,
+    )
+
+
+register_receipt_renderer(
+    "tax_multi",
+    render_pdf=_render_multi_tax_pdf,
+    render_html=_render_multi_tax_html,
+    # No natural key: one blob pair per receipt, so an earlier
+    # link never shows a later receipt.
+    filename=lambda payload: (
+        f"multi_tax_receipt_{secrets.token_urlsafe(9)}"
+    ),
+)
+
+
 @router.post("/receipt/qr/multi")
 def generate_multi_tax_receipt(
     payload: dict,
@@ -1365,349 +953,17 @@ def generate_multi_tax_receipt(
             tax_obj.half_year_amount
         )
 
-    pdf_buffer = generate_multi_tax_pdf(
-        taxes_data,
-        total_amount,
-    )
-
-    pdf_filename = "multi_tax_receipt.pdf"
-
-    pdf_url = upload_to_blob(
-        pdf_filename,
-        pdf_buffer.getvalue(),
-        content_type="application/pdf",
-    )
-
-    rows_html = ""
-
-    for tax in taxes_data:
-        address_parts = [
-            tax.get("lot_no", ""),
-            tax.get("house_no", ""),
-            tax.get("street", ""),
-            tax.get("address1", ""),
-            tax.get("address2", ""),
-            tax.get("zone", ""),
-        ]
-
-        full_address = ", ".join(
-            str(part)
-            for part in address_parts
-            if part
-        )
-
-        rows_html += f"""
-        <tr>
-            <td>{_safe_html(tax["bill_no"])}</td>
-            <td>{_safe_html(tax["property_type"])}</td>
-            <td>{_safe_html(full_address)}</td>
-            <td class="money">
-                RM {_safe_float(tax["amount"]):,.2f}
-            </td>
-        </tr>
-        """
-
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="ms">
-<head>
-    <meta charset="utf-8">
-
-    <meta
-        name="viewport"
-        content="width=device-width, initial-scale=1"
-    >
-
-    <title>
-        Resit Pelbagai Cukai /
-        Multiple Tax Receipt
-    </title>
-
-    <style>
-        * {{
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family:
-                "Segoe UI",
-                Tahoma,
-                Arial,
-                sans-serif;
-            background: #e8ebef;
-            padding: 25px;
-            margin: 0;
-            color: #111827;
-        }}
-
-        .receipt {{
-            background: #ffffff;
-            padding: 35px;
-            max-width: 900px;
-            border-radius: 16px;
-            margin: 0 auto;
-            box-shadow:
-                0 6px 20px
-                rgba(0, 0, 0, 0.08);
-        }}
-
-        .header {{
-            background: #2f80ed;
-            color: #ffffff;
-            padding: 22px;
-            text-align: center;
-            border-radius: 12px;
-        }}
-
-        .ms {{
-            font-weight: 700;
-        }}
-
-        .en {{
-            margin-top: 3px;
-            font-style: italic;
-            font-weight: 400;
-            color: #6b7280;
-            font-size: 0.88em;
-        }}
-
-        .header .ms {{
-            color: #ffffff;
-            font-size: 25px;
-        }}
-
-        .header .en {{
-            color:
-                rgba(
-                    255,
-                    255,
-                    255,
-                    0.88
-                );
-            font-size: 15px;
-        }}
-
-        .table-container {{
-            width: 100%;
-            overflow-x: auto;
-            margin-top: 25px;
-            border: 1px solid #e5e7eb;
-            border-radius: 10px;
-        }}
-
-        table {{
-            border-collapse: collapse;
-            width: 100%;
-            min-width: 760px;
-        }}
-
-        th {{
-            background: #f5f8ff;
-            border-bottom:
-                2px solid #d9e2f2;
-            padding: 13px;
-            text-align: center;
-        }}
-
-        th .ms {{
-            color: #111827;
-        }}
-
-        th .en {{
-            color: #4b5563;
-            font-size: 12px;
-        }}
-
-        td {{
-            padding: 13px;
-            text-align: center;
-            border-bottom:
-                1px solid #eeeeee;
-        }}
-
-        tbody tr:nth-child(even) {{
-            background: #fafafa;
-        }}
-
-        .money {{
-            text-align: right;
-            white-space: nowrap;
-            font-weight: 700;
-            color: #1d4ed8;
-        }}
-
-        .total {{
-            margin-top: 22px;
-            background: #f4f7ff;
-            padding: 18px;
-            border-left:
-                6px solid #2f80ed;
-            border-radius: 10px;
-            display: flex;
-            justify-content:
-                space-between;
-            align-items: center;
-            gap: 20px;
-        }}
-
-        .total-value {{
-            color: #1d4ed8;
-            font-size: 24px;
-            font-weight: 700;
-            white-space: nowrap;
-        }}
-
-        .pdf-button {{
-            margin-top: 27px;
-            text-align: center;
-        }}
-
-        .pdf-button a {{
-            display: inline-block;
-            background: #27ae60;
-            padding: 13px 22px;
-            color: #ffffff;
-            border-radius: 10px;
-            text-decoration: none;
-        }}
-
-        .pdf-button .ms,
-        .pdf-button .en {{
-            color: #ffffff;
-        }}
-
-        @media (max-width: 600px) {{
-            body {{
-                padding: 12px;
-            }}
-
-            .receipt {{
-                padding: 20px 15px;
-            }}
-
-            .total {{
-                display: block;
-                text-align: center;
-            }}
-
-            .total-value {{
-                margin-top: 10px;
-            }}
-        }}
-    </style>
-</head>
-
-<body>
-    <div class="receipt">
-        <div class="header">
-            <div class="ms">
-                Resit Pelbagai Cukai
-            </div>
-
-            <div class="en">
-                Multiple Tax Receipt
-            </div>
-        </div>
-
-        <div class="table-container">
-            <table>
-                <thead>
-                    <tr>
-                        <th>
-                            <div class="ms">
-                                No. Bil
-                            </div>
-
-                            <div class="en">
-                                Bill No.
-                            </div>
-                        </th>
-
-                        <th>
-                            <div class="ms">
-                                Jenis Harta
-                            </div>
-
-                            <div class="en">
-                                Property Type
-                            </div>
-                        </th>
-
-                        <th>
-                            <div class="ms">
-                                Alamat
-                            </div>
-
-                            <div class="en">
-                                Address
-                            </div>
-                        </th>
-
-                        <th>
-                            <div class="ms">
-                                Jumlah (RM)
-                            </div>
-
-                            <div class="en">
-                                Amount (RM)
-                            </div>
-                        </th>
-                    </tr>
-                </thead>
-
-                <tbody>
-                    {rows_html}
-                </tbody>
-            </table>
-        </div>
-
-        <div class="total">
-            <div>
-                <div class="ms">
-                    Jumlah Keseluruhan
-                </div>
-
-                <div class="en">
-                    Total Amount
-                </div>
-            </div>
-
-            <div class="total-value">
-                RM {total_amount:,.2f}
-            </div>
-        </div>
-
-        <div class="pdf-button">
-            <a
-                href="{pdf_url}"
-                target="_blank"
-            >
-                <div class="ms">
-                    Muat Turun Resit PDF
-                </div>
-
-                <div class="en">
-                    Download PDF Receipt
-                </div>
-            </a>
-        </div>
-    </div>
-</body>
-</html>
-    """
-
-    html_filename = (
-        "multi_tax_receipt.html"
-    )
-
-    html_url = upload_to_blob(
-        html_filename,
-        html_content.encode("utf-8"),
-        content_type="text/html",
+    receipt_url = publish_receipt(
+        db,
+        "tax_multi",
+        {
+            "taxes": taxes_data,
+            "total_amount": total_amount,
+        },
     )
 
-    return _generate_qr_response(
-        html_url
+    return generate_qr_response(
+        receipt_url
     )
 
 
@@ -0,0 +1,163 @@
+import argparse
+
+from sqlalchemy import bindparam, inspect, select, text, update
+
+from app.schema.compound.compound_schema import Compound
+from app.schema.parking.parking_schema import Parking
+from app.schema.parking.transaction_parking_schema import TransactionParking
+from app.schema.receipt.receipt_schema import ShortLink
+from app.utils.plates import normalize_plate
+
+
+# =========================================================
+# SCHEMA MIGRATION
+# =========================================================
+#
+# create_all() only creates missing tables, so existing
+# databases need this once before deploying a version that
+# adds columns to existing tables:
+#
+#   python -m app.db.schema_migration
+#
+# Every step checks first, so it is safe to run again.
+#
+#   1. adds the missing COLUMNS
+#   2. fills plate_norm for old rows, in id order and batches
+#      (committed per batch, so it can be stopped and re-run)
+#   3. creates the tables' missing indexes (plate_norm,
+#      parkings.timeout, short_links.blob_name)
+#
+# New rows get plate_norm from the models (see app/utils/plates).
+# Old tickets keep parking_id NULL; their receipts use the
+# plate's latest parking, as before (see parking_receipts).
+# =========================================================
+
+MODELS = [
+    Parking,
+    TransactionParking,
+    Compound,
+]
+
+# Tables that only need their missing indexes
+INDEX_MODELS = [
+    ShortLink,
+]
+
+# (table, column, DDL type)
+COLUMNS = [
+    ("parkings", "plate_norm", "VARCHAR(50) NULL"),
+    ("parkings", "tariff_terminal", "VARCHAR(50) NULL"),
+    ("transaction_parkings", "plate_norm", "VARCHAR(50) NULL"),
+    ("compounds", "plate_norm", "VARCHAR(50) NULL"),
+    ("transaction_parkings", "parking_id", "INTEGER NULL"),
+    ("multi_compound", "terminal", "VARCHAR(50) NULL"),
+    ("multi_compound", "paid_at", "DATETIME NULL"),
+]
+
+
+def _add_column(engine, table_name, column_name, column_type):
+    columns = {
+        column["name"]
+        for column in inspect(engine).get_columns(table_name)
+    }
+
+    if column_name in columns:
+        return
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                f"ALTER TABLE {table_name} "
+                f"ADD COLUMN {column_name} {column_type}"
+            )
+        )
+
+    print(f"[INFO] {table_name}: added {column_name}")
+
+
+def _backfill(engine, table, batch_size):
+    last_id = 0
+    done = 0
+
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select(table.c.id, table.c.plate)
+                .where(
+                    table.c.id > last_id,
+                    table.c.plate_norm.is_(None),
+                    table.c.plate.is_not(None),
+                )
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+
+            if not rows:
+                break
+
+            connection.execute(
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values(plate_norm=bindparam("norm")),
+                [
+                    {
+                        "row_id": row.id,
+                        "norm": normalize_plate(row.plate),
+                    }
+                    for row in rows
+                ],
+            )
+
+        last_id = rows[-1].id
+        done += len(rows)
+
+        print(f"[INFO] {table.name}: {done} rows backfilled")
+
+
+def _create_indexes(engine, table):
+    existing = {
+        index["name"]
+        for index in inspect(engine).get_indexes(table.name)
+    }
+
+    for index in table.indexes:
+        if index.name in existing:
+            continue
+
+        index.create(bind=engine)
+        print(f"[INFO] {table.name}: created {index.name}")
+
+
+def migrate(engine, batch_size=1000):
+    for table_name, column_name, column_type in COLUMNS:
+        _add_column(engine, table_name, column_name, column_type)
+
+    for model in MODELS:
+        table = model.__table__
+
+        _backfill(engine, table, batch_size)
+        _create_indexes(engine, table)
+
+    for model in INDEX_MODELS:
+        _create_indexes(engine, model.__table__)
+
+
+def _main():
+    parser = argparse.ArgumentParser(
+        description="Add missing columns and indexes to existing tables.",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+
+    args = parser.parse_args()
+
+    from app.db.database import engine
+
+    engine.echo = False
+
+    migrate(engine, args.batch_size)
+
+    print("[INFO] Schema migration done")
+
+
+if __name__ == "__main__":
+    _main()
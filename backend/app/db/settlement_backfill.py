@@ -0,0 +1,309 @@
+import argparse
+from collections import defaultdict
+from datetime import date, datetime, time
+
+from sqlalchemy import delete, func, insert, select
+
+from app.schema.compound.compound_schema import Compound, MultiCompound
+from app.schema.parking.transaction_parking_schema import TransactionParking
+from app.schema.pegepay.pegepay_schema import PegepayOrder
+from app.schema.sewaan.sewaan_schema import PaymentUpdatesSewaanBentong
+from app.schema.settlement.settlement_schema import SettlementRollup
+from app.schema.tax.tax_schema import PaymentUpdatesCukaiTaksiranBentong
+from app.utils.settlements import SETTLEMENT_MODULES, settlement_key
+
+
+# =========================================================
+# SETTLEMENT BACKFILL
+# =========================================================
+#
+# Rebuilds settlement_rollups from the payment tables, with the
+# rules of app/utils/settlements.py. Run it once after creating
+# the table, and again whenever the rollups are in doubt:
+#
+#   python -m app.db.settlement_backfill [--since 2026-10-01]
+#                                        [--module parking]
+#                                        [--check]
+#
+# Each module is one GROUP BY over its table and one
+# transaction (delete the module's rows, insert the new ones).
+# A payment committed while its module is being rebuilt can be
+# missed, so run it when kiosks are idle, or re-run it --since
+# the day in question. --check only prints the differences.
+#
+# Rows without a usable day are skipped and counted: tickets
+# and order numbers in an old format, multi_compound rows from
+# before paid_at.
+# =========================================================
+
+def _day(value, day_format=None):
+    if value is None or isinstance(value, date):
+        return value
+
+    try:
+        if day_format:
+            return datetime.strptime(value, day_format).date()
+
+        return date.fromisoformat(str(value)[:10])
+
+    except ValueError:
+        return None
+
+
+def _parking_groups(connection, since):
+    table = TransactionParking
+    day = func.substr(table.ticket_id, 3, 8)
+
+    query = (
+        select(
+            table.terminal,
+            day,
+            table.transaction_type,
+            func.count(),
+            func.sum(table.amount),
+        )
+        .group_by(table.terminal, day, table.transaction_type)
+    )
+
+    if since:
+        query = query.where(day >= f"{since:%Y%m%d}")
+
+    for terminal, day_text, payment_type, count, amount in (
+        connection.execute(query)
+    ):
+        yield terminal, _day(day_text, "%Y%m%d"), payment_type, count, amount
+
+
+def _pegepay_groups(connection, since):
+    table = PegepayOrder
+
+    # DDMMYY in front of the three-digit counter
+    day = func.substr(table.order_no, -9, 6)
+
+    query = (
+        select(
+            table.terminal_id,
+            day,
+            func.count(),
+            func.sum(table.order_amount),
+        )
+        .where(table.order_status == "successful")
+        .group_by(table.terminal_id, day)
+    )
+
+    for terminal, day_text, count, amount in connection.execute(query):
+        yield terminal, _day(day_text, "%d%m%y"), "QR", count, amount
+
+
+def _compound_groups(connection, since):
+    day = func.date(MultiCompound.paid_at)
+
+    query = (
+        select(
+            MultiCompound.terminal,
+            day,
+            func.count(),
+            func.sum(Compound.amount),
+        )
+        .join(
+            Compound,
+            Compound.compoundnum == MultiCompound.compoundnum,
+        )
+        .group_by(MultiCompound.terminal, day)
+    )
+
+    if since:
+        query = query.where(
+            MultiCompound.paid_at >= datetime.combine(since, time())
+        )
+
+    for terminal, day_value, count, amount in connection.execute(query):
+        yield terminal, _day(day_value), None, count, amount
+
+
+def _payment_update_groups(table):
+    def groups(connection, since):
+        day = func.date(table.paid_date)
+
+        query = (
+            select(
+                day,
+                table.payment_method,
+                func.count(),
+                func.sum(table.amount),
+            )
+            .group_by(day, table.payment_method)
+        )
+
+        if since:
+            query = query.where(
+                table.paid_date >= datetime.combine(since, time())
+            )
+
+        for day_value, payment_type, count, amount in (
+            connection.execute(query)
+        ):
+            yield None, _day(day_value), payment_type, count, amount
+
+    return groups
+
+
+SOURCES = {
+    "parking": _parking_groups,
+    "pegepay": _pegepay_groups,
+    "compound": _compound_groups,
+    "tax_bentong": _payment_update_groups(
+        PaymentUpdatesCukaiTaksiranBentong
+    ),
+    "sewaan_bentong": _payment_update_groups(
+        PaymentUpdatesSewaanBentong
+    ),
+}
+
+
+def _rollup(connection, module, since):
+    """
+    {(day, terminal, module, payment_type): [count, amount]}
+    and the number of payments without a day.
+    """
+
+    totals = defaultdict(lambda: [0, 0.0])
+    skipped = 0
+
+    for terminal, day, payment_type, count, amount in (
+        SOURCES[module](connection, since)
+    ):
+        if day is None:
+            skipped += count
+            continue
+
+        if since and day < since:
+            continue
+
+        total = totals[settlement_key(terminal, day, module, payment_type)]
+        total[0] += count
+        total[1] += amount or 0.0
+
+    return totals, skipped
+
+
+def _stored(connection, module, since):
+    query = select(
+        SettlementRollup.day,
+        SettlementRollup.terminal,
+        SettlementRollup.module,
+        SettlementRollup.payment_type,
+        SettlementRollup.count,
+        SettlementRollup.amount,
+    ).where(SettlementRollup.module == module)
+
+    if since:
+        query = query.where(SettlementRollup.day >= since)
+
+    return {
+        tuple(row[:4]): [row.count, row.amount]
+        for row in connection.execute(query)
+    }
+
+
+def _differences(expected, stored):
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key, [0, 0.0])
+        have = stored.get(key, [0, 0.0])
+
+        if want[0] != have[0] or round(want[1] - have[1], 2):
+            yield key, want, have
+
+
+def backfill_settlements(
+    engine,
+    modules=SETTLEMENT_MODULES,
+    since: date = None,
+    check: bool = False,
+) -> int:
+    """
+    Rebuild (or with check=True compare) the rollups of the
+    modules, for every day or from since onwards. Returns the
+    number of rollup rows that differed.
+    """
+
+    differing = 0
+
+    for module in modules:
+        with engine.begin() as connection:
+            totals, skipped = _rollup(connection, module, since)
+            stored = _stored(connection, module, since)
+
+            differences = list(_differences(totals, stored))
+            differing += len(differences)
+
+            if check:
+                for key, want, have in differences:
+                    print(f"[WARN] {key}: tables {want}, rollup {have}")
+
+            else:
+                statement = delete(SettlementRollup).where(
+                    SettlementRollup.module == module
+                )
+
+                if since:
+                    statement = statement.where(SettlementRollup.day >= since)
+
+                connection.execute(statement)
+
+                if totals:
+                    connection.execute(
+                        insert(SettlementRollup),
+                        [
+                            {
+                                "day": key[0],
+                                "terminal": key[1],
+                                "module": key[2],
+                                "payment_type": key[3],
+                                "count": count,
+                                "amount": round(amount, 2),
+                            }
+                            for key, (count, amount) in totals.items()
+                        ],
+                    )
+
+        print(
+            f"[INFO] {module}: {len(totals)} rollup rows, "
+            f"{len(differences)} differed"
+            + (f", {skipped} payments without a day skipped" if skipped else "")
+        )
+
+    return differing
+
+
+def _main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild settlement_rollups from the payment tables.",
+    )
+    parser.add_argument("--since", type=date.fromisoformat, default=None)
+    parser.add_argument("--module", choices=SETTLEMENT_MODULES, action="append")
+    parser.add_argument("--check", action="store_true")
+
+    args = parser.parse_args()
+
+    from app.db.database import engine
+
+    engine.echo = False
+
+    SettlementRollup.__table__.create(bind=engine, checkfirst=True)
+
+    differing = backfill_settlements(
+        engine,
+        args.module or SETTLEMENT_MODULES,
+        args.since,
+        args.check,
+    )
+
+    if args.check and differing:
+        raise SystemExit(1)
+
+    print("[INFO] Settlement backfill done")
+
+
+if __name__ == "__main__":
+    _main()
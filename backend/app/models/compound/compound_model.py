@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date, time
 from enum import Enum
 from typing import Optional
@@ -20,6 +20,14 @@ class CompoundBase(BaseModel):
 class CompoundCreate(CompoundBase):
     pass
 
+# Bulk ingest from the issuing system: lengths of the compounds columns,
+# so one bad row is rejected on its own instead of failing its batch
+class CompoundIngest(CompoundCreate):
+    name: str = Field(..., max_length=100)
+    compoundnum: str = Field(..., min_length=1, max_length=30)
+    plate: str = Field(..., min_length=1, max_length=50)
+    offense: str = Field(..., max_length=255)
+
 class CompoundResponse(CompoundBase):
     id: int
 
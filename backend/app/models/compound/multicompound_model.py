@@ -1,8 +1,10 @@
 from pydantic import BaseModel
+from typing import Optional
 
 class MultiCompoundBase(BaseModel):
     transaction_bank_id: str
     compoundnum: str
+    terminal: Optional[str] = None  # kiosk that took the payment (settlements)
 
 class MultiCompoundCreate(MultiCompoundBase):
     pass
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
+from typing import Annotated
 
 # -------------------------
 # Request Schemas
@@ -8,6 +9,10 @@ from enum import Enum
 class ParkingCheck(BaseModel):
     plate: str
 
+class ParkingBulkCheck(BaseModel):
+    # Enforcement handhelds / ANPR cameras: one request per patrol batch
+    plates: list[str] = Field(..., min_length=1, max_length=5000)
+
 class ParkingCreate(BaseModel):
     plate: str
     time_used: float
@@ -16,6 +21,11 @@ class ParkingCreate(BaseModel):
     order_no: str | None = None
     bank_trx_no: str | None = None
 
+class ParkingQuote(BaseModel):
+    terminal: str
+    hours: list[Annotated[float, Field(gt=0)]] = Field(..., min_length=1, max_length=96)  # candidate durations
+    plate: str | None = None  # set = price extending its active parking
+
 class ParkingExtend(BaseModel):
     extend_hours: float
     transaction_type : str
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from app.db.database import Base
+
+
+class CacheVersion(Base):
+    __tablename__ = "cache_versions"
+
+    # In-memory cache the counter belongs to, e.g. "parking_index"
+    name = Column(String(50), primary_key=True)
+
+    # Bumped in the same transaction as every write the cache mirrors;
+    # workers reload when it differs from the version they last loaded
+    version = Column(Integer, nullable=False, default=0)
@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Time , Enum
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Time , Enum, Index
+from sqlalchemy.orm import validates
 from app.db.database import Base
+from app.utils.plates import normalize_plate
 import enum
 
 # Enum for transaction type
@@ -14,15 +16,30 @@ class Compound(Base):
     name = Column(String(100), index=True)
     compoundnum = Column(String(30), unique=True, index=True)  
     plate = Column(String(50), index=True)
+    plate_norm = Column(String(50))  # normalize_plate(plate), set whenever plate is
     date = Column(Date, nullable=False)
     time = Column(Time, nullable=False)
     offense = Column(String(255), nullable=False)
     amount = Column(Float, nullable=False)
     status = Column(Enum(StatusTypeEnum), nullable=False)
 
+    # Unpaid compounds of a plate: WHERE plate_norm = ? AND status = ?
+    __table_args__ = (
+        Index("ix_compounds_plate_norm_status", "plate_norm", "status"),
+    )
+
+    @validates("plate")
+    def _set_plate_norm(self, key, plate):
+        self.plate_norm = normalize_plate(plate)
+        return plate
+
 class MultiCompound(Base):
     __tablename__ = "multi_compound"
 
     id = Column(Integer, primary_key=True, index=True)
     transaction_bank_id = Column(String(100), index=True)
-    compoundnum = Column(String(30), index=True)
\ No newline at end of file
+    compoundnum = Column(String(30), index=True)
+
+    # Kiosk and SIRIM time of the payment (NULL on rows from before these columns)
+    terminal = Column(String(50), nullable=True)
+    paid_at = Column(DateTime, nullable=True)
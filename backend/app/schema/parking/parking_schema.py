@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, Enum, DateTime, Float , DECIMAL
+from sqlalchemy import Column, Integer, String, Enum, DateTime, Float , DECIMAL, Index
+from sqlalchemy.orm import validates
 from app.db.database import Base
 import enum
 from datetime import timedelta
 from app.utils.Malaysia_time import malaysia_now
+from app.utils.plates import normalize_plate
 
 
 
@@ -23,13 +25,24 @@ class Parking(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     terminal = Column(String(50), nullable=False)
+    tariff_terminal = Column(String(50), nullable=True)  # terminal the session was priced at; extend keeps it (NULL on old rows: terminal)
     plate = Column(String(50), index=True)
+    plate_norm = Column(String(50))  # normalize_plate(plate), set whenever plate is
     time_used = Column(Float)
     payment_status = Column(Enum(PaymentStatusEnum), default=PaymentStatusEnum.no)
     timein = Column(DateTime, default=malaysia_now, nullable=False)   # ✅ default Malaysia time
-    timeout = Column(DateTime, nullable=True)
+    timeout = Column(DateTime, nullable=True, index=True)  # active-parking index loads timeout > now
     amount = Column(Float, default=0.0)
-    
+
+    # Latest paid parking of a plate: WHERE plate_norm = ? ORDER BY timeout DESC
+    __table_args__ = (
+        Index("ix_parkings_plate_norm_timeout", "plate_norm", "timeout"),
+    )
+
+    @validates("plate")
+    def _set_plate_norm(self, key, plate):
+        self.plate_norm = normalize_plate(plate)
+        return plate
 
     def set_timeout(self):
         """Calculate timeout = timein + time_used (hours)"""
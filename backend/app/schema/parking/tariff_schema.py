@@ -0,0 +1,42 @@
+from sqlalchemy import Column, Integer, String, Float, Time, ForeignKey
+from app.db.database import Base
+
+
+class ParkingTariff(Base):
+    __tablename__ = "parking_tariffs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Who the tariff applies to: a terminal, else the terminal's zone,
+    # else the tariff with neither (default for every terminal)
+    terminal = Column(String(50), nullable=True, unique=True)
+    zone = Column(String(50), nullable=True, unique=True)
+
+    # Most charged per calendar day of a session (RM), NULL = no cap
+    daily_cap = Column(Float, nullable=True)
+
+    # First minutes of every session that are free
+    grace_minutes = Column(Integer, nullable=False, default=0)
+
+
+class ParkingTariffBand(Base):
+    __tablename__ = "parking_tariff_bands"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tariff_id = Column(Integer, ForeignKey("parking_tariffs.id"), index=True, nullable=False)
+
+    # [start_time, end_time) of every day; end_time <= start_time wraps
+    # past midnight (22:00-06:00), 00:00-00:00 is the whole day.
+    # Time not covered by any band is free; a later band overrides an
+    # earlier one where they overlap.
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+
+    rate_per_hour = Column(Float, nullable=False)
+
+
+class TerminalZone(Base):
+    __tablename__ = "terminal_zones"
+
+    terminal = Column(String(50), primary_key=True)
+    zone = Column(String(50), index=True, nullable=False)
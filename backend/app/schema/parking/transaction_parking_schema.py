@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, Date
+from sqlalchemy.orm import validates
 from app.db.database import Base
+from app.utils.plates import normalize_plate
 import enum
 
 
@@ -16,6 +18,7 @@ class TransactionParking(Base):
     terminal = Column(String(50), nullable=False)
     ticket_id = Column(String(100), unique=True, index=True)  # e.g., P-0001
     plate = Column(String(50), index=True)
+    plate_norm = Column(String(50), index=True)  # normalize_plate(plate), set whenever plate is
     hours = Column(Float, nullable=False)  # total hours paid
     amount = Column(Float, nullable=False)
     transaction_type = Column(String(50), nullable=False)
@@ -23,3 +26,22 @@ class TransactionParking(Base):
     
     order_no = Column(String(50), nullable=True)
     bank_trx_no = Column(String(100), nullable=True)
+
+    # Parking session the ticket paid for (NULL on tickets issued before this column)
+    parking_id = Column(Integer, nullable=True)
+
+    @validates("plate")
+    def _set_plate_norm(self, key, plate):
+        self.plate_norm = normalize_plate(plate)
+        return plate
+
+
+class TicketSequence(Base):
+    __tablename__ = "ticket_sequences"
+
+    # One counter per terminal per day (the DAILYNUMBER part of the ticket ID)
+    terminal = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    # Last number handed out for this terminal and day
+    last_number = Column(Integer, nullable=False)
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from app.db.database import Base
+from app.utils.Malaysia_time import malaysia_now
+
+
+class ReceiptRecord(Base):
+    __tablename__ = "receipt_records"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Random public ID placed inside the receipt QR link
+    receipt_id = Column(String(32), unique=True, index=True, nullable=False)
+
+    # e.g. "tax_bentong", "sewaan_bentong", "bill", "parking"
+    receipt_type = Column(String(50), index=True, nullable=False)
+
+    # JSON payload the receipt is rendered from
+    payload = Column(Text, nullable=False)
+
+    # Blob name of the PDF once it has been rendered on first open
+    pdf_blob = Column(String(255), nullable=True)
+
+    created_at = Column(DateTime, default=malaysia_now, nullable=False)
+
+
+class ShortLink(Base):
+    __tablename__ = "short_links"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Random code in the short URL: {PUBLIC_API_URL}/r/<code>
+    code = Column(String(16), unique=True, index=True, nullable=False)
+
+    # Blob the code points to; re-signed on every resolve.
+    # Indexed: a blob that already has a code reuses it.
+    blob_name = Column(String(255), index=True, nullable=False)
+
+    created_at = Column(DateTime, default=malaysia_now, nullable=False)
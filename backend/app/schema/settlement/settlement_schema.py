@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, Float, Date
+from app.db.database import Base
+
+
+class SettlementRollup(Base):
+    __tablename__ = "settlement_rollups"
+
+    # One row per day, terminal, module and payment type; "" where the
+    # module does not record a terminal or payment type
+    day = Column(Date, primary_key=True)
+    terminal = Column(String(50), primary_key=True)
+    module = Column(String(20), primary_key=True)  # parking, pegepay, compound, tax_bentong, sewaan_bentong
+    payment_type = Column(String(100), primary_key=True)
+
+    # Payments and their total (RM), added to in the payment's own transaction
+    count = Column(Integer, nullable=False, default=0)
+    amount = Column(Float, nullable=False, default=0)
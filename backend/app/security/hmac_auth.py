@@ -92,6 +92,16 @@ async def require_api_key_and_hmac(
     ):
         return
 
+    # Public receipt links carry their own signature and are
+    # verified inside the receipt controller.
+    if (
+        request.method.upper() in ("GET", "HEAD")
+        and request_path.startswith(
+            "/api/v2/receipts/"
+        )
+    ):
+        return
+
     received_api_key = request.headers.get(
         "X-API-Key"
     )
@@ -0,0 +1,43 @@
+import hashlib
+import hmac
+
+from fastapi import HTTPException, status
+
+from app.security.hmac_auth import TIP_HMAC_SECRET
+
+
+# Public receipt links are opened by citizens' phones, which cannot
+# send the kiosk X-API-Key / X-Signature headers. Instead, the link
+# carries its own signature over the receipt ID.
+
+
+def _receipt_signature(receipt_id: str) -> str:
+    digest = hmac.new(
+        TIP_HMAC_SECRET.encode("utf-8"),
+        f"receipt:{receipt_id}".encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+
+    # 64 bits are enough to stop receipt ID guessing and keep QR short.
+    return digest[:16]
+
+
+def sign_receipt_id(receipt_id: str) -> str:
+    return _receipt_signature(receipt_id)
+
+
+def require_valid_receipt_signature(
+    receipt_id: str,
+    signature: str | None,
+) -> None:
+    if not signature or not hmac.compare_digest(
+        signature,
+        _receipt_signature(receipt_id),
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=(
+                "Pautan resit tidak sah / "
+                "Invalid receipt link"
+            ),
+        )
@@ -0,0 +1,197 @@
+import base64
+import threading
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+from reportlab.lib.utils import ImageReader
+
+
+# =========================================================
+# SHARED IMAGE ASSETS
+# =========================================================
+#
+# Every receipt module used to open its own copy of the logos
+# with a path relative to the working directory. The registry
+# below resolves paths from the package itself, decodes each
+# image once per process and keeps ready-to-use variants:
+#
+# - PDF : ReportLab ImageReader at print resolution (shared by
+#         every generator)
+# - HTML: data URI, scaled down for on-screen receipts
+# - QR guide: PNG bytes, scaled down for the kiosk screen
+# =========================================================
+
+IMAGES_DIR = (
+    Path(__file__)
+    .resolve()
+    .parent          # utils
+    .parent          # app
+    / "resources"
+    / "images"
+)
+
+ASSET_FILES = {
+    "city_car_park_logo": "City_Car_Park_logo.png",
+    "jip_logo": "jip_logo.png",
+    "bentong_logo": "majlisbentong.png",
+    "kuantan_logo": "PBT_Kuantan_logo.png",
+    "qr_guide": "qr_guide2.png",
+}
+
+# Longest side in pixels of each pre-scaled variant.
+#
+# The largest logo box on any receipt is about 100 pt
+# (1.4 inch), so 420 px is 300 dpi when printed. The source
+# files are larger and would only make every PDF heavier.
+PDF_MAX_SIZE = 420
+HTML_MAX_SIZE = 240
+QR_GUIDE_MAX_SIZE = 1024
+
+_images = {}
+_variants = {}
+_lock = threading.Lock()
+
+
+def asset_path(name: str) -> Path:
+    """
+    Absolute path of a registered image.
+    """
+
+    return IMAGES_DIR / ASSET_FILES[name]
+
+
+def _load_image(name):
+    """
+    Decode an image once. Returns None when it cannot be read.
+    """
+
+    if name in _images:
+        return _images[name]
+
+    path = asset_path(name)
+
+    try:
+        with Image.open(path) as image:
+            image.load()
+
+            # Palette images keep their transparency in RGBA.
+            if image.mode not in ("RGB", "RGBA"):
+                decoded = image.convert("RGBA")
+            else:
+                decoded = image.copy()
+
+        print(f"[INFO] Asset {name} preloaded successfully.")
+
+    except Exception as error:
+        print(
+            f"[WARN] Failed to load asset {name} "
+            f"at {path}: {error}"
+        )
+        decoded = None
+
+    _images[name] = decoded
+
+    return decoded
+
+
+def _scaled(image, max_size):
+    if max(image.size) <= max_size:
+        return image
+
+    scaled = image.copy()
+    scaled.thumbnail(
+        (max_size, max_size),
+        Image.LANCZOS,
+    )
+
+    return scaled
+
+
+def _pdf_variant(image):
+    """
+    Scale to print resolution and reduce back to a 256 colour
+    palette (the logos are palette images to begin with).
+    Resampling creates thousands of blended colours, which
+    compress far worse inside the PDF.
+    """
+
+    scaled = _scaled(image, PDF_MAX_SIZE)
+
+    if scaled is not image:
+        scaled = scaled.quantize(256).convert(image.mode)
+
+    return ImageReader(scaled)
+
+
+def _png_bytes(image):
+    buffer = BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _get_variant(name, kind, build):
+    key = (name, kind)
+
+    if key in _variants:
+        return _variants[key]
+
+    with _lock:
+        if key not in _variants:
+            image = _load_image(name)
+            _variants[key] = (
+                build(image)
+                if image is not None
+                else None
+            )
+
+    return _variants[key]
+
+
+# =========================================================
+# PUBLIC ACCESSORS
+# =========================================================
+
+def pdf_image(name: str):
+    """
+    Shared ReportLab ImageReader, or None when the image is missing.
+    """
+
+    return _get_variant(
+        name,
+        "pdf",
+        _pdf_variant,
+    )
+
+
+def html_data_uri(name: str):
+    """
+    Small PNG data URI for HTML receipts, or None when missing.
+    """
+
+    return _get_variant(
+        name,
+        "html",
+        lambda image: (
+            "data:image/png;base64,"
+            + base64.b64encode(
+                _png_bytes(
+                    _scaled(image, HTML_MAX_SIZE)
+                )
+            ).decode("ascii")
+        ),
+    )
+
+
+def qr_guide_png():
+    """
+    Pre-encoded QR guide image for the payment screen, or None.
+    """
+
+    return _get_variant(
+        "qr_guide",
+        "qr_guide",
+        lambda image: _png_bytes(
+            _scaled(image, QR_GUIDE_MAX_SIZE)
+        ),
+    )
@@ -88,6 +88,14 @@ ACCOUNT_NAME = os.getenv("ACCOUNT_NAME", "vsmeterblob")
 ACCOUNT_KEY = os.getenv("ACCOUNT_KEY", "rKu+/oWQtOQZLJ+/4RgJXKpXt3itshA38M88LX4nYE3ScM8e1BAqry708bCae0G2BQhExxyjR489+AStb/amEA==")
 CONTAINER_NAME = os.getenv("CONTAINER_NAME", "receipts")
 
+# Lifetime of the read-only SAS links
+SAS_LIFETIME = timedelta(hours=1)
+
+# Lifetime of the read links to shared assets (the receipt
+# stylesheet). Receipts that link them are kept for years and
+# the assets hold nothing private.
+ASSET_SAS_LIFETIME = timedelta(days=3650)
+
 # This is your new public receipt domain
 PUBLIC_BLOB_DOMAIN = os.getenv(
     "PUBLIC_BLOB_DOMAIN",
@@ -161,6 +169,84 @@ def upload_to_blob(
         ),
     )
 
+    return generate_blob_url(filename)
+
+
+# ============================================================
+# SHARED ASSET UPLOAD
+# ============================================================
+
+def upload_asset(
+    filename: str,
+    content: bytes,
+    content_type: str | None = None,
+    cache_control: str | None = None,
+) -> str:
+    """
+    Upload a shared asset whose name changes with its content
+    (fingerprinted), unless it is already there, and return a
+    long-lived read-only URL.
+
+    The SAS expiry is counted from the start of the month, so
+    every worker started in the same month links the same URL
+    and browsers cache it once.
+    """
+
+    if not filename:
+        raise ValueError("filename cannot be empty")
+
+    container_client = blob_service.get_container_client(CONTAINER_NAME)
+
+    try:
+        container_client.create_container()
+    except ResourceExistsError:
+        pass
+
+    blob_client = container_client.get_blob_client(filename)
+
+    if not blob_client.exists():
+        blob_client.upload_blob(
+            content,
+            overwrite=True,
+            content_settings=ContentSettings(
+                content_type=(
+                    content_type
+                    or guess_type(filename)[0]
+                    or "application/octet-stream"
+                ),
+                cache_control=cache_control,
+            ),
+        )
+
+    now = datetime.now(timezone.utc)
+
+    return generate_blob_url(
+        filename,
+        expiry=(
+            now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            + ASSET_SAS_LIFETIME
+        ),
+    )
+
+
+# ============================================================
+# SAS URL FUNCTION
+# ============================================================
+
+def generate_blob_url(
+    filename: str,
+    expiry: datetime | None = None,
+) -> str:
+    """
+    Return a fresh read-only SAS URL for a blob that has already
+    been uploaded, using tipintar.juaraipasifik.com.
+
+    The link expires after SAS_LIFETIME unless an expiry is given.
+    """
+
+    if not filename:
+        raise ValueError("filename cannot be empty")
+
     # Create read-only SAS token
     sas_token = generate_blob_sas(
         account_name=ACCOUNT_NAME,
@@ -168,7 +254,7 @@ def upload_to_blob(
         blob_name=filename,
         account_key=ACCOUNT_KEY,
         permission=BlobSasPermissions(read=True),
-        expiry=datetime.now(timezone.utc) + timedelta(hours=1),
+        expiry=expiry or datetime.now(timezone.utc) + SAS_LIFETIME,
     )
 
     # Encode spaces and special characters in filename
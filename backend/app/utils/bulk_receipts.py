@@ -0,0 +1,484 @@
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.schema.tax.tax_schema import PaymentUpdatesCukaiTaksiranBentong
+from app.utils.config import RECEIPT_RENDER_WORKERS
+
+
+# =========================================================
+# BULK RECEIPT EXPORT
+# =========================================================
+#
+# Reprints for councils (end of day / month end). Records are
+# read in batches, rendered in parallel worker processes and
+# written into a ZIP that is streamed out entry by entry, so
+# the whole archive is never held in memory.
+#
+# Every entry name starts with the record cursor. The last
+# entry, manifest.json, holds next_cursor so an interrupted
+# or limited export can continue where it stopped.
+# =========================================================
+
+EXPORT_BATCH_SIZE = 50
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def _get_render_pool():
+    """
+    Shared process pool, created on first use.
+
+    Returns None when RECEIPT_RENDER_WORKERS is 1, in which
+    case receipts are rendered in the calling process.
+    """
+
+    global _render_pool
+
+    if RECEIPT_RENDER_WORKERS == 1:
+        return None
+
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(
+                max_workers=(
+                    RECEIPT_RENDER_WORKERS
+                    or os.cpu_count()
+                )
+            )
+
+    return _render_pool
+
+
+def _render_batch(render, jobs):
+    pool = _get_render_pool()
+
+    if pool is None:
+        return map(render, jobs)
+
+    return pool.map(render, jobs)
+
+
+def _safe_entry_name(value):
+    return re.sub(
+        r"[^A-Za-z0-9._-]+",
+        "_",
+        str(value or "-"),
+    )
+
+
+class _ZipChunkSink:
+    """
+    Write-only file object for ZipFile.
+
+    It has no tell()/seek(), so ZipFile writes in streaming
+    mode. The bytes written so far are collected by drain().
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_receipt_zip(
+    batches,
+    render,
+    total=None,
+    on_progress=None,
+    manifest=None,
+):
+    """
+    Render receipts and yield the ZIP archive in chunks.
+
+    Args:
+        batches:
+            Iterable of lists of (cursor, entry_name, job).
+
+        render:
+            Picklable function job -> PDF bytes. Runs in the
+            worker processes.
+
+        total:
+            Number of receipts expected, for progress only.
+
+        on_progress:
+            Optional callback(done, total, cursor).
+
+        manifest:
+            Extra fields for manifest.json.
+    """
+
+    sink = _ZipChunkSink()
+
+    done = 0
+    last_cursor = None
+    failed = []
+
+    with zipfile.ZipFile(
+        sink,
+        mode="w",
+        # PDF streams are already compressed.
+        compression=zipfile.ZIP_STORED,
+    ) as archive:
+        for batch in batches:
+            jobs = [job for _, _, job in batch]
+
+            results = _render_batch(render, jobs)
+
+            for (cursor, entry_name, _), pdf_bytes in zip(
+                batch,
+                results,
+            ):
+                if pdf_bytes is None:
+                    failed.append(entry_name)
+                else:
+                    archive.writestr(
+                        entry_name,
+                        pdf_bytes,
+                    )
+
+                done += 1
+                last_cursor = cursor
+
+                chunk = sink.drain()
+
+                if chunk:
+                    yield chunk
+
+            if on_progress:
+                on_progress(done, total, last_cursor)
+
+        archive.writestr(
+            "manifest.json",
+            json.dumps(
+                {
+                    "receipts": done,
+                    "failed": failed,
+                    "total": total,
+                    "next_cursor": last_cursor,
+                    **(manifest or {}),
+                },
+                indent=2,
+            ),
+        )
+
+    yield sink.drain()
+
+
+def print_progress(done, total, cursor):
+    print(
+        f"[BulkReceipts] {done}/{total if total is not None else '?'} "
+        f"receipts rendered (cursor={cursor})"
+    )
+
+
+# =========================================================
+# BENTONG TAX RECEIPTS
+# =========================================================
+
+def _paid_date_range(date_from: date, date_to: date):
+    return (
+        datetime.combine(date_from, time.min),
+        datetime.combine(
+            date_to + timedelta(days=1),
+            time.min,
+        ),
+    )
+
+
+def _bentong_tax_orders_query(
+    db: Session,
+    date_from: date,
+    date_to: date,
+):
+    """
+    One row per order_no: (order_no, first_id).
+
+    first_id (the lowest record ID of the order) is the
+    export cursor.
+    """
+
+    start, end = _paid_date_range(
+        date_from,
+        date_to,
+    )
+
+    first_id = func.min(
+        PaymentUpdatesCukaiTaksiranBentong.id
+    ).label("first_id")
+
+    return (
+        db.query(
+            PaymentUpdatesCukaiTaksiranBentong.order_no,
+            first_id,
+        )
+        .filter(
+            PaymentUpdatesCukaiTaksiranBentong.paid_date >= start,
+            PaymentUpdatesCukaiTaksiranBentong.paid_date < end,
+        )
+        .group_by(
+            PaymentUpdatesCukaiTaksiranBentong.order_no
+        )
+    )
+
+
+def count_bentong_tax_orders(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    cursor: int = 0,
+) -> int:
+    orders = (
+        _bentong_tax_orders_query(
+            db,
+            date_from,
+            date_to,
+        )
+        .having(
+            func.min(PaymentUpdatesCukaiTaksiranBentong.id)
+            > cursor
+        )
+        .subquery()
+    )
+
+    return db.query(func.count()).select_from(orders).scalar()
+
+
+def iter_bentong_tax_batches(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    cursor: int = 0,
+    limit: int = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+):
+    """
+    Yield batches of (cursor, entry_name, receipt_job), one
+    receipt per order, in cursor order.
+    """
+
+    start, end = _paid_date_range(
+        date_from,
+        date_to,
+    )
+
+    remaining = limit
+
+    while remaining is None or remaining > 0:
+        size = (
+            batch_size
+            if remaining is None
+            else min(batch_size, remaining)
+        )
+
+        orders = (
+            _bentong_tax_orders_query(
+                db,
+                date_from,
+                date_to,
+            )
+            .having(
+                func.min(PaymentUpdatesCukaiTaksiranBentong.id)
+                > cursor
+            )
+            .order_by("first_id")
+            .limit(size)
+            .all()
+        )
+
+        if not orders:
+            return
+
+        rows = (
+            db.query(PaymentUpdatesCukaiTaksiranBentong)
+            .filter(
+                PaymentUpdatesCukaiTaksiranBentong.order_no.in_(
+                    [order.order_no for order in orders]
+                ),
+                PaymentUpdatesCukaiTaksiranBentong.paid_date >= start,
+                PaymentUpdatesCukaiTaksiranBentong.paid_date < end,
+            )
+            .order_by(PaymentUpdatesCukaiTaksiranBentong.id)
+            .all()
+        )
+
+        items_by_order = {}
+
+        for row in rows:
+            items_by_order.setdefault(
+                row.order_no,
+                [],
+            ).append(row)
+
+        batch = []
+
+        for order in orders:
+            items = items_by_order.get(order.order_no, [])
+
+            if not items:
+                continue
+
+            first = items[0]
+
+            batch.append(
+                (
+                    order.first_id,
+                    (
+                        f"{order.first_id:08d}_"
+                        f"{_safe_entry_name(order.order_no)}.pdf"
+                    ),
+                    {
+                        "order_no": order.order_no,
+                        "paid_date": first.paid_date,
+                        "payment_method": first.payment_method,
+                        "bank_trx_no": first.bank_trx_no,
+                        "tax_items": [
+                            {
+                                "no_pendaftaran": item.no_pendaftaran,
+                                "account_number": item.account_number,
+                                "owner_name": item.owner_name,
+                                "property_address": item.property_address,
+                                "amount": item.amount,
+                            }
+                            for item in items
+                        ],
+                    },
+                )
+            )
+
+        # Release the ORM rows before rendering the batch.
+        db.expunge_all()
+
+        yield batch
+
+        cursor = orders[-1].first_id
+
+        if remaining is not None:
+            remaining -= len(orders)
+
+
+def render_bentong_tax_job(job):
+    """
+    Worker-process entry point. Returns None on failure so one
+    bad record does not stop the export.
+    """
+
+    from app.controllers.v2.tax.tax_receipt_bentong import (
+        generate_tax_receipt_bentong,
+    )
+
+    try:
+        return generate_tax_receipt_bentong(**job)
+    except Exception as error:
+        print(
+            f"[BulkReceipts] Failed to render order "
+            f"{job.get('order_no')}: {error}"
+        )
+        return None
+
+
+# =========================================================
+# COMMAND LINE
+# =========================================================
+#
+# python -m app.utils.bulk_receipts \
+#     --from 2026-01-01 --to 2026-01-31 \
+#     --output bentong_tax_2026_01.zip \
+#     --cursor-file bentong_tax_2026_01.cursor
+#
+# Re-running with the same --cursor-file continues after the
+# last receipt of the previous run (into a new --output file).
+# =========================================================
+
+def _main():
+    parser = argparse.ArgumentParser(
+        description="Export Bentong tax receipts as a ZIP."
+    )
+    parser.add_argument("--from", dest="date_from", required=True, type=date.fromisoformat)
+    parser.add_argument("--to", dest="date_to", required=True, type=date.fromisoformat)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--cursor", type=int, default=0)
+    parser.add_argument("--cursor-file")
+    parser.add_argument("--limit", type=int)
+
+    args = parser.parse_args()
+
+    from app.db.database import SessionLocal
+
+    cursor = args.cursor
+
+    if args.cursor_file and os.path.exists(args.cursor_file):
+        with open(args.cursor_file) as cursor_file:
+            cursor = int(cursor_file.read().strip() or 0)
+
+    def save_cursor(done, total, last_cursor):
+        print_progress(done, total, last_cursor)
+
+        if args.cursor_file and last_cursor is not None:
+            with open(args.cursor_file, "w") as cursor_file:
+                cursor_file.write(str(last_cursor))
+
+    db = SessionLocal()
+
+    try:
+        available = count_bentong_tax_orders(
+            db,
+            args.date_from,
+            args.date_to,
+            cursor,
+        )
+
+        total = (
+            available
+            if args.limit is None
+            else min(available, args.limit)
+        )
+
+        with open(args.output, "wb") as output:
+            for chunk in stream_receipt_zip(
+                iter_bentong_tax_batches(
+                    db,
+                    args.date_from,
+                    args.date_to,
+                    cursor=cursor,
+                    limit=args.limit,
+                ),
+                render_bentong_tax_job,
+                total=total,
+                on_progress=save_cursor,
+                manifest={"has_more": available > total},
+            ):
+                output.write(chunk)
+
+    finally:
+        db.close()
+
+    print(
+        f"[BulkReceipts] Saved {args.output}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    _main()
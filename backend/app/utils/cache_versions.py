@@ -0,0 +1,97 @@
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.schema.cache.cache_version_schema import CacheVersion
+
+
+# =========================================================
+# CACHE VERSIONS
+# =========================================================
+#
+# In-memory caches that mirror database rows live once per
+# uvicorn worker. A write in one worker bumps the cache's row
+# in cache_versions inside the write's own transaction; the
+# other workers poll the version (one primary-key read) and
+# reload when it has moved.
+#
+# Bump as the last statement before the commit: the UPDATE
+# keeps the row locked until then.
+#
+# Caches written on every request (the parking index) use
+# publish_cache_version() after their commit instead, so the
+# row is only locked for its own short transaction and the
+# writes themselves do not queue on it. The data is committed
+# before the version moves, so a reader never misses it; a
+# bump lost to a failure is covered by the next one.
+# =========================================================
+
+def bump_cache_version(
+    db: Session,
+    name: str,
+) -> None:
+    """
+    Mark the cache as changed. Committed with the caller's
+    transaction.
+    """
+
+    while True:
+        result = db.execute(
+            update(CacheVersion)
+            .where(CacheVersion.name == name)
+            .values(version=CacheVersion.version + 1)
+        )
+
+        if result.rowcount:
+            return
+
+        # First write since the table was created; a racing
+        # worker's insert wins and this one increments it.
+        try:
+            with db.begin_nested():
+                db.add(
+                    CacheVersion(
+                        name=name,
+                        version=1,
+                    )
+                )
+
+            return
+
+        except IntegrityError:
+            continue
+
+
+def publish_cache_version(
+    db: Session,
+    name: str,
+) -> None:
+    """
+    Mark the cache as changed in a transaction of its own.
+    Call after the write has been committed; failures are
+    logged, not raised (the write is already in).
+    """
+
+    try:
+        bump_cache_version(db, name)
+        db.commit()
+
+    except Exception as error:
+        db.rollback()
+        print(f"[WARN] Cache version {name} not bumped: {error}")
+
+
+def read_cache_version(
+    db: Session,
+    name: str,
+) -> int:
+    """
+    Current version of the cache (0 before the first bump).
+    """
+
+    return (
+        db.query(CacheVersion.version)
+        .filter(CacheVersion.name == name)
+        .scalar()
+        or 0
+    )
@@ -0,0 +1,367 @@
+import json
+from collections import Counter
+
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.compound.compound_model import CompoundIngest
+from app.schema.compound.compound_schema import Compound, StatusTypeEnum
+from app.utils.cache_versions import bump_cache_version
+from app.utils.config import COMPOUND_INGEST_BATCH, COMPOUND_INGEST_MAX_ROWS
+from app.utils.plates import normalize_plate
+from app.utils.unpaid_compounds import (
+    UNPAID_COMPOUNDS,
+    forget_unpaid_compounds,
+)
+
+
+# =========================================================
+# BULK COMPOUND INGEST
+# =========================================================
+#
+# The enforcement issuing system syncs a day's compounds in one
+# POST /compound/ingest instead of one POST /compound/ (and one
+# commit) per compound. The body is NDJSON (one compound per
+# line, Content-Type application/x-ndjson) or a JSON array.
+#
+# Every row is validated on its own with CompoundIngest, so a
+# bad row is reported and the others still go in. The valid
+# rows are upserted on compoundnum, COMPOUND_INGEST_BATCH at a
+# time, each batch in a fixed number of statements:
+#
+#   1. SELECT ... WHERE compoundnum IN (...) FOR UPDATE
+#   2. one multi-row INSERT for the new compounds
+#   3. one executemany UPDATE by id for the changed ones
+#   4. unpaid-compounds cache version, COMMIT
+#
+# Rows that match the stored compound are not written. A PAID
+# compound stays PAID whatever status the issuer sends.
+#
+# Batches commit one by one: if the request fails halfway, the
+# earlier batches are in. Sending the same rows again is safe.
+# =========================================================
+
+UPSERT_FIELDS = [
+    "name",
+    "plate",
+    "date",
+    "time",
+    "offense",
+    "amount",
+    "status",
+]
+
+# Attempts per batch when another ingest inserted the same
+# compound number first (unique index on compoundnum)
+BATCH_ATTEMPTS = 3
+
+
+async def read_request_body(request: Request) -> bytes:
+    """
+    Dependency: the raw request body, so the ingest endpoint
+    itself can stay a plain def (run in the thread pool).
+    """
+
+    return await request.body()
+
+
+def _error_text(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+        if detail["loc"]
+        else detail["msg"]
+        for detail in error.errors()
+    )
+
+
+def _too_many_rows():
+    return HTTPException(
+        status_code=413,
+        detail=(
+            f"Maksimum {COMPOUND_INGEST_MAX_ROWS} kompaun "
+            "bagi setiap permintaan / "
+            f"At most {COMPOUND_INGEST_MAX_ROWS} compounds "
+            "per request"
+        ),
+    )
+
+
+def parse_compound_rows(
+    body: bytes,
+    content_type: str = None,
+) -> tuple[list, list]:
+    """
+    Validate an NDJSON or JSON array body row by row.
+
+    Rows are numbered from 1 (the line number for NDJSON, blank
+    lines included).
+
+    Returns:
+        ([(row, CompoundIngest)], [(row, error text)])
+    """
+
+    valid = []
+    invalid = []
+
+    ndjson = (
+        "ndjson" in (content_type or "")
+        or not body.lstrip().startswith(b"[")
+    )
+
+    if ndjson:
+        rows = [
+            (number, line)
+            for number, line in enumerate(body.splitlines(), start=1)
+            if line.strip()
+        ]
+
+        if len(rows) > COMPOUND_INGEST_MAX_ROWS:
+            raise _too_many_rows()
+
+        for row, line in rows:
+            try:
+                valid.append((row, CompoundIngest.model_validate_json(line)))
+
+            except ValidationError as error:
+                invalid.append((row, _error_text(error)))
+
+        return valid, invalid
+
+    try:
+        items = json.loads(body)
+
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "Badan permintaan bukan JSON yang sah / "
+                "Request body is not valid JSON"
+            ),
+        )
+
+    if len(items) > COMPOUND_INGEST_MAX_ROWS:
+        raise _too_many_rows()
+
+    for row, item in enumerate(items, start=1):
+        try:
+            valid.append((row, CompoundIngest.model_validate(item)))
+
+        except ValidationError as error:
+            invalid.append((row, _error_text(error)))
+
+    return valid, invalid
+
+
+def _values(compound, stored_status=None):
+    values = compound.model_dump(include=set(UPSERT_FIELDS))
+
+    if stored_status == StatusTypeEnum.paid:
+        values["status"] = StatusTypeEnum.paid
+
+    else:
+        values["status"] = StatusTypeEnum(
+            compound.status or StatusTypeEnum.unpaid
+        )
+
+    values["plate_norm"] = normalize_plate(compound.plate)
+
+    return values
+
+
+def _upsert_batch(db, batch):
+    """
+    Upsert one batch [(row, CompoundIngest)] and commit.
+
+    Returns:
+        ({row: "created" | "updated" | "unchanged"},
+         normalized plates to forget)
+    """
+
+    numbers = sorted(compound.compoundnum for _, compound in batch)
+
+    stored = {
+        record.compoundnum: record
+        for record in db.execute(
+            select(
+                Compound.compoundnum,
+                Compound.id,
+                Compound.plate_norm,
+                *(getattr(Compound, field) for field in UPSERT_FIELDS),
+            )
+            .where(Compound.compoundnum.in_(numbers))
+            .order_by(Compound.compoundnum)
+            .with_for_update()
+        )
+    }
+
+    outcomes = {}
+    plates = set()
+    created = []
+    changed = []
+
+    for row, compound in batch:
+        record = stored.get(compound.compoundnum)
+
+        if record is None:
+            values = _values(compound)
+            values["compoundnum"] = compound.compoundnum
+
+            created.append(values)
+            plates.add(values["plate_norm"])
+            outcomes[row] = "created"
+            continue
+
+        values = _values(compound, record.status)
+
+        if all(
+            values[field] == getattr(record, field)
+            for field in UPSERT_FIELDS
+        ):
+            outcomes[row] = "unchanged"
+            continue
+
+        values["id"] = record.id
+
+        changed.append(values)
+        plates.update((record.plate_norm, values["plate_norm"]))
+        outcomes[row] = "updated"
+
+    if created:
+        db.execute(
+            insert(Compound),
+            created,
+        )
+
+    if changed:
+        db.execute(
+            update(Compound),
+            changed,
+        )
+
+    if plates:
+        bump_cache_version(db, UNPAID_COMPOUNDS)
+
+    db.commit()
+
+    return outcomes, plates
+
+
+def ingest_compounds(
+    db: Session,
+    compounds: list,
+) -> dict:
+    """
+    Upsert validated rows [(row, CompoundIngest)] on compoundnum.
+
+    When a compound number appears more than once, its last row
+    wins and the earlier ones are reported as "duplicate".
+
+    Returns:
+        {row: {"compoundnum", "result"}}, result one of created,
+        updated, unchanged, duplicate
+    """
+
+    results = {}
+    latest = {}
+
+    for row, compound in compounds:
+        earlier = latest.get(compound.compoundnum)
+
+        if earlier is not None:
+            results[earlier[0]] = {
+                "compoundnum": compound.compoundnum,
+                "result": "duplicate",
+            }
+
+        latest[compound.compoundnum] = (row, compound)
+
+    pending = list(latest.values())
+
+    for start in range(0, len(pending), COMPOUND_INGEST_BATCH):
+        batch = pending[start:start + COMPOUND_INGEST_BATCH]
+
+        for attempt in range(BATCH_ATTEMPTS):
+            try:
+                outcomes, plates = _upsert_batch(db, batch)
+                break
+
+            except IntegrityError:
+                db.rollback()
+
+                # Another ingest inserted some of these compounds
+                # after our SELECT: the next attempt updates them.
+                if attempt == BATCH_ATTEMPTS - 1:
+                    raise
+
+            except Exception:
+                db.rollback()
+                raise
+
+        if plates:
+            forget_unpaid_compounds(plates)
+
+        for row, compound in batch:
+            results[row] = {
+                "compoundnum": compound.compoundnum,
+                "result": outcomes[row],
+            }
+
+    return results
+
+
+def ingest_compound_body(
+    db: Session,
+    body: bytes,
+    content_type: str = None,
+) -> dict:
+    """
+    Parse, validate and upsert a bulk ingest request.
+
+    Returns:
+        {"received", "created", "updated", "unchanged",
+         "duplicate", "invalid", "results": [{"row",
+         "compoundnum", "result", "error" (invalid only)}]}
+    """
+
+    compounds, invalid = parse_compound_rows(body, content_type)
+
+    if not compounds and not invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "Tiada kompaun diberikan / "
+                "No compounds provided"
+            ),
+        )
+
+    results = ingest_compounds(db, compounds)
+
+    for row, error in invalid:
+        results[row] = {
+            "compoundnum": None,
+            "result": "invalid",
+            "error": error,
+        }
+
+    counts = Counter(result["result"] for result in results.values())
+
+    return {
+        "received": len(results),
+        **{
+            outcome: counts[outcome]
+            for outcome in (
+                "created",
+                "updated",
+                "unchanged",
+                "duplicate",
+                "invalid",
+            )
+        },
+        "results": [
+            {"row": row, **results[row]}
+            for row in sorted(results)
+        ],
+    }
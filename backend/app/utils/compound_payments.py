@@ -0,0 +1,289 @@
+from fastapi import HTTPException
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.schema.compound.compound_schema import (
+    Compound,
+    MultiCompound,
+    StatusTypeEnum,
+)
+from app.utils.cache_versions import bump_cache_version
+from app.utils.settlements import record_settlement
+from app.utils.sirim_time import sirim_now_naive
+from app.utils.unpaid_compounds import (
+    UNPAID_COMPOUNDS,
+    forget_unpaid_compounds,
+)
+
+
+# =========================================================
+# COMPOUND PAYMENTS (SET-BASED)
+# =========================================================
+#
+# Paying N compounds used to cost a SELECT per compound, an
+# INSERT per multi_compound row and a refresh per row after the
+# commit: 3N+ round trips, and two kiosks paying the same
+# compound at once could both see it unpaid.
+#
+# Both bulk endpoints now do a fixed number of statements:
+#
+#   1. SELECT ... WHERE compoundnum IN (...) FOR UPDATE
+#   2. one UPDATE compounds SET status = PAID for the unpaid ones
+#   3. one multi-row INSERT into multi_compound (+ read back ids)
+#   4. settlement rollup, unpaid-compounds cache version, COMMIT
+#
+# The row locks make a second payment of the same compounds
+# wait for the first one's commit and then skip them as paid.
+# Compound numbers are locked in sorted order, so overlapping
+# payments cannot deadlock.
+# =========================================================
+
+# Compound numbers per IN (...) list
+LOCK_CHUNK = 1000
+
+
+def _unique(compound_numbers):
+    return list(dict.fromkeys(compound_numbers))
+
+
+def _lock_compounds(db, compound_numbers):
+    """
+    {compoundnum: (id, status, amount, plate_norm)} of the
+    compounds that exist, locked until the commit. Entries
+    that are not strings cannot match and are left out.
+    """
+
+    numbers = sorted(
+        {
+            compoundnum
+            for compoundnum in compound_numbers
+            if isinstance(compoundnum, str)
+        }
+    )
+    found = {}
+
+    for start in range(0, len(numbers), LOCK_CHUNK):
+        rows = db.execute(
+            select(
+                Compound.compoundnum,
+                Compound.id,
+                Compound.status,
+                Compound.amount,
+                Compound.plate_norm,
+            )
+            .where(
+                Compound.compoundnum.in_(
+                    numbers[start:start + LOCK_CHUNK]
+                )
+            )
+            .order_by(Compound.compoundnum)
+            .with_for_update()
+        ).all()
+
+        for compoundnum, *compound in rows:
+            found[compoundnum] = tuple(compound)
+
+    return found
+
+
+def _set_paid(db, compound_ids):
+    db.execute(
+        update(Compound)
+        .where(Compound.id.in_(compound_ids))
+        .values(status=StatusTypeEnum.paid)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def pay_compounds(
+    db: Session,
+    transaction_bank_id: str,
+    compound_numbers: list[str],
+    terminal: str = None,
+) -> list[dict]:
+    """
+    Pay the unpaid compounds among compound_numbers under one
+    bank transaction, in one commit.
+
+    Fails with 404 when a compound does not exist (nothing is
+    paid) and with 400 when all of them are already paid.
+
+    Returns:
+        the new multi_compound rows as dicts (id,
+        transaction_bank_id, compoundnum, terminal), in the
+        order of compound_numbers
+    """
+
+    numbers = _unique(compound_numbers)
+    paid_at = sirim_now_naive()
+
+    try:
+        found = _lock_compounds(db, numbers)
+
+        for compoundnum in numbers:
+            if compoundnum not in found:
+                raise HTTPException(
+                    status_code=404,
+                    detail=(
+                        f"Kompaun {compoundnum} "
+                        "tidak dijumpai / "
+                        f"Compound {compoundnum} "
+                        "not found"
+                    ),
+                )
+
+        unpaid = [
+            compoundnum
+            for compoundnum in numbers
+            if found[compoundnum][1] != StatusTypeEnum.paid
+        ]
+
+        if not unpaid:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    "Semua kompaun yang dipilih telah dibayar / "
+                    "All selected compounds have already been paid"
+                ),
+            )
+
+        _set_paid(
+            db,
+            [found[compoundnum][0] for compoundnum in unpaid],
+        )
+
+        db.execute(
+            insert(MultiCompound),
+            [
+                {
+                    "transaction_bank_id": transaction_bank_id,
+                    "compoundnum": compoundnum,
+                    "terminal": terminal,
+                    "paid_at": paid_at,
+                }
+                for compoundnum in unpaid
+            ],
+        )
+
+        # The compounds are still locked, so the newest row of
+        # each under this bank transaction is the one just added.
+        ids = {}
+
+        for start in range(0, len(unpaid), LOCK_CHUNK):
+            ids.update(
+                db.execute(
+                    select(
+                        MultiCompound.compoundnum,
+                        MultiCompound.id,
+                    )
+                    .where(
+                        MultiCompound.transaction_bank_id
+                        == transaction_bank_id,
+                        MultiCompound.compoundnum.in_(
+                            unpaid[start:start + LOCK_CHUNK]
+                        ),
+                    )
+                    .order_by(MultiCompound.id)
+                ).all()
+            )
+
+        record_settlement(
+            db,
+            "compound",
+            terminal,
+            paid_at.date(),
+            None,
+            sum(found[compoundnum][2] for compoundnum in unpaid),
+            count=len(unpaid),
+        )
+
+        bump_cache_version(db, UNPAID_COMPOUNDS)
+
+        db.commit()
+
+    except Exception:
+        db.rollback()
+        raise
+
+    forget_unpaid_compounds(
+        found[compoundnum][3] for compoundnum in unpaid
+    )
+
+    return [
+        {
+            "id": ids[compoundnum],
+            "transaction_bank_id": transaction_bank_id,
+            "compoundnum": compoundnum,
+            "terminal": terminal,
+        }
+        for compoundnum in unpaid
+    ]
+
+
+def mark_compounds_paid(
+    db: Session,
+    compound_numbers: list[str],
+) -> tuple[list[str], list[dict]]:
+    """
+    Set the unpaid compounds among compound_numbers to PAID in
+    one commit (no multi_compound rows). compound_numbers comes
+    from an untyped body: entries that are not strings are
+    skipped as not found.
+
+    Returns:
+        (updated compound numbers, skipped [{"compoundnum",
+        "reason"}]), both in the order of compound_numbers
+    """
+
+    updated = []
+    skipped = []
+    seen = set()
+
+    try:
+        found = _lock_compounds(db, compound_numbers)
+
+        for compoundnum in compound_numbers:
+            if (
+                not isinstance(compoundnum, str)
+                or compoundnum not in found
+            ):
+                reason = "Tidak dijumpai / Not found"
+
+            elif (
+                compoundnum in seen
+                or found[compoundnum][1] == StatusTypeEnum.paid
+            ):
+                reason = "Telah dibayar / Already paid"
+
+            else:
+                seen.add(compoundnum)
+                updated.append(compoundnum)
+                continue
+
+            skipped.append(
+                {
+                    "compoundnum": compoundnum,
+                    "reason": reason,
+                }
+            )
+
+        if updated:
+            _set_paid(
+                db,
+                [found[compoundnum][0] for compoundnum in updated],
+            )
+
+            bump_cache_version(db, UNPAID_COMPOUNDS)
+
+        db.commit()
+
+    except Exception:
+        db.rollback()
+        raise
+
+    if updated:
+        forget_unpaid_compounds(
+            found[compoundnum][3] for compoundnum in updated
+        )
+
+    return updated, skipped
@@ -1,10 +1,60 @@
 # config.py
 
+import os
+
 BASE_IP = "4.194.122.32"  # <-- change only this if IP changes (VM IP Address)
 BASE_URL = f"http://{BASE_IP}:8000" #
 
-RATE_PER_HOUR = 0.65  # <-- change if diff rate (make sure change also for frontend)
+# Public address of this backend as seen by citizens' phones (used inside receipt QR codes)
+PUBLIC_API_URL = os.getenv("PUBLIC_API_URL", BASE_URL).rstrip("/")
+
+# "eager" = render + upload PDF/HTML before returning the QR (old behaviour)
+# "served" = PDF uploaded now, QR points to a signed backend URL that renders the HTML (no HTML blob)
+# "lazy"  = QR points to a signed backend URL, receipt is rendered on first open
+RECEIPT_RENDER_MODE = os.getenv("RECEIPT_RENDER_MODE", "eager").strip().lower()
+
+# Worker processes used to render bulk receipt exports (0 = one per CPU, 1 = no pool)
+RECEIPT_RENDER_WORKERS = int(os.getenv("RECEIPT_RENDER_WORKERS", "0"))
+
+# QR code image per kiosk model (kiosk sends X-Kiosk-Model, unknown/missing = "default")
+# box_size = pixels per QR module, border = quiet zone in modules, error_correction = L / M / Q / H
+# mask_pattern = None picks the best of 8 masks (standard); a fixed 0-7 encodes ~4x faster, still scannable
+QR_PROFILES = {
+    "default": {"box_size": 10, "border": 4, "error_correction": "L", "mask_pattern": None},
+    "compact": {"box_size": 6, "border": 4, "error_correction": "L", "mask_pattern": None},  # small / low-res screens
+}
+
+# Rendered QR PNGs kept in memory (kiosk retries re-use them)
+QR_CACHE_SIZE = int(os.getenv("QR_CACHE_SIZE", "256"))
+
+# Seconds between active-parking index syncs (other workers' payments show up within this time)
+PARKING_INDEX_SYNC_SECONDS = float(os.getenv("PARKING_INDEX_SYNC_SECONDS", "2"))
+
+# Parking expiry events: "expiring" this many minutes before the timeout, then "expired"
+EXPIRY_WARNING_MINUTES = int(os.getenv("EXPIRY_WARNING_MINUTES", "10"))
+# POST every expiry event as JSON to this URL (empty = off)
+EXPIRY_WEBHOOK_URL = os.getenv("EXPIRY_WEBHOOK_URL", "").strip()
+# In-process queue of expiry events for local consumers (0 = off)
+EXPIRY_QUEUE_SIZE = int(os.getenv("EXPIRY_QUEUE_SIZE", "0"))
+
+# Parking rate when table parking_tariffs is empty (kiosks read prices from POST /parking/quote)
+RATE_PER_HOUR = 0.65
+
+# Seconds between checks for edited parking tariffs (cache_versions "parking_tariffs")
+TARIFF_CHECK_SECONDS = float(os.getenv("TARIFF_CHECK_SECONDS", "30"))
+
+# Unpaid compounds cached per plate (GET /compound/unpaid/{plate}); plates with none are
+# cached for the shorter negative TTL (compounds inserted outside this API show up within it)
+UNPAID_COMPOUND_CACHE_TTL_SECONDS = float(os.getenv("UNPAID_COMPOUND_CACHE_TTL_SECONDS", "30"))
+UNPAID_COMPOUND_NEGATIVE_TTL_SECONDS = float(os.getenv("UNPAID_COMPOUND_NEGATIVE_TTL_SECONDS", "10"))
+UNPAID_COMPOUND_CACHE_SIZE = int(os.getenv("UNPAID_COMPOUND_CACHE_SIZE", "10000"))
+# Seconds between checks for compound writes in other workers (cache_versions "unpaid_compounds")
+UNPAID_COMPOUND_CHECK_SECONDS = float(os.getenv("UNPAID_COMPOUND_CHECK_SECONDS", "2"))
+
+# Bulk compound ingest (POST /compound/ingest): rows per request, rows per upsert batch + commit
+COMPOUND_INGEST_MAX_ROWS = int(os.getenv("COMPOUND_INGEST_MAX_ROWS", "50000"))
+COMPOUND_INGEST_BATCH = int(os.getenv("COMPOUND_INGEST_BATCH", "1000"))
 
 terminal = 1 #for dummy payment only needed
 
-refresh_token = "c5a91474e7c4f557b24e4e5b31f22c13ff003729f3c8ff814d47589f196a5257" #refresh token for pegepay
\ No newline at end of file
+refresh_token = "c5a91474e7c4f557b24e4e5b31f22c13ff003729f3c8ff814d47589f196a5257" #refresh token for pegepay
@@ -0,0 +1,368 @@
+import asyncio
+import heapq
+import itertools
+import queue
+import threading
+from datetime import timedelta
+
+import requests
+
+from app.utils.config import (
+    EXPIRY_QUEUE_SIZE,
+    EXPIRY_WARNING_MINUTES,
+    EXPIRY_WEBHOOK_URL,
+)
+from app.utils.parking_index import (
+    add_parking_listener,
+    list_active_parkings,
+)
+from app.utils.sirim_time import sirim_now_naive
+
+
+# =========================================================
+# PARKING EXPIRY EVENTS
+# =========================================================
+#
+# Finding expired cars used to mean polling /parking/ (the whole
+# table) and filtering on the client. The scheduler keeps a heap
+# of upcoming events for every active parking:
+#
+#   "expiring"   EXPIRY_WARNING_MINUTES before the timeout
+#   "expired"    at the timeout
+#
+# It is fed by the active-parking index (parking_index), which
+# already loads new and extended parkings from the database
+# incrementally. An extension leaves the old events in the heap;
+# they are skipped when they come up (lazy deletion), because
+# the plate is then scheduled for a later timeout.
+#
+# Events go to every registered sink (register_expiry_sink):
+#
+#   - SSE subscribers: GET /parking/expiring/stream
+#   - local queue (EXPIRY_QUEUE_SIZE > 0): expiry_queue
+#   - webhook (EXPIRY_WEBHOOK_URL): POSTed as JSON
+#
+# Every uvicorn worker runs its own scheduler, so with several
+# workers a webhook receives each event once per worker; the
+# event "id" is stable for de-duplication.
+# =========================================================
+
+_WARNING = timedelta(minutes=EXPIRY_WARNING_MINUTES)
+
+# Wake up at least this often, so a SIRIM clock correction is
+# picked up without waiting for the next event.
+_MAX_SLEEP_SECONDS = 60
+
+_heap = []
+_sequence = itertools.count()
+_scheduled = {}
+_condition = threading.Condition()
+
+_sinks = []
+
+_state = {
+    "thread": None,
+    "stopping": False,
+    "registered": False,
+}
+
+
+def expiry_event(kind, parking, now=None) -> dict:
+    now = now or sirim_now_naive()
+    timeout = parking["timeout"]
+
+    return {
+        "id": f"{parking['plate_norm']}:{timeout.isoformat()}:{kind}",
+        "event": kind,
+        "plate": parking["plate"],
+        "terminal": parking["terminal"],
+        "timeout": timeout.isoformat(),
+        "remaining_minutes": max(
+            int((timeout - now).total_seconds() // 60),
+            0,
+        ),
+    }
+
+
+# =========================================================
+# SCHEDULER
+# =========================================================
+
+def _schedule(parking):
+    plate = parking["plate_norm"]
+    timeout = parking["timeout"]
+
+    with _condition:
+        if _scheduled.get(plate) == timeout:
+            return
+
+        _scheduled[plate] = timeout
+
+        for fire_at, kind in (
+            (timeout - _WARNING, "expiring"),
+            (timeout, "expired"),
+        ):
+            heapq.heappush(
+                _heap,
+                (fire_at, next(_sequence), kind, parking),
+            )
+
+        _condition.notify()
+
+
+def _due_events():
+    """
+    Events that are due, or [] after sleeping until the next
+    one (or a new parking) comes up. Call with _condition held.
+    """
+
+    now = sirim_now_naive()
+    events = []
+
+    while _heap and _heap[0][0] <= now:
+        _, _, kind, parking = heapq.heappop(_heap)
+        plate = parking["plate_norm"]
+
+        # Extended since: the later timeout has its own events.
+        if _scheduled.get(plate) != parking["timeout"]:
+            continue
+
+        if kind == "expired":
+            del _scheduled[plate]
+
+        events.append(expiry_event(kind, parking, now))
+
+    if not events:
+        wait = _MAX_SLEEP_SECONDS
+
+        if _heap:
+            wait = min(
+                wait,
+                max((_heap[0][0] - now).total_seconds(), 0.01),
+            )
+
+        _condition.wait(timeout=wait)
+
+    return events
+
+
+def _emit(event):
+    for sink in list(_sinks):
+        try:
+            sink(event)
+
+        except Exception as error:
+            print(f"[WARN] Expiry sink failed: {error}")
+
+
+def _run():
+    while True:
+        with _condition:
+            if _state["stopping"]:
+                return
+
+            events = _due_events()
+
+        for event in events:
+            _emit(event)
+
+
+def register_expiry_sink(sink) -> None:
+    """
+    Send every expiry event (dict, see expiry_event) to
+    sink(event). Called from the scheduler thread; must not
+    block.
+    """
+
+    _sinks.append(sink)
+
+
+def start_expiry_scheduler() -> None:
+    """
+    Register the configured sinks and schedule the parkings the
+    index already holds. Call after start_parking_index().
+    """
+
+    if _state["thread"] is not None:
+        return
+
+    if not _state["registered"]:
+        register_expiry_sink(_broadcast)
+
+        if expiry_queue is not None:
+            register_expiry_sink(expiry_queue)
+
+        if EXPIRY_WEBHOOK_URL:
+            register_expiry_sink(WebhookSink(EXPIRY_WEBHOOK_URL))
+
+        add_parking_listener(_schedule)
+        _state["registered"] = True
+
+    for parking in list_active_parkings():
+        _schedule(parking)
+
+    _state["stopping"] = False
+    _state["thread"] = threading.Thread(
+        target=_run,
+        name="parking-expiry",
+        daemon=True,
+    )
+    _state["thread"].start()
+
+    print(f"[INFO] Parking expiry scheduler started: {len(_scheduled)} plates")
+
+
+def stop_expiry_scheduler() -> None:
+    thread = _state["thread"]
+
+    if thread is None:
+        return
+
+    with _condition:
+        _state["stopping"] = True
+        _condition.notify()
+
+    thread.join()
+    _state["thread"] = None
+
+
+# =========================================================
+# SINKS
+# =========================================================
+
+class QueueSink:
+    """
+    In-process queue of events; drops the oldest when full.
+    """
+
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def __call__(self, event):
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+
+                except queue.Empty:
+                    pass
+
+
+class WebhookSink:
+    """
+    POSTs each event as JSON from its own thread, so a slow
+    receiver never delays the scheduler. Failed posts are
+    logged and dropped.
+    """
+
+    def __init__(self, url, maxsize=1000):
+        self.url = url
+        self.pending = QueueSink(maxsize)
+
+        threading.Thread(
+            target=self._post_forever,
+            name="parking-expiry-webhook",
+            daemon=True,
+        ).start()
+
+    def __call__(self, event):
+        self.pending(event)
+
+    def _post_forever(self):
+        while True:
+            event = self.pending.queue.get()
+
+            try:
+                requests.post(
+                    self.url,
+                    json=event,
+                    timeout=5,
+                ).raise_for_status()
+
+            except Exception as error:
+                print(f"[WARN] Expiry webhook failed for {event['id']}: {error}")
+
+
+expiry_queue = (
+    QueueSink(EXPIRY_QUEUE_SIZE)
+    if EXPIRY_QUEUE_SIZE > 0
+    else None
+)
+
+
+# =========================================================
+# SSE SUBSCRIBERS
+# =========================================================
+
+# Events buffered per slow SSE client before new ones are dropped
+_SUBSCRIBER_BUFFER = 500
+
+_subscribers = set()
+_subscribers_lock = threading.Lock()
+
+
+def _offer(events, event):
+    try:
+        events.put_nowait(event)
+
+    except asyncio.QueueFull:
+        pass
+
+
+def _broadcast(event):
+    with _subscribers_lock:
+        subscribers = list(_subscribers)
+
+    for subscriber in subscribers:
+        loop, events = subscriber
+
+        try:
+            loop.call_soon_threadsafe(_offer, events, event)
+
+        except RuntimeError:
+            # Event loop closed without unsubscribing.
+            unsubscribe_expiry_events(subscriber)
+
+
+def subscribe_expiry_events():
+    """
+    New asyncio.Queue of events for the running event loop.
+    Pass it to unsubscribe_expiry_events() when done.
+    """
+
+    subscriber = (
+        asyncio.get_running_loop(),
+        asyncio.Queue(maxsize=_SUBSCRIBER_BUFFER),
+    )
+
+    with _subscribers_lock:
+        _subscribers.add(subscriber)
+
+    return subscriber
+
+
+def unsubscribe_expiry_events(subscriber) -> None:
+    with _subscribers_lock:
+        _subscribers.discard(subscriber)
+
+
+def expiring_now() -> list[dict]:
+    """
+    "expiring" events for the plates already inside the warning
+    window (sent first to a new SSE client).
+    """
+
+    now = sirim_now_naive()
+
+    return [
+        expiry_event("expiring", parking, now)
+        for parking in sorted(
+            list_active_parkings(now),
+            key=lambda parking: parking["timeout"],
+        )
+        if parking["timeout"] - now <= _WARNING
+    ]
@@ -0,0 +1,393 @@
+import heapq
+import threading
+import time
+
+from sqlalchemy import func, or_, select
+
+from app.db.database import SessionLocal
+from app.schema.parking.parking_schema import Parking, PaymentStatusEnum
+from app.schema.parking.transaction_parking_schema import TransactionParking
+from app.utils.cache_versions import read_cache_version
+from app.utils.config import PARKING_INDEX_SYNC_SECONDS
+from app.utils.plates import normalize_plate
+from app.utils.sirim_time import sirim_now_naive
+
+
+# =========================================================
+# ACTIVE PARKING INDEX
+# =========================================================
+#
+# Enforcement officers check hundreds of plates per hour, and
+# every /parking/check used to run an ORDER BY over the plate's
+# parkings. This worker keeps the active ones in memory:
+#
+#   _entries   plate_norm -> latest paid parking (PARKING_FIELDS)
+#   _expiry    heap of (timeout, plate_norm), evicted by the sync
+#              thread once the timeout has passed
+#
+# Pay / extend in this worker update the index right after
+# their commit. Payments in other workers bump the
+# "parking_index" row in cache_versions after theirs; the sync
+# thread reads it every PARKING_INDEX_SYNC_SECONDS and, when it
+# has moved, loads only what changed since the last sync.
+#
+# Extend updates the parking row in place, but every pay and
+# extend inserts a ticket (transaction_parkings, pointing at
+# the parking through parking_id). The sync keeps the highest
+# ticket id it has seen and loads the active parkings of the
+# newer tickets. The first sync loads all of them.
+#
+# Ticket ids are handed out before commit, so a slower payment
+# can commit a lower id after higher ones were seen. Ids below
+# the highest one that were missing from a sync (_gaps) are
+# read again on every later sync until they show up, however
+# many tickets came after them. A gap that stays empty for
+# _GAP_SECONDS (rolled back payment, skipped id) is dropped.
+#
+# Pay and extend only ever push a plate's timeout later, so a
+# reload merges (the later timeout wins) instead of replacing,
+# and cannot drop a payment made while it ran.
+#
+# Listeners (add_parking_listener) are told about every new or
+# later timeout, e.g. the expiry scheduler (parking_expiry).
+#
+# When the index has not synced for _MAX_STALENESS seconds
+# (database unreachable, thread not started) is_index_ready()
+# is False and the checks query the database as before.
+# =========================================================
+
+PARKING_INDEX = "parking_index"
+
+PARKING_FIELDS = [
+    "id",
+    "terminal",
+    "tariff_terminal",
+    "plate",
+    "plate_norm",
+    "time_used",
+    "payment_status",
+    "timein",
+    "timeout",
+    "amount",
+]
+
+_MAX_STALENESS = 5 * PARKING_INDEX_SYNC_SECONDS
+
+# Longest a payment transaction is expected to stay open
+# after taking its ticket id
+_GAP_SECONDS = 300
+
+# Most missing ticket ids kept at once (a jump in the ids
+# would otherwise add all of them)
+_MAX_GAPS = 1000
+
+_entries = {}
+_expiry = []
+_lock = threading.Lock()
+
+_state = {
+    "version": None,
+    "last_ticket_id": None,
+    "synced_at": None,
+}
+
+# ticket id -> time.monotonic() when it was first missing
+_gaps = {}
+
+_listeners = []
+
+_stop = threading.Event()
+_thread = None
+
+
+def _store(parking):
+    """
+    Keep the later of the stored and the given parking. Call
+    with _lock held. True when the entry changed.
+    """
+
+    plate = parking["plate_norm"]
+    current = _entries.get(plate)
+
+    if current and (
+        current["timeout"] > parking["timeout"]
+        or current == parking
+    ):
+        return False
+
+    _entries[plate] = parking
+    heapq.heappush(_expiry, (parking["timeout"], plate))
+
+    return True
+
+
+def _notify(changed):
+    for listener in list(_listeners):
+        for parking in changed:
+            try:
+                listener(dict(parking))
+
+            except Exception as error:
+                print(f"[WARN] Parking index listener failed: {error}")
+
+
+def add_parking_listener(listener) -> None:
+    """
+    Call listener(parking) for every new or extended entry.
+    """
+
+    _listeners.append(listener)
+
+
+def remember_parking(parking: dict) -> None:
+    """
+    Add a committed paid parking (PARKING_FIELDS) to the index.
+    """
+
+    parking = dict(parking)
+
+    with _lock:
+        changed = _store(parking)
+
+    if changed:
+        _notify([parking])
+
+
+def lookup_active_parking(plate: str, now=None) -> dict | None:
+    """
+    Active parking of the plate from memory, or None.
+
+    Only meaningful while is_index_ready() is True.
+    """
+
+    now = now or sirim_now_naive()
+
+    with _lock:
+        parking = _entries.get(normalize_plate(plate))
+
+    if parking and now < parking["timeout"]:
+        return dict(parking)
+
+    return None
+
+
+def lookup_active_timeouts(plates, now=None) -> dict:
+    """
+    {plate_norm: timeout} of the plates with active parking,
+    from memory, under one lock. plates must be normalized.
+    """
+
+    now = now or sirim_now_naive()
+    active = {}
+
+    with _lock:
+        for plate in plates:
+            parking = _entries.get(plate)
+
+            if parking and now < parking["timeout"]:
+                active[plate] = parking["timeout"]
+
+    return active
+
+
+def list_active_parkings(now=None) -> list[dict]:
+    now = now or sirim_now_naive()
+
+    with _lock:
+        return [
+            dict(parking)
+            for parking in _entries.values()
+            if now < parking["timeout"]
+        ]
+
+
+def is_index_ready() -> bool:
+    synced_at = _state["synced_at"]
+
+    return (
+        synced_at is not None
+        and time.monotonic() - synced_at < _MAX_STALENESS
+    )
+
+
+# =========================================================
+# SYNC
+# =========================================================
+
+def _load_active(db, now, tickets=None):
+    """
+    Active paid parkings, or only those with a ticket matching
+    the tickets condition.
+    """
+
+    columns = [
+        getattr(Parking, field)
+        for field in PARKING_FIELDS
+    ]
+
+    query = db.query(*columns).filter(
+        Parking.payment_status == PaymentStatusEnum.yes,
+        Parking.timeout > now,
+    )
+
+    if tickets is not None:
+        query = (
+            query.join(
+                TransactionParking,
+                TransactionParking.parking_id == Parking.id,
+            )
+            .filter(tickets)
+            .distinct()
+        )
+
+    return [
+        dict(zip(PARKING_FIELDS, row))
+        for row in query.all()
+    ]
+
+
+def _new_tickets(since):
+    """
+    Condition for the tickets a sync reads: newer than since,
+    or still missing at an earlier sync.
+    """
+
+    if not _gaps:
+        return TransactionParking.id > since
+
+    return or_(
+        TransactionParking.id > since,
+        TransactionParking.id.in_(sorted(_gaps)),
+    )
+
+
+def _track_gaps(since, last_ticket_id, found):
+    checked_at = time.monotonic()
+
+    for ticket_id in found:
+        _gaps.pop(ticket_id, None)
+
+    for ticket_id in range(
+        max(since + 1, last_ticket_id - _MAX_GAPS),
+        last_ticket_id,
+    ):
+        if ticket_id not in found:
+            _gaps.setdefault(ticket_id, checked_at)
+
+    for ticket_id, missing_since in list(_gaps.items()):
+        if checked_at - missing_since > _GAP_SECONDS:
+            del _gaps[ticket_id]
+
+
+def _evict_expired(now):
+    with _lock:
+        while _expiry and _expiry[0][0] <= now:
+            _, plate = heapq.heappop(_expiry)
+            parking = _entries.get(plate)
+
+            # A later heap item covers an extended parking.
+            if parking and parking["timeout"] <= now:
+                del _entries[plate]
+
+
+def sync_parking_index() -> None:
+    """
+    Load the parkings another worker paid or extended since the
+    last sync, then evict the expired ones.
+    """
+
+    now = sirim_now_naive()
+    db = SessionLocal()
+
+    try:
+        # Version first: a payment committed after it is read
+        # bumps it again and is picked up on the next sync.
+        version = read_cache_version(db, PARKING_INDEX)
+
+        if version != _state["version"]:
+            since = _state["last_ticket_id"]
+            first = since is None
+
+            if first:
+                # Everything is loaded; only the recent ids are
+                # checked for gaps.
+                since = max(
+                    (db.query(func.max(TransactionParking.id)).scalar() or 0)
+                    - _MAX_GAPS,
+                    0,
+                )
+
+            # Ids before parkings: a ticket committed in between
+            # is loaded now and read again on the next sync.
+            tickets = _new_tickets(since)
+
+            found = set(
+                db.scalars(
+                    select(TransactionParking.id).where(tickets)
+                )
+            )
+
+            active = _load_active(db, now, None if first else tickets)
+
+            last_ticket_id = max(found | {since})
+            _track_gaps(since, last_ticket_id, found)
+
+            with _lock:
+                changed = [
+                    parking
+                    for parking in active
+                    if _store(parking)
+                ]
+
+            _state["version"] = version
+            _state["last_ticket_id"] = last_ticket_id
+            _notify(changed)
+
+        _state["synced_at"] = time.monotonic()
+
+    finally:
+        db.close()
+
+    _evict_expired(now)
+
+
+def _run():
+    while not _stop.wait(PARKING_INDEX_SYNC_SECONDS):
+        try:
+            sync_parking_index()
+
+        except Exception as error:
+            print(f"[WARN] Parking index sync failed: {error}")
+
+
+def start_parking_index() -> None:
+    """
+    Start the sync thread and load the active parkings.
+
+    Raises when the first load fails; the thread keeps retrying
+    and checks use the database until it succeeds.
+    """
+
+    global _thread
+
+    if _thread is None:
+        _stop.clear()
+        _thread = threading.Thread(
+            target=_run,
+            name="parking-index",
+            daemon=True,
+        )
+        _thread.start()
+
+    sync_parking_index()
+
+    print(f"[INFO] Parking index loaded: {len(_entries)} active plates")
+
+
+def stop_parking_index() -> None:
+    global _thread
+
+    if _thread is not None:
+        _stop.set()
+        _thread.join()
+        _thread = None
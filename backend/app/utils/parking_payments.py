@@ -0,0 +1,209 @@
+from datetime import timedelta
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.schema.parking.parking_schema import Parking, PaymentStatusEnum
+from app.schema.parking.transaction_parking_schema import (
+    TicketOverviewEnum,
+    TransactionParking,
+)
+from app.utils.cache_versions import publish_cache_version
+from app.utils.parking_index import (
+    PARKING_FIELDS,
+    PARKING_INDEX,
+    remember_parking,
+)
+from app.utils.plates import normalize_plate
+from app.utils.settlements import record_settlement
+from app.utils.sirim_time import sirim_now_naive
+from app.utils.tariffs import quote_parking
+from app.utils.ticket_sequences import (
+    clean_terminal_id,
+    generate_ticket_id,
+)
+
+
+# =========================================================
+# PARKING PAYMENT (ONE UNIT OF WORK)
+# =========================================================
+#
+# Pay and extend used to commit the Parking row, refresh it,
+# count the day's tickets, insert the transaction, commit and
+# refresh again: 7-8 round trips to the remote database, and a
+# parking row without a ticket when the second half failed.
+#
+# record_parking_payment() does everything in one transaction:
+#
+#   1. latest paid parking of the plate (locked for update)
+#   2. price from the tariff engine (in memory, see tariffs)
+#   3. ticket number (one UPDATE, see ticket_sequences)
+#   4. INSERT/UPDATE parkings + INSERT transaction_parkings
+#      (pointing at the parking through parking_id)
+#   5. add the ticket to the day's settlement rollup
+#   6. COMMIT
+#
+# and returns plain values, so nothing is reloaded after the
+# commit. The new parking goes straight into this worker's
+# active-parking index; the parking index version is bumped
+# afterwards in its own short transaction (other workers
+# reload), so payments do not queue on its row lock.
+# =========================================================
+
+def _latest_paid_for_update(db, plate):
+    return (
+        db.query(Parking)
+        .filter(
+            Parking.plate_norm == normalize_plate(plate),
+            Parking.payment_status == PaymentStatusEnum.yes,
+        )
+        .order_by(Parking.timeout.desc())
+        .with_for_update()
+        .first()
+    )
+
+
+def record_parking_payment(
+    db: Session,
+    plate: str,
+    hours: float,
+    terminal: str,
+    transaction_type: str,
+    order_no: str = None,
+    bank_trx_no: str = None,
+    extend: bool = False,
+) -> dict:
+    """
+    Record a paid parking session and its ticket in one commit.
+
+    Args:
+        terminal:
+            Terminal ID as sent by the kiosk (cleaned here).
+
+        extend:
+            False (pay): fails with 400 while the plate still has
+            active parking.
+            True (extend): adds the hours to the active parking,
+            or starts a new one when it has expired.
+
+    Returns:
+        {"parking": Parking fields, "receipt": parking receipt
+        payload (ticket_id, plate, hours, time_in, time_out,
+        amount, transaction_type, order_no, bank_trx_no)}
+    """
+
+    now = sirim_now_naive()
+    terminal = clean_terminal_id(terminal)
+
+    try:
+        latest = _latest_paid_for_update(db, plate)
+
+        active = (
+            latest
+            if latest and latest.timeout and now < latest.timeout
+            else None
+        )
+
+        if active and not extend:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Parking already active until {active.timeout}",
+            )
+
+        if active:
+            # Priced as part of the whole session (daily cap,
+            # grace), at the tariff of the terminal it began at;
+            # terminal itself follows the latest payment.
+            quote = quote_parking(
+                db,
+                active.tariff_terminal or active.terminal,
+                active.timein,
+                [hours],
+                used_hours=active.time_used,
+            )[0]
+
+            active.time_used += hours
+            active.timeout += timedelta(hours=hours)
+            active.amount = quote["total_amount"]
+            active.terminal = terminal
+
+            parking = active
+            overview = TicketOverviewEnum.extend
+
+        else:
+            quote = quote_parking(db, terminal, now, [hours])[0]
+
+            parking = Parking(
+                plate=plate,
+                terminal=terminal,
+                tariff_terminal=terminal,
+                time_used=hours,
+                timein=now,
+                timeout=now + timedelta(hours=hours),
+                payment_status=PaymentStatusEnum.yes,
+                amount=quote["total_amount"],
+            )
+            db.add(parking)
+
+            overview = TicketOverviewEnum.new
+
+        # Writes the parking now so the ticket can point at its
+        # id (same statements as one flush at the end).
+        db.flush()
+
+        transaction = TransactionParking(
+            ticket_id=generate_ticket_id(
+                db,
+                terminal,
+                current_time=now,
+            ),
+            plate=plate,
+            terminal=terminal,
+            hours=hours,
+            amount=quote["amount"],
+            transaction_type=transaction_type,
+            Ticket_Overview=overview,
+            order_no=order_no,
+            bank_trx_no=bank_trx_no,
+            parking_id=parking.id,
+        )
+        db.add(transaction)
+        db.flush()
+
+        result = {
+            "parking": {
+                field: getattr(parking, field)
+                for field in PARKING_FIELDS
+            },
+            "receipt": {
+                "ticket_id": transaction.ticket_id,
+                "plate": plate,
+                "hours": hours,
+                "time_in": parking.timein,
+                "time_out": parking.timeout,
+                "amount": transaction.amount,
+                "transaction_type": transaction_type,
+                "order_no": order_no,
+                "bank_trx_no": bank_trx_no,
+            },
+        }
+
+        record_settlement(
+            db,
+            "parking",
+            terminal,
+            now.date(),
+            transaction_type,
+            transaction.amount,
+        )
+
+        db.commit()
+
+    except Exception:
+        db.rollback()
+        raise
+
+    remember_parking(result["parking"])
+    publish_cache_version(db, PARKING_INDEX)
+
+    return result
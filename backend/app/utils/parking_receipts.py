@@ -0,0 +1,95 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.schema.parking.parking_schema import Parking
+from app.schema.parking.transaction_parking_schema import TransactionParking
+from app.utils.plates import normalize_plate
+
+
+# =========================================================
+# PARKING RECEIPT CONTEXT
+# =========================================================
+#
+# A parking receipt needs the ticket (transaction_parkings) and
+# the times of its parking session (parkings). Both come from
+# one query: the transaction joined to its session through
+# parking_id, or, for tickets issued before parking_id existed,
+# to the plate's latest parking (what the receipts showed
+# before).
+#
+# The result is a frozen ParkingReceiptContext that holds no
+# session, so the caller can close the session before the slow
+# PDF rendering and upload.
+# =========================================================
+
+@dataclass(frozen=True, slots=True)
+class ParkingReceiptContext:
+    ticket_id: str
+    terminal: str
+    plate: str
+    hours: float
+    amount: float
+    transaction_type: str | None
+    order_no: str | None
+    bank_trx_no: str | None
+    time_in: datetime | None
+    time_out: datetime | None
+
+
+def load_parking_receipt_context(
+    db: Session,
+    ticket_id: str | None = None,
+    plate: str | None = None,
+) -> ParkingReceiptContext | None:
+    """
+    Receipt context of the ticket, else of the plate's latest
+    ticket, else of the latest ticket overall. None when there
+    is no such ticket.
+    """
+
+    latest_parking_id = (
+        select(func.max(Parking.id))
+        .where(Parking.plate_norm == TransactionParking.plate_norm)
+        .correlate(TransactionParking)
+        .scalar_subquery()
+    )
+
+    query = (
+        db.query(
+            TransactionParking.ticket_id,
+            TransactionParking.terminal,
+            TransactionParking.plate,
+            TransactionParking.hours,
+            TransactionParking.amount,
+            TransactionParking.transaction_type,
+            TransactionParking.order_no,
+            TransactionParking.bank_trx_no,
+            Parking.timein,
+            Parking.timeout,
+        )
+        .outerjoin(
+            Parking,
+            Parking.id == func.coalesce(
+                TransactionParking.parking_id,
+                latest_parking_id,
+            ),
+        )
+    )
+
+    if ticket_id is not None:
+        query = query.filter(TransactionParking.ticket_id == ticket_id)
+
+    elif plate is not None:
+        query = query.filter(
+            TransactionParking.plate_norm == normalize_plate(plate)
+        )
+
+    row = query.order_by(TransactionParking.id.desc()).first()
+
+    if row is None:
+        return None
+
+    return ParkingReceiptContext(*row)
@@ -0,0 +1,26 @@
+import re
+
+
+# =========================================================
+# PLATE NUMBERS
+# =========================================================
+#
+# Kiosks, handhelds and the compound system send the same plate
+# as "WXY 1234", "wxy1234" or "WXY-1234". Lookups compare the
+# plate_norm column (kept by the models on every write) with
+# normalize_plate() of the requested plate.
+# =========================================================
+
+_NOT_PLATE_CHARACTER = re.compile(r"[^0-9A-Z]")
+
+
+def normalize_plate(plate: str | None) -> str | None:
+    """
+    Canonical plate for matching: upper case, letters and
+    digits only.
+    """
+
+    if plate is None:
+        return None
+
+    return _NOT_PLATE_CHARACTER.sub("", plate.upper())
@@ -0,0 +1,338 @@
+import base64
+import json
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from io import BytesIO
+
+import qrcode
+from fastapi import Request, Response
+from PIL import Image
+
+from app.utils.config import QR_CACHE_SIZE, QR_PROFILES
+
+
+# =========================================================
+# RECEIPT QR CODES
+# =========================================================
+#
+# Every receipt QR endpoint returns the receipt link as a QR
+# code, in the format the kiosk asks for:
+#
+# - png   : 1-bit PNG (default). Drawn straight from the module
+#           matrix, much faster and smaller than the RGB image
+#           drawn by qrcode's PIL backend.
+# - svg   : one <path> of dark modules, for kiosks that scale
+#           the code themselves.
+# - matrix: JSON with the module matrix bit-packed in base64,
+#           for kiosks that draw the modules themselves.
+#
+# The format comes from ?format=png|svg|matrix, or from the
+# Accept header (image/svg+xml or QR_MATRIX_MEDIA_TYPE). A
+# plain application/json Accept is ignored, because HTTP
+# clients send it by default and existing kiosks expect PNG.
+#
+# Size and error correction come from the kiosk's profile in
+# QR_PROFILES (X-Kiosk-Model header). Rendered output is kept
+# in an LRU cache keyed by URL, profile and format, so a kiosk
+# that asks for the same QR again gets it without re-encoding.
+# =========================================================
+
+ERROR_CORRECTION = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+
+DEFAULT_PROFILE = "default"
+
+QR_MATRIX_MEDIA_TYPE = "application/vnd.tip.qr-matrix+json"
+
+QR_FORMATS = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "matrix": QR_MATRIX_MEDIA_TYPE,
+}
+
+_kiosk_model = ContextVar(
+    "kiosk_model",
+    default=None,
+)
+
+_qr_format = ContextVar(
+    "qr_format",
+    default="png",
+)
+
+_qr_cache = OrderedDict()
+_qr_cache_lock = threading.Lock()
+
+
+def _requested_format(request: Request) -> str:
+    requested = (
+        request.query_params.get("format")
+        or ""
+    ).strip().lower()
+
+    if requested in QR_FORMATS:
+        return requested
+
+    accept = request.headers.get("accept") or ""
+
+    if QR_MATRIX_MEDIA_TYPE in accept:
+        return "matrix"
+
+    if "image/svg+xml" in accept:
+        return "svg"
+
+    return "png"
+
+
+async def use_kiosk_qr_profile(request: Request) -> None:
+    """
+    Router dependency: remember the kiosk model (X-Kiosk-Model)
+    and the requested QR format of the current request, so QR
+    endpoints use them.
+
+    It must stay async so the values are set in the request's
+    own context (sync dependencies run in a worker thread).
+    """
+
+    _kiosk_model.set(
+        request.headers.get("x-kiosk-model")
+    )
+    _qr_format.set(
+        _requested_format(request)
+    )
+
+
+def get_qr_profile(name: str = None) -> dict:
+    """
+    Named profile, else the current kiosk's profile, else the
+    default one.
+    """
+
+    name = name or _kiosk_model.get()
+
+    return QR_PROFILES.get(
+        (name or "").strip().lower(),
+        QR_PROFILES[DEFAULT_PROFILE],
+    )
+
+
+# =========================================================
+# ENCODE
+# =========================================================
+
+def _encode_matrix(url, error_correction, mask_pattern=None):
+    """
+    (version, modules) without the quiet zone. modules is a
+    list of rows of booleans, True = dark.
+    """
+
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=ERROR_CORRECTION[error_correction],
+        border=0,
+        mask_pattern=mask_pattern,
+    )
+
+    qr.add_data(url)
+    qr.make(fit=True)
+
+    return qr.version, qr.modules
+
+
+def _render_png(modules, box_size, border):
+    # One pixel per module (quiet zone included), black = 0,
+    # then scaled up without smoothing.
+    size = len(modules) + 2 * border
+    blank_rows = b"\xff" * (size * border)
+    side = b"\xff" * border
+
+    pixels = b"".join(
+        [
+            blank_rows,
+            *(
+                side
+                + bytes(
+                    0 if module else 255
+                    for module in row
+                )
+                + side
+                for row in modules
+            ),
+            blank_rows,
+        ]
+    )
+
+    image = Image.frombytes(
+        "L",
+        (size, size),
+        pixels,
+    ).convert("1")
+
+    image = image.resize(
+        (size * box_size, size * box_size),
+        Image.NEAREST,
+    )
+
+    buffer = BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+
+    return buffer.getvalue()
+
+
+def _render_svg(modules, box_size, border):
+    # Each run of dark modules in a row is one rectangle of
+    # the path, in module units.
+    size = len(modules) + 2 * border
+    path = []
+
+    for y, row in enumerate(modules):
+        x = 0
+
+        while x < len(row):
+            if not row[x]:
+                x += 1
+                continue
+
+            start = x
+
+            while x < len(row) and row[x]:
+                x += 1
+
+            path.append(
+                f"M{start + border} {y + border}"
+                f"h{x - start}v1h-{x - start}z"
+            )
+
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{size * box_size}" height="{size * box_size}" '
+        f'viewBox="0 0 {size} {size}" '
+        'shape-rendering="crispEdges">'
+        f'<rect width="{size}" height="{size}" fill="#fff"/>'
+        f'<path d="{"".join(path)}" fill="#000"/>'
+        "</svg>"
+    ).encode("utf-8")
+
+
+def _render_matrix(modules, version, border, error_correction):
+    # Row by row, most significant bit first, 1 = dark. The
+    # last byte is padded with zeros.
+    bits = "".join(
+        "1" if module else "0"
+        for row in modules
+        for module in row
+    )
+    bits += "0" * (-len(bits) % 8)
+
+    packed = int(bits, 2).to_bytes(len(bits) // 8, "big")
+
+    return json.dumps(
+        {
+            "version": version,
+            "size": len(modules),
+            "border": border,
+            "error_correction": error_correction,
+            "modules": base64.b64encode(packed).decode("ascii"),
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _encode(
+    url,
+    box_size,
+    border,
+    error_correction,
+    mask_pattern,
+    qr_format,
+):
+    version, modules = _encode_matrix(
+        url,
+        error_correction,
+        mask_pattern,
+    )
+
+    if qr_format == "svg":
+        return _render_svg(modules, box_size, border)
+
+    if qr_format == "matrix":
+        return _render_matrix(
+            modules,
+            version,
+            border,
+            error_correction,
+        )
+
+    return _render_png(modules, box_size, border)
+
+
+# =========================================================
+# PUBLIC
+# =========================================================
+
+def generate_qr(
+    url: str,
+    profile: str = None,
+    qr_format: str = None,
+) -> bytes:
+    """
+    QR code for url in the given (or requested) format.
+    """
+
+    settings = get_qr_profile(profile)
+    qr_format = qr_format or _qr_format.get()
+
+    key = (
+        url,
+        settings["box_size"],
+        settings["border"],
+        settings["error_correction"],
+        settings.get("mask_pattern"),
+        qr_format,
+    )
+
+    with _qr_cache_lock:
+        output = _qr_cache.get(key)
+
+        if output is not None:
+            _qr_cache.move_to_end(key)
+            return output
+
+    output = _encode(*key)
+
+    with _qr_cache_lock:
+        _qr_cache[key] = output
+
+        while len(_qr_cache) > QR_CACHE_SIZE:
+            _qr_cache.popitem(last=False)
+
+    return output
+
+
+def generate_qr_png(url: str, profile: str = None) -> bytes:
+    """
+    PNG bytes of the QR code for url.
+    """
+
+    return generate_qr(url, profile, "png")
+
+
+def generate_qr_response(url: str, profile: str = None) -> Response:
+    """
+    QR code for url in the format the kiosk asked for.
+    """
+
+    qr_format = _qr_format.get()
+
+    return Response(
+        content=generate_qr(url, profile, qr_format),
+        media_type=QR_FORMATS[qr_format],
+        headers={
+            "Vary": "Accept, X-Kiosk-Model",
+        },
+    )
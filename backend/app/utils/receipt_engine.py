@@ -0,0 +1,1839 @@
+import html
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfgen import canvas
+from reportlab.platypus import (
+    KeepTogether,
+    PageBreak,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle,
+)
+
+
+# =========================================================
+# RECEIPT ENGINE
+# =========================================================
+#
+# Receipt modules describe WHAT goes on the receipt as a plain
+# layout dict. This module decides HOW it is drawn, so there is
+# one set of drawing code, one font cache and one place to tune.
+#
+# Two kinds of receipt:
+#
+#   render_receipt_pdf()   card receipts (parking, compound,
+#                          license) drawn at fixed positions
+#   render_document_pdf()  council receipts (tax, rental, bill)
+#                          whose text wraps and flows across
+#                          pages; see DOCUMENT RECEIPTS below
+#
+# Card layout keys (all optional except title):
+#
+#   title      (malay, english)
+#   subtitle   (malay, english)
+#   subtitle_note  small line under the subtitle
+#   logo       ImageReader or None
+#   grid       [(malay, english, value, value_size), ...]
+#              -> cards two per row, label above the value
+#   info       [(malay, english, value), ...]  -> info cards
+#   note       (malay, english, long_text)     -> wrapped card
+#   columns    [{"label": (malay, english),
+#                "x": offset from table left,
+#                "align": "left" | "right",
+#                "style": "key" | "text" | "amount"}, ...]
+#   rows       [[cell, ...], ...]               -> item table
+#   row_height table row height in points (default 32)
+#   total      (malay, english, amount)
+#   thank_you  (malay, english), or a list of them
+#   footer     (malay, english)
+#   footer_note  small line under the footer
+#
+# Pages break automatically. Continuation pages get a compact
+# header and repeat the table header. Page chrome and row
+# backgrounds are drawn once per document as PDF forms, so
+# render time and file size grow linearly with the rows.
+# =========================================================
+
+# =========================================================
+# PDF OUTPUT SETTINGS
+# =========================================================
+#
+# Shared by every receipt generator (they import
+# PAGE_COMPRESSION from here):
+#
+# - Page and image streams are Flate compressed.
+# - Streams are written as binary instead of ASCII85 text,
+#   which is about 25% smaller and skips a slow encoding step.
+# - Only the standard PDF fonts (Helvetica) are used, so no
+#   font files are embedded. If a TTF font is ever registered,
+#   ReportLab embeds only the glyphs that are used (subset).
+# =========================================================
+
+PAGE_COMPRESSION = 1
+
+rl_config.useA85 = 0
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+
+MARGIN = 40
+CONTENT_WIDTH = PAGE_WIDTH - (2 * MARGIN)
+
+HEADER_HEIGHT = 165
+COMPACT_HEADER_HEIGHT = 60
+FOOTER_SAFE_Y = 95
+
+INFO_CARD_HEIGHT = 40
+INFO_VALUE_X = 190
+GRID_CARD_HEIGHT = 66
+GRID_GAP = 12
+TOTAL_HEIGHT = 58
+THANK_YOU_SPACE = 65
+
+PRIMARY_BLUE = colors.HexColor("#003B8E")
+SECONDARY_BLUE = colors.HexColor("#0A66D8")
+SOFT_BLUE = colors.HexColor("#F4F8FF")
+ROW_BLUE = colors.HexColor("#EDF4FF")
+BORDER_COLOR = colors.HexColor("#DCE8F8")
+TOTAL_BORDER = colors.HexColor("#BFD7FF")
+GREY_TEXT = colors.HexColor("#6B7280")
+DARK_TEXT = colors.HexColor("#111827")
+SUCCESS_GREEN = colors.HexColor("#15803D")
+
+CELL_FONTS = {
+    "key": ("Helvetica-Bold", 9.5, DARK_TEXT),
+    "text": ("Helvetica", 9, DARK_TEXT),
+    "amount": ("Helvetica-Bold", 9.5, PRIMARY_BLUE),
+}
+
+DEFAULT_FOOTER = (
+    "2026 Juara Inovasi Pasifik System "
+    "· Hak Cipta Terpelihara",
+    "All Rights Reserved",
+)
+
+
+# =========================================================
+# DRAWING PRIMITIVES
+# =========================================================
+
+def _draw_image_keep_ratio(
+    pdf,
+    image,
+    x,
+    y,
+    max_width,
+    max_height,
+):
+    try:
+        image_width, image_height = image.getSize()
+
+        ratio = min(
+            max_width / image_width,
+            max_height / image_height,
+        )
+
+        draw_width = image_width * ratio
+        draw_height = image_height * ratio
+
+        pdf.drawImage(
+            image,
+            x + (max_width - draw_width) / 2,
+            y + (max_height - draw_height) / 2,
+            width=draw_width,
+            height=draw_height,
+            preserveAspectRatio=True,
+            mask="auto",
+        )
+
+    except Exception as error:
+        print(
+            "[WARN] Failed to draw logo: "
+            f"{error}"
+        )
+
+
+def _draw_bilingual(
+    pdf,
+    malay,
+    english,
+    x,
+    y,
+    align="left",
+    malay_size=9,
+    english_size=8,
+    malay_color=colors.black,
+    english_color=GREY_TEXT,
+    line_gap=11,
+):
+    """
+    Bahasa Melayu in bold with English in italic underneath.
+    """
+
+    draw = {
+        "left": pdf.drawString,
+        "right": pdf.drawRightString,
+        "center": pdf.drawCentredString,
+    }[align]
+
+    pdf.setFillColor(malay_color)
+    pdf.setFont(
+        "Helvetica-Bold",
+        malay_size,
+    )
+    draw(
+        x,
+        y,
+        str(malay),
+    )
+
+    pdf.setFillColor(english_color)
+    pdf.setFont(
+        "Helvetica-Oblique",
+        english_size,
+    )
+    draw(
+        x,
+        y - line_gap,
+        str(english),
+    )
+
+
+# =========================================================
+# SECTIONS
+# =========================================================
+
+def _draw_header_bands(pdf):
+    pdf.setFillColor(PRIMARY_BLUE)
+    pdf.rect(
+        0,
+        PAGE_HEIGHT - HEADER_HEIGHT,
+        PAGE_WIDTH,
+        HEADER_HEIGHT,
+        fill=True,
+        stroke=False,
+    )
+
+    pdf.setFillColor(SECONDARY_BLUE)
+    pdf.rect(
+        0,
+        PAGE_HEIGHT - 42,
+        PAGE_WIDTH,
+        42,
+        fill=True,
+        stroke=False,
+    )
+
+
+def _draw_header_circles(pdf):
+    # Transparent fills cannot live inside a form (no ExtGState
+    # resources), so the circles are drawn on each page.
+    pdf.saveState()
+
+    pdf.setFillColor(
+        colors.Color(
+            1,
+            1,
+            1,
+            alpha=0.08,
+        )
+    )
+
+    pdf.circle(
+        PAGE_WIDTH - 45,
+        PAGE_HEIGHT - 50,
+        95,
+        fill=True,
+        stroke=False,
+    )
+
+    pdf.circle(
+        40,
+        PAGE_HEIGHT - 145,
+        55,
+        fill=True,
+        stroke=False,
+    )
+
+    pdf.restoreState()
+
+
+def _draw_header_content(pdf, layout):
+    if layout.get("logo"):
+        _draw_image_keep_ratio(
+            pdf,
+            layout["logo"],
+            40,
+            PAGE_HEIGHT - 135,
+            100,
+            90,
+        )
+
+    title_ms, title_en = layout["title"]
+
+    _draw_bilingual(
+        pdf,
+        title_ms,
+        title_en,
+        PAGE_WIDTH / 2,
+        PAGE_HEIGHT - 62,
+        align="center",
+        malay_size=19,
+        english_size=10,
+        malay_color=colors.white,
+        english_color=colors.white,
+        line_gap=15,
+    )
+
+    if layout.get("subtitle"):
+        subtitle_ms, subtitle_en = layout["subtitle"]
+
+        _draw_bilingual(
+            pdf,
+            subtitle_ms,
+            subtitle_en,
+            PAGE_WIDTH / 2,
+            PAGE_HEIGHT - 108,
+            align="center",
+            malay_size=9,
+            english_size=8,
+            malay_color=colors.white,
+            english_color=colors.white,
+        )
+
+    if layout.get("subtitle_note"):
+        pdf.setFillColor(colors.white)
+        pdf.setFont(
+            "Helvetica",
+            9,
+        )
+        pdf.drawCentredString(
+            PAGE_WIDTH / 2,
+            PAGE_HEIGHT - 130,
+            str(layout["subtitle_note"]),
+        )
+
+
+def _draw_compact_header(pdf, layout):
+    pdf.setFillColor(PRIMARY_BLUE)
+    pdf.rect(
+        0,
+        PAGE_HEIGHT - COMPACT_HEADER_HEIGHT,
+        PAGE_WIDTH,
+        COMPACT_HEADER_HEIGHT,
+        fill=True,
+        stroke=False,
+    )
+
+    pdf.setFillColor(SECONDARY_BLUE)
+    pdf.rect(
+        0,
+        PAGE_HEIGHT - 12,
+        PAGE_WIDTH,
+        12,
+        fill=True,
+        stroke=False,
+    )
+
+    title_ms, title_en = layout["title"]
+
+    _draw_bilingual(
+        pdf,
+        title_ms,
+        title_en,
+        PAGE_WIDTH / 2,
+        PAGE_HEIGHT - 34,
+        align="center",
+        malay_size=13,
+        english_size=8,
+        malay_color=colors.white,
+        english_color=colors.white,
+        line_gap=12,
+    )
+
+
+def _do_form(pdf, name, draw, *draw_args):
+    """
+    Draw static content once per document as a PDF form and
+    reference it afterwards. Later pages only add one operator
+    instead of re-encoding shapes, text and the logo image.
+    """
+
+    if not pdf.hasForm(name):
+        pdf.beginForm(name)
+        draw(pdf, *draw_args)
+        pdf.endForm()
+
+    pdf.doForm(name)
+
+
+def _draw_page_header(pdf, layout, continued=False):
+    """
+    Full header on the first page, compact header on
+    continuation pages so long tables fit more rows.
+    """
+
+    if continued:
+        _do_form(
+            pdf,
+            "CompactHeader",
+            _draw_compact_header,
+            layout,
+        )
+
+        return PAGE_HEIGHT - COMPACT_HEADER_HEIGHT - 24
+
+    _do_form(
+        pdf,
+        "HeaderBands",
+        _draw_header_bands,
+    )
+
+    _draw_header_circles(pdf)
+
+    _do_form(
+        pdf,
+        "HeaderContent",
+        _draw_header_content,
+        layout,
+    )
+
+    return PAGE_HEIGHT - HEADER_HEIGHT - 28
+
+
+def _draw_page_footer(pdf, layout):
+    footer_ms, footer_en = layout.get(
+        "footer",
+        DEFAULT_FOOTER,
+    )
+
+    pdf.setStrokeColor(BORDER_COLOR)
+    pdf.line(
+        MARGIN,
+        55,
+        PAGE_WIDTH - MARGIN,
+        55,
+    )
+
+    _draw_bilingual(
+        pdf,
+        footer_ms,
+        footer_en,
+        PAGE_WIDTH / 2,
+        39,
+        align="center",
+        malay_size=7.5,
+        english_size=6.5,
+        malay_color=PRIMARY_BLUE,
+        english_color=GREY_TEXT,
+        line_gap=9,
+    )
+
+    if layout.get("footer_note"):
+        pdf.setFillColor(GREY_TEXT)
+        pdf.setFont(
+            "Helvetica",
+            6.5,
+        )
+        pdf.drawCentredString(
+            PAGE_WIDTH / 2,
+            18,
+            str(layout["footer_note"]),
+        )
+
+
+def _next_page(pdf, layout):
+    _do_form(
+        pdf,
+        "Footer",
+        _draw_page_footer,
+        layout,
+    )
+    pdf.showPage()
+
+    return _draw_page_header(
+        pdf,
+        layout,
+        continued=True,
+    )
+
+
+def _draw_info_card(
+    pdf,
+    y,
+    index,
+    malay,
+    english,
+    value,
+    lines=None,
+    card_height=INFO_CARD_HEIGHT,
+):
+    pdf.setFillColor(
+        SOFT_BLUE
+        if index % 2 == 0
+        else colors.white
+    )
+    pdf.setStrokeColor(BORDER_COLOR)
+
+    pdf.roundRect(
+        MARGIN,
+        y - card_height,
+        CONTENT_WIDTH,
+        card_height,
+        7,
+        fill=True,
+        stroke=True,
+    )
+
+    _draw_bilingual(
+        pdf,
+        malay,
+        english,
+        MARGIN + 16,
+        y - 17,
+        malay_size=9,
+        english_size=7.5,
+        malay_color=PRIMARY_BLUE,
+        line_gap=11,
+    )
+
+    pdf.setFillColor(DARK_TEXT)
+
+    if lines is None:
+        pdf.setFont(
+            "Helvetica-Bold",
+            10,
+        )
+        pdf.drawString(
+            MARGIN + INFO_VALUE_X,
+            y - 24,
+            str(value),
+        )
+
+    else:
+        pdf.setFont(
+            "Helvetica",
+            9,
+        )
+
+        for line_index, line in enumerate(lines):
+            pdf.drawString(
+                MARGIN + INFO_VALUE_X,
+                y - 18 - (line_index * 12),
+                line,
+            )
+
+    return y - card_height - 6
+
+
+def _draw_grid_card(
+    pdf,
+    x,
+    y,
+    width,
+    malay,
+    english,
+    value,
+    value_size,
+):
+    pdf.setFillColor(SOFT_BLUE)
+    pdf.setStrokeColor(BORDER_COLOR)
+
+    pdf.roundRect(
+        x,
+        y - GRID_CARD_HEIGHT,
+        width,
+        GRID_CARD_HEIGHT,
+        10,
+        fill=True,
+        stroke=True,
+    )
+
+    _draw_bilingual(
+        pdf,
+        malay,
+        english,
+        x + 14,
+        y - 19,
+        malay_size=8.5,
+        english_size=7,
+        malay_color=PRIMARY_BLUE,
+        line_gap=10,
+    )
+
+    pdf.setFillColor(DARK_TEXT)
+    pdf.setFont(
+        "Helvetica-Bold",
+        value_size,
+    )
+    pdf.drawString(
+        x + 14,
+        y - GRID_CARD_HEIGHT + 15,
+        str(value),
+    )
+
+
+def _draw_table_header(pdf, y, columns):
+    header_height = 44
+
+    pdf.setFillColor(SECONDARY_BLUE)
+
+    pdf.roundRect(
+        MARGIN,
+        y - header_height,
+        CONTENT_WIDTH,
+        header_height,
+        10,
+        fill=True,
+        stroke=False,
+    )
+
+    for column in columns:
+        malay, english = column["label"]
+
+        _draw_bilingual(
+            pdf,
+            malay,
+            english,
+            MARGIN + column["x"],
+            y - 15,
+            align=column.get("align", "left"),
+            malay_size=8.5,
+            english_size=7.5,
+            malay_color=colors.white,
+            english_color=colors.white,
+            line_gap=11,
+        )
+
+    return y - header_height - 6
+
+
+def _draw_row_background(pdf, background, row_height):
+    pdf.setFillColor(background)
+    pdf.setStrokeColor(BORDER_COLOR)
+
+    pdf.roundRect(
+        0,
+        0,
+        CONTENT_WIDTH,
+        row_height,
+        7,
+        fill=True,
+        stroke=True,
+    )
+
+
+def _draw_table_row(
+    pdf,
+    y,
+    index,
+    columns,
+    row,
+    row_height,
+):
+    even = index % 2 == 0
+
+    # Row backgrounds are identical apart from the position.
+    pdf.saveState()
+    pdf.translate(MARGIN, y - row_height)
+
+    _do_form(
+        pdf,
+        f"Row{'Even' if even else 'Odd'}{int(row_height * 10)}",
+        _draw_row_background,
+        ROW_BLUE if even else colors.white,
+        row_height,
+    )
+
+    pdf.restoreState()
+
+    text_y = y - (row_height / 2) - 3.5
+
+    for column, cell in zip(columns, row):
+        font_name, font_size, color = CELL_FONTS[
+            column.get("style", "text")
+        ]
+
+        pdf.setFillColor(color)
+        pdf.setFont(
+            font_name,
+            font_size,
+        )
+
+        if column.get("align") == "right":
+            pdf.drawRightString(
+                MARGIN + column["x"],
+                text_y,
+                str(cell),
+            )
+        else:
+            pdf.drawString(
+                MARGIN + column["x"],
+                text_y,
+                str(cell),
+            )
+
+    return y - row_height - 5
+
+
+def _draw_total(pdf, y, malay, english, amount):
+    y -= 16
+
+    pdf.setFillColor(SOFT_BLUE)
+    pdf.setStrokeColor(TOTAL_BORDER)
+
+    pdf.roundRect(
+        MARGIN,
+        y - TOTAL_HEIGHT,
+        CONTENT_WIDTH,
+        TOTAL_HEIGHT,
+        12,
+        fill=True,
+        stroke=True,
+    )
+
+    _draw_bilingual(
+        pdf,
+        malay,
+        english,
+        MARGIN + 18,
+        y - 22,
+        malay_size=12,
+        english_size=8.5,
+        malay_color=PRIMARY_BLUE,
+        english_color=GREY_TEXT,
+        line_gap=12,
+    )
+
+    pdf.setFillColor(SECONDARY_BLUE)
+    pdf.setFont(
+        "Helvetica-Bold",
+        20,
+    )
+
+    pdf.drawRightString(
+        MARGIN + CONTENT_WIDTH - 18,
+        y - 35,
+        f"RM {amount:,.2f}",
+    )
+
+    return y - TOTAL_HEIGHT - 30
+
+
+# =========================================================
+# RENDER
+# =========================================================
+
+def render_receipt_pdf(layout: dict) -> bytes:
+    """
+    Draw a receipt layout and return the PDF bytes.
+    """
+
+    buffer = BytesIO()
+
+    pdf = canvas.Canvas(
+        buffer,
+        pagesize=A4,
+        pageCompression=PAGE_COMPRESSION,
+    )
+
+    y = _draw_page_header(pdf, layout)
+
+    # =================================================
+    # GRID CARDS (TWO PER ROW)
+    # =================================================
+
+    grid = layout.get("grid", [])
+    grid_width = (CONTENT_WIDTH - GRID_GAP) / 2
+
+    for start in range(0, len(grid), 2):
+        if y - GRID_CARD_HEIGHT < FOOTER_SAFE_Y:
+            y = _next_page(pdf, layout)
+
+        for column, (malay, english, value, value_size) in enumerate(
+            grid[start:start + 2]
+        ):
+            _draw_grid_card(
+                pdf,
+                MARGIN + column * (grid_width + GRID_GAP),
+                y,
+                grid_width,
+                malay,
+                english,
+                value,
+                value_size,
+            )
+
+        y -= GRID_CARD_HEIGHT + GRID_GAP
+
+    # =================================================
+    # INFO CARDS
+    # =================================================
+
+    for index, (malay, english, value) in enumerate(
+        layout.get("info", [])
+    ):
+        if y - INFO_CARD_HEIGHT < FOOTER_SAFE_Y:
+            y = _next_page(pdf, layout)
+
+        y = _draw_info_card(
+            pdf,
+            y,
+            index,
+            malay,
+            english,
+            value,
+        )
+
+    if layout.get("note"):
+        malay, english, text = layout["note"]
+
+        lines = simpleSplit(
+            str(text),
+            "Helvetica",
+            9,
+            CONTENT_WIDTH - INFO_VALUE_X - 16,
+        ) or ["-"]
+
+        card_height = max(
+            INFO_CARD_HEIGHT,
+            24 + (len(lines) * 12),
+        )
+
+        if y - card_height < FOOTER_SAFE_Y:
+            y = _next_page(pdf, layout)
+
+        y = _draw_info_card(
+            pdf,
+            y,
+            len(layout.get("info", [])),
+            malay,
+            english,
+            text,
+            lines=lines,
+            card_height=card_height,
+        )
+
+    # =================================================
+    # ITEM TABLE
+    # =================================================
+
+    columns = layout.get("columns")
+
+    if columns:
+        row_height = layout.get("row_height", 32)
+
+        y = _draw_table_header(pdf, y, columns)
+
+        for index, row in enumerate(
+            layout.get("rows", []),
+            start=1,
+        ):
+            if y - row_height < FOOTER_SAFE_Y:
+                y = _next_page(pdf, layout)
+                y = _draw_table_header(pdf, y, columns)
+
+            y = _draw_table_row(
+                pdf,
+                y,
+                index,
+                columns,
+                row,
+                row_height,
+            )
+
+    # =================================================
+    # TOTAL
+    # =================================================
+
+    if layout.get("total"):
+        if (
+            y
+            - TOTAL_HEIGHT
+            - THANK_YOU_SPACE
+            < FOOTER_SAFE_Y
+        ):
+            y = _next_page(pdf, layout)
+
+        malay, english, amount = layout["total"]
+
+        y = _draw_total(
+            pdf,
+            y,
+            malay,
+            english,
+            amount,
+        )
+
+    # =================================================
+    # THANK YOU
+    # =================================================
+
+    thank_you = layout.get("thank_you") or []
+
+    if isinstance(thank_you, tuple):
+        thank_you = [thank_you]
+
+    for malay, english in thank_you:
+        _draw_bilingual(
+            pdf,
+            malay,
+            english,
+            PAGE_WIDTH / 2,
+            y,
+            align="center",
+            malay_size=11,
+            english_size=8.5,
+            malay_color=SUCCESS_GREEN,
+            english_color=SUCCESS_GREEN,
+            line_gap=12,
+        )
+
+        y -= 32
+
+    _do_form(
+        pdf,
+        "Footer",
+        _draw_page_footer,
+        layout,
+    )
+
+    pdf.save()
+
+    return buffer.getvalue()
+
+
+# =========================================================
+# DOCUMENT RECEIPTS
+# =========================================================
+#
+# Council receipts (tax, rental, bill) carry long account
+# numbers, names and addresses that must wrap, and one receipt
+# can hold many accounts. They are laid out with platypus and
+# flow across pages instead of using fixed card positions.
+#
+# Document layout keys:
+#
+#   page           page template, drawn on every page (below)
+#   pdf_title      PDF title property
+#   author         PDF author property
+#   top_margin     mm (default 50)
+#   bottom_margin  mm (default 24)
+#   blocks         [{"type": ..., ...}, ...] top to bottom:
+#
+#     info     title (malay, english), title_size, reference
+#              ("#ORDER"), fields [(malay, english, value), ...]
+#              listed on the right
+#     heading  text (malay, english)
+#     columns  labels [(malay, english, align), ...]
+#     item     index, title (malay, english), amount,
+#              fields [(malay, english, value, bold), ...];
+#              only a field row that does not fit moves on
+#     details  fields [(malay, english, value), ...] as one grid
+#     table    columns [{"label": (malay, english), "width": mm,
+#              "align", "style": "key" | "text" | "amount"}],
+#              rows [[cell, ...], ...]; cut into page-sized
+#              tables, the header row repeats on each page
+#     total    label (malay, english), amount, size, solid
+#              (white on primary, else light box), padding,
+#              note {"text": (malay, english), "sizes", "leading",
+#              "color", "gap"} kept on the same page
+#     space    mm
+#
+# Page template keys (mm; header y from the top edge, footer y
+# from the bottom edge; a negative x is from the right edge):
+#
+#   colors        {"primary", "secondary", "strip", "band",
+#                  "grey", "rule"} ("band" optional)
+#   circle        alpha of the decorative circle (optional)
+#   header_logos  [(image, x, y, width, height, anchor), ...]
+#   header_lines  [(text, style, size, y), ...]
+#   footer_rule   y of the footer line
+#   footer_logos  [(image, x, y, width, height, anchor), ...]
+#   footer_lines  [(text, style, size, y), ...], the first in
+#                 primary, the rest grey
+#   page_number   (size, y)
+#
+# Everything but the circle and the page number is drawn once
+# per document as a PDF form. Paragraph styles are shared per
+# combination instead of built per cell.
+# =========================================================
+
+DOCUMENT_MARGIN = 15 * mm
+DOCUMENT_HEADER_HEIGHT = 44 * mm
+
+# Bil. / item / amount columns of the item blocks
+DOCUMENT_ITEM_WIDTHS = (12, 132, 36)
+
+DOCUMENT_FONTS = {
+    "bold": "Helvetica-Bold",
+    "italic": "Helvetica-Oblique",
+    "regular": "Helvetica",
+}
+
+ALIGNMENTS = {
+    "left": TA_LEFT,
+    "right": TA_RIGHT,
+    "center": TA_CENTER,
+}
+
+DOCUMENT_CELL_STYLES = {
+    "key": (8, None, True),
+    "text": (8, None, False),
+    "amount": (8.5, "primary", True),
+}
+
+
+def _escape(value, fallback="-"):
+    if value is None:
+        return fallback
+
+    text = str(value).strip()
+
+    return html.escape(text) if text else fallback
+
+
+@lru_cache(maxsize=None)
+def _paragraph_style(
+    font_name,
+    font_size,
+    color,
+    alignment,
+    leading,
+):
+    return ParagraphStyle(
+        name=(
+            f"Receipt-{font_name}-{font_size}-"
+            f"{color}-{alignment}-{leading}"
+        ),
+        fontName=font_name,
+        fontSize=font_size,
+        leading=leading,
+        alignment=alignment,
+        textColor=colors.HexColor(color),
+        spaceBefore=0,
+        spaceAfter=0,
+        allowWidows=0,
+        allowOrphans=0,
+        wordWrap="LTR",
+    )
+
+
+def _bilingual_paragraph(
+    malay,
+    english,
+    malay_size=8.5,
+    english_size=7,
+    malay_color="#111827",
+    english_color="#6B7280",
+    alignment=TA_LEFT,
+    leading=10,
+):
+    """
+    Malay in bold with the English in italic underneath.
+    """
+
+    return Paragraph(
+        f'<font name="Helvetica-Bold" size="{malay_size}" '
+        f'color="{malay_color}">{_escape(malay)}</font>'
+        f"<br/>"
+        f'<font name="Helvetica-Oblique" size="{english_size}" '
+        f'color="{english_color}">{_escape(english)}</font>',
+        _paragraph_style(
+            "Helvetica",
+            malay_size,
+            malay_color,
+            alignment,
+            leading,
+        ),
+    )
+
+
+def _value_paragraph(
+    value,
+    font_size=8.5,
+    color="#111827",
+    alignment=TA_LEFT,
+    leading=10,
+    bold=False,
+):
+    return Paragraph(
+        _escape(value),
+        _paragraph_style(
+            DOCUMENT_FONTS["bold" if bold else "regular"],
+            font_size,
+            color,
+            alignment,
+            leading,
+        ),
+    )
+
+
+def _table_style(*commands, padding=(0, 0, 0, 0)):
+    """
+    TableStyle with LEFT / RIGHT / TOP / BOTTOM padding on all
+    cells followed by the given commands.
+    """
+
+    left, right, top, bottom = padding
+
+    return TableStyle(
+        [
+            ("LEFTPADDING", (0, 0), (-1, -1), left),
+            ("RIGHTPADDING", (0, 0), (-1, -1), right),
+            ("TOPPADDING", (0, 0), (-1, -1), top),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), bottom),
+            *commands,
+        ]
+    )
+
+
+def _money(value):
+    return f"RM {value:,.2f}"
+
+
+# =========================================================
+# DOCUMENT PAGE TEMPLATE
+# =========================================================
+
+def _x(value):
+    return PAGE_WIDTH + value * mm if value < 0 else value * mm
+
+
+def _draw_document_logos(pdf, logos, top):
+    for image, x, y, width, height, anchor in logos:
+        if not image:
+            continue
+
+        try:
+            pdf.drawImage(
+                image,
+                _x(x),
+                PAGE_HEIGHT - y * mm if top else y * mm,
+                width=width * mm,
+                height=height * mm,
+                preserveAspectRatio=True,
+                anchor=anchor,
+                mask="auto",
+            )
+
+        except Exception as error:
+            print(
+                "[WARN] Failed to draw logo: "
+                f"{error}"
+            )
+
+
+def _draw_document_chrome(pdf, page):
+    palette = page["colors"]
+
+    for color, top, height in (
+        (palette["primary"], DOCUMENT_HEADER_HEIGHT, DOCUMENT_HEADER_HEIGHT),
+        (palette["secondary"], 11 * mm, 11 * mm),
+        (palette["strip"], 3 * mm, 3 * mm),
+        (palette.get("band"), DOCUMENT_HEADER_HEIGHT, 10 * mm),
+    ):
+        if not color:
+            continue
+
+        pdf.setFillColor(colors.HexColor(color))
+        pdf.rect(
+            0,
+            PAGE_HEIGHT - top,
+            PAGE_WIDTH,
+            height,
+            fill=1,
+            stroke=0,
+        )
+
+    _draw_document_logos(pdf, page.get("header_logos", []), top=True)
+
+    pdf.setFillColor(colors.white)
+
+    for text, style, size, y in page["header_lines"]:
+        pdf.setFont(DOCUMENT_FONTS[style], size)
+        pdf.drawCentredString(
+            PAGE_WIDTH / 2,
+            PAGE_HEIGHT - y * mm,
+            text,
+        )
+
+    pdf.setStrokeColor(colors.HexColor(palette["rule"]))
+    pdf.line(
+        DOCUMENT_MARGIN,
+        page["footer_rule"] * mm,
+        PAGE_WIDTH - DOCUMENT_MARGIN,
+        page["footer_rule"] * mm,
+    )
+
+    _draw_document_logos(pdf, page.get("footer_logos", []), top=False)
+
+    for index, (text, style, size, y) in enumerate(page["footer_lines"]):
+        pdf.setFillColor(
+            colors.HexColor(
+                palette["primary"] if index == 0 else palette["grey"]
+            )
+        )
+        pdf.setFont(DOCUMENT_FONTS[style], size)
+        pdf.drawCentredString(
+            PAGE_WIDTH / 2,
+            y * mm,
+            text,
+        )
+
+
+def _document_page(page):
+    """
+    onPage callback for SimpleDocTemplate.build().
+    """
+
+    def draw(pdf, document):
+        pdf.saveState()
+
+        _do_form(
+            pdf,
+            "DocumentChrome",
+            _draw_document_chrome,
+            page,
+        )
+
+        if page.get("circle"):
+            pdf.setFillColor(
+                colors.Color(
+                    1,
+                    1,
+                    1,
+                    alpha=page["circle"],
+                )
+            )
+            pdf.circle(
+                PAGE_WIDTH - 10 * mm,
+                PAGE_HEIGHT - 12 * mm,
+                27 * mm,
+                fill=1,
+                stroke=0,
+            )
+
+        size, y = page["page_number"]
+
+        pdf.setFillColor(colors.HexColor(page["colors"]["grey"]))
+        pdf.setFont("Helvetica", size)
+        pdf.drawRightString(
+            PAGE_WIDTH - DOCUMENT_MARGIN,
+            y * mm,
+            f"Halaman / Page {document.page}",
+        )
+
+        pdf.restoreState()
+
+    return draw
+
+
+# =========================================================
+# DOCUMENT BLOCKS
+# =========================================================
+
+def _info_block(block, palette):
+    title_ms, title_en = block["title"]
+
+    left_block = Table(
+        [
+            [
+                _bilingual_paragraph(
+                    title_ms,
+                    title_en,
+                    malay_size=block.get("title_size", 18),
+                    english_size=10,
+                    malay_color=palette["primary"],
+                    english_color=palette["secondary"],
+                    leading=14,
+                )
+            ],
+            [
+                _value_paragraph(
+                    block["reference"],
+                    font_size=9,
+                    color=palette["secondary"],
+                    bold=True,
+                )
+            ],
+        ],
+        colWidths=[70 * mm],
+    )
+    left_block.setStyle(_table_style(padding=(0, 0, 0, 3)))
+
+    metadata_table = Table(
+        [
+            [
+                _bilingual_paragraph(
+                    malay,
+                    english,
+                    malay_size=7.5,
+                    english_size=6.5,
+                    leading=8,
+                ),
+                _value_paragraph(
+                    value,
+                    font_size=7.5,
+                    leading=9,
+                ),
+            ]
+            for malay, english, value in block["fields"]
+        ],
+        colWidths=[43 * mm, 62 * mm],
+        hAlign="RIGHT",
+    )
+    metadata_table.setStyle(
+        _table_style(
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            padding=(3, 3, 2, 4),
+        )
+    )
+
+    info_table = Table(
+        [[left_block, metadata_table]],
+        colWidths=[70 * mm, 110 * mm],
+    )
+    info_table.setStyle(
+        _table_style(("VALIGN", (0, 0), (-1, -1), "TOP"))
+    )
+
+    return [info_table]
+
+
+def _heading_block(block, palette):
+    malay, english = block["text"]
+
+    return [
+        _bilingual_paragraph(
+            malay,
+            english,
+            malay_size=11,
+            english_size=8,
+            malay_color=palette["primary"],
+            english_color=palette["secondary"],
+            leading=12,
+        )
+    ]
+
+
+def _columns_block(block, palette):
+    header = Table(
+        [
+            [
+                _bilingual_paragraph(
+                    malay,
+                    english,
+                    malay_size=7.5,
+                    english_size=6.5,
+                    malay_color="#FFFFFF",
+                    english_color="#DCEBFF",
+                    alignment=ALIGNMENTS[align],
+                    leading=8,
+                )
+                for malay, english, align in block["labels"]
+            ]
+        ],
+        colWidths=[width * mm for width in DOCUMENT_ITEM_WIDTHS],
+    )
+    header.setStyle(
+        _table_style(
+            ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor(palette["secondary"])),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("BOX", (0, 0), (-1, -1), 0.5, colors.HexColor("#0045B0")),
+            padding=(8, 8, 8, 8),
+        )
+    )
+
+    return [header]
+
+
+def _field_row(malay, english, value, bold, shaded):
+    row = Table(
+        [
+            [
+                _bilingual_paragraph(
+                    malay,
+                    english,
+                    malay_size=7.5,
+                    english_size=6.3,
+                    malay_color="#0F3F83",
+                    leading=8,
+                ),
+                _value_paragraph(
+                    value,
+                    font_size=7.5,
+                    leading=9,
+                    bold=bold,
+                ),
+            ]
+        ],
+        colWidths=[47 * mm, 133 * mm],
+        hAlign="LEFT",
+        splitByRow=1,
+    )
+    row.setStyle(
+        _table_style(
+            (
+                "BACKGROUND",
+                (0, 0),
+                (-1, -1),
+                colors.HexColor("#F7FAFF") if shaded else colors.white,
+            ),
+            ("BOX", (0, 0), (-1, -1), 0.45, colors.HexColor("#D9E8FF")),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            padding=(9, 9, 6, 6),
+        )
+    )
+
+    return KeepTogether([row])
+
+
+def _item_block(block, palette):
+    malay, english = block["title"]
+
+    header = Table(
+        [
+            [
+                _value_paragraph(
+                    block["index"],
+                    font_size=8,
+                    alignment=TA_CENTER,
+                    bold=True,
+                ),
+                _bilingual_paragraph(
+                    malay,
+                    english,
+                    malay_size=9,
+                    english_size=7,
+                    malay_color=palette["primary"],
+                    leading=10,
+                ),
+                _value_paragraph(
+                    _money(block["amount"]),
+                    font_size=8,
+                    color=palette["primary"],
+                    alignment=TA_RIGHT,
+                    bold=True,
+                ),
+            ]
+        ],
+        colWidths=[width * mm for width in DOCUMENT_ITEM_WIDTHS],
+        hAlign="LEFT",
+    )
+    header.setStyle(
+        _table_style(
+            ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#EDF4FF")),
+            ("BOX", (0, 0), (-1, -1), 0.6, colors.HexColor("#D9E8FF")),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            padding=(8, 8, 8, 8),
+        )
+    )
+
+    return [
+        header,
+        *(
+            _field_row(malay, english, value, bold, index % 2 == 1)
+            for index, (malay, english, value, bold) in enumerate(
+                block["fields"]
+            )
+        ),
+        Spacer(1, 5 * mm),
+    ]
+
+
+def _details_block(block, palette):
+    rows = [
+        [
+            _bilingual_paragraph(
+                malay,
+                english,
+                malay_size=8,
+                english_size=6.8,
+                leading=9,
+            ),
+            _value_paragraph(
+                value,
+                font_size=9,
+                leading=11,
+                bold=True,
+            ),
+        ]
+        for malay, english, value in block["fields"]
+    ]
+
+    details = Table(
+        rows,
+        colWidths=[57 * mm, 123 * mm],
+        hAlign="LEFT",
+    )
+    details.setStyle(
+        _table_style(
+            ("BOX", (0, 0), (-1, -1), 0.7, colors.HexColor("#C9DDF2")),
+            ("INNERGRID", (0, 0), (-1, -1), 0.45, colors.HexColor("#DCE9F6")),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            (
+                "ROWBACKGROUNDS",
+                (0, 0),
+                (-1, -1),
+                [colors.HexColor("#F5F9FE"), colors.white],
+            ),
+            padding=(12, 12, 10, 10),
+        )
+    )
+
+    return [details]
+
+
+def _row_height(cells, column_widths, horizontal_padding, vertical_padding):
+    """
+    Height of one table row, wrapped once up front.
+    """
+
+    return max(
+        cell.wrap(width - horizontal_padding, 0)[1]
+        for cell, width in zip(cells, column_widths)
+    ) + vertical_padding
+
+
+def _paginate_rows(row_heights, header_height, available_height):
+    """
+    Split rows into page-sized (start, end) ranges that fit on a
+    page together with the repeated header row, so ReportLab
+    never has to split (and re-measure) a long table.
+    """
+
+    ranges = []
+    start = 0
+    used = header_height
+
+    for index, height in enumerate(row_heights):
+        if index > start and used + height > available_height:
+            ranges.append((start, index))
+            start = index
+            used = header_height
+
+        used += height
+
+    if start < len(row_heights):
+        ranges.append((start, len(row_heights)))
+
+    return ranges
+
+
+def _table_block(block, palette, available_height):
+    columns = block["columns"]
+    column_widths = [column["width"] * mm for column in columns]
+
+    header_row = [
+        _bilingual_paragraph(
+            *column["label"],
+            malay_size=8,
+            english_size=6.8,
+            malay_color="#FFFFFF",
+            english_color="#DCEBFF",
+            alignment=ALIGNMENTS[column.get("align", "left")],
+            leading=9,
+        )
+        for column in columns
+    ]
+
+    body_rows = []
+
+    for row in block["rows"]:
+        cells = []
+
+        for column, cell in zip(columns, row):
+            font_size, color, bold = DOCUMENT_CELL_STYLES[
+                column.get("style", "text")
+            ]
+
+            cells.append(
+                _value_paragraph(
+                    cell,
+                    font_size=font_size,
+                    color=palette[color] if color else "#111827",
+                    alignment=ALIGNMENTS[column.get("align", "left")],
+                    bold=bold,
+                )
+            )
+
+        body_rows.append(cells)
+
+    header_height = _row_height(header_row, column_widths, 16, 18)
+    row_heights = [
+        _row_height(row, column_widths, 16, 20)
+        for row in body_rows
+    ]
+
+    commands = [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor(palette["secondary"])),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("TOPPADDING", (0, 0), (-1, 0), 9),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 9),
+        ("TOPPADDING", (0, 1), (-1, -1), 10),
+        ("BOTTOMPADDING", (0, 1), (-1, -1), 10),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor(palette["rule"])),
+        ("LINEBELOW", (0, 0), (-1, 0), 1, colors.HexColor("#004AAE")),
+    ]
+
+    flowables = []
+
+    for chunk_index, (start, end) in enumerate(
+        _paginate_rows(row_heights, header_height, available_height)
+        or [(0, 0)]
+    ):
+        # Alternate row backgrounds continue across pages.
+        backgrounds = [colors.white, colors.HexColor("#F4F8FF")]
+
+        if start % 2 == 1:
+            backgrounds.reverse()
+
+        table = Table(
+            [header_row] + body_rows[start:end],
+            colWidths=column_widths,
+            rowHeights=[header_height] + row_heights[start:end],
+            repeatRows=1,
+            hAlign="LEFT",
+            splitByRow=1,
+        )
+        table.setStyle(
+            _table_style(
+                *commands,
+                ("ROWBACKGROUNDS", (0, 1), (-1, -1), backgrounds),
+                padding=(8, 8, 0, 0),
+            )
+        )
+
+        if chunk_index:
+            flowables.append(PageBreak())
+
+        flowables.append(table)
+
+    return flowables
+
+
+def _total_block(block, palette):
+    malay, english = block["label"]
+    solid = block.get("solid", True)
+
+    total = Table(
+        [
+            [
+                _bilingual_paragraph(
+                    malay,
+                    english,
+                    malay_size=11,
+                    english_size=8,
+                    malay_color="#FFFFFF" if solid else palette["primary"],
+                    english_color="#DCEBFF" if solid else "#6B7280",
+                    leading=12,
+                ),
+                _value_paragraph(
+                    _money(block["amount"]),
+                    font_size=block.get("size", 15),
+                    color="#FFFFFF" if solid else palette["secondary"],
+                    alignment=TA_RIGHT,
+                    leading=10 if solid else 18,
+                    bold=True,
+                ),
+            ]
+        ],
+        colWidths=[115 * mm, 65 * mm] if solid else [110 * mm, 70 * mm],
+        hAlign="LEFT" if not solid else "CENTER",
+    )
+
+    padding = block.get("padding", 11)
+
+    if solid:
+        commands = [
+            ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor(palette["primary"])),
+        ]
+
+    else:
+        commands = [
+            ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#EAF3FF")),
+            ("BOX", (0, 0), (-1, -1), 0.8, colors.HexColor("#BFD7FF")),
+            ("LINEBEFORE", (0, 0), (0, 0), 4, colors.HexColor(palette["secondary"])),
+        ]
+
+    total.setStyle(
+        _table_style(
+            *commands,
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            padding=(12, 12, padding, padding),
+        )
+    )
+
+    flowables = [total]
+    note = block.get("note")
+
+    if note:
+        malay, english = note["text"]
+        malay_size, english_size = note["sizes"]
+
+        flowables += [
+            Spacer(1, note.get("gap", 5) * mm),
+            Paragraph(
+                f'<font name="Helvetica-Bold" size="{malay_size}">'
+                f"{_escape(malay)}</font><br/>"
+                f'<font name="Helvetica-Oblique" size="{english_size}">'
+                f"{_escape(english)}</font>",
+                _paragraph_style(
+                    "Helvetica",
+                    malay_size,
+                    note["color"],
+                    TA_CENTER,
+                    note["leading"],
+                ),
+            ),
+        ]
+
+    return [KeepTogether(flowables)]
+
+
+DOCUMENT_BLOCKS = {
+    "info": _info_block,
+    "heading": _heading_block,
+    "columns": _columns_block,
+    "item": _item_block,
+    "details": _details_block,
+    "total": _total_block,
+    "space": lambda block, palette: [Spacer(1, block["mm"] * mm)],
+}
+
+
+def render_document_pdf(layout: dict) -> bytes:
+    """
+    Lay out a document receipt and return the PDF bytes.
+    """
+
+    buffer = BytesIO()
+    page = layout["page"]
+    palette = page["colors"]
+
+    document = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        pageCompression=PAGE_COMPRESSION,
+        leftMargin=DOCUMENT_MARGIN,
+        rightMargin=DOCUMENT_MARGIN,
+        topMargin=layout.get("top_margin", 50) * mm,
+        bottomMargin=layout.get("bottom_margin", 24) * mm,
+        title=layout.get("pdf_title", ""),
+        author=layout.get("author", ""),
+    )
+
+    story = []
+
+    for block in layout["blocks"]:
+        if block["type"] == "table":
+            # Frame padding is 6 pt at the top and bottom.
+            story += _table_block(block, palette, document.height - 12)
+        else:
+            story += DOCUMENT_BLOCKS[block["type"]](block, palette)
+
+    on_page = _document_page(page)
+
+    document.build(
+        story,
+        onFirstPage=on_page,
+        onLaterPages=on_page,
+    )
+
+    return buffer.getvalue()
+
+
+def warm_up_receipt_engine():
+    """
+    Render one throwaway receipt of each kind so font metrics and
+    drawing code are loaded before the first real request.
+    """
+
+    render_receipt_pdf(
+        {
+            "title": ("E-RESIT", "E-RECEIPT"),
+            "info": [("Nama", "Name", "-")],
+            "note": ("Catatan", "Note", "-"),
+            "columns": [
+                {
+                    "label": ("No.", "No."),
+                    "x": 14,
+                    "style": "key",
+                },
+                {
+                    "label": ("Jumlah (RM)", "Amount (RM)"),
+                    "x": CONTENT_WIDTH - 14,
+                    "align": "right",
+                    "style": "amount",
+                },
+            ],
+            "rows": [["-", "0.00"]],
+            "total": ("Jumlah", "Total", 0.0),
+            "thank_you": ("Terima kasih", "Thank you"),
+        }
+    )
+
+    render_document_pdf(
+        {
+            "page": {
+                "colors": {
+                    "primary": "#003B8E",
+                    "secondary": "#0A66D8",
+                    "strip": "#1C8CFF",
+                    "grey": "#6B7280",
+                    "rule": "#DCE8F8",
+                },
+                "header_lines": [("RESIT", "bold", 15, 17)],
+                "footer_rule": 18,
+                "footer_lines": [("-", "bold", 7.5, 12.5)],
+                "page_number": (6.5, 8.5),
+            },
+            "blocks": [
+                {
+                    "type": "info",
+                    "title": ("Resit", "Receipt"),
+                    "reference": "#-",
+                    "fields": [("Kaedah", "Method", "-")],
+                },
+                {
+                    "type": "item",
+                    "index": 1,
+                    "title": ("Butiran", "Item"),
+                    "amount": 0.0,
+                    "fields": [("Nama", "Name", "-", True)],
+                },
+                {
+                    "type": "table",
+                    "columns": [
+                        {
+                            "label": ("No.", "No."),
+                            "width": 90,
+                            "style": "key",
+                        },
+                        {
+                            "label": ("Jumlah", "Amount"),
+                            "width": 90,
+                            "align": "right",
+                            "style": "amount",
+                        },
+                    ],
+                    "rows": [["-", "0.00"]],
+                },
+                {
+                    "type": "total",
+                    "label": ("Jumlah", "Total"),
+                    "amount": 0.0,
+                },
+            ],
+        }
+    )
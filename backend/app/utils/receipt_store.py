@@ -0,0 +1,295 @@
+import hashlib
+import json
+import secrets
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.schema.receipt.receipt_schema import ReceiptRecord
+from app.security.receipt_signing import sign_receipt_id
+from app.utils.blob_upload import generate_blob_url, upload_to_blob
+from app.utils.config import PUBLIC_API_URL, RECEIPT_RENDER_MODE
+from app.utils.receipt_templates import templates_fingerprint
+from app.utils.short_links import create_short_link
+
+
+# =========================================================
+# RENDERER REGISTRY
+# =========================================================
+#
+# Each receipt family registers how to turn a stored JSON
+# payload into a PDF and an HTML page. The QR endpoints then
+# call publish_receipt(), which depending on
+# RECEIPT_RENDER_MODE:
+#
+# - eager : renders and uploads the PDF and HTML now; the QR
+#           and the PDF button use short links (/r/<code>)
+# - served: renders and uploads the PDF now, stores the payload
+#           and returns a signed backend link; the HTML page is
+#           rendered by the backend and never uploaded
+# - lazy  : only stores the payload; both are rendered on first
+#           open
+# =========================================================
+
+RECEIPT_RENDERERS = {}
+
+# Rendered HTML and ETag per receipt ID. Stored payloads never
+# change, so an entry stays valid until it is evicted.
+_HTML_CACHE_SIZE = 512
+_html_cache = OrderedDict()
+_html_cache_lock = threading.Lock()
+
+
+def register_receipt_renderer(
+    receipt_type: str,
+    render_pdf,
+    render_html,
+    filename,
+):
+    """
+    Register a receipt family.
+
+    Args:
+        render_pdf:
+            payload -> PDF bytes.
+
+        render_html:
+            (payload, pdf_url) -> HTML string.
+
+        filename:
+            payload -> blob name without extension (eager mode).
+    """
+
+    RECEIPT_RENDERERS[receipt_type] = {
+        "render_pdf": render_pdf,
+        "render_html": render_html,
+        "filename": filename,
+    }
+
+
+def from_iso(value, parser=datetime.fromisoformat):
+    """
+    Turn an ISO string from a stored payload back into a
+    date/time object. Anything else is returned unchanged.
+    """
+
+    if not isinstance(value, str):
+        return value
+
+    try:
+        return parser(value)
+    except ValueError:
+        return value
+
+
+# =========================================================
+# PUBLIC LINKS
+# =========================================================
+
+def build_receipt_url(receipt_id: str) -> str:
+    return (
+        f"{PUBLIC_API_URL}/api/v2/receipts/{receipt_id}"
+        f"?sig={sign_receipt_id(receipt_id)}"
+    )
+
+
+def build_receipt_pdf_url(receipt_id: str) -> str:
+    return (
+        f"{PUBLIC_API_URL}/api/v2/receipts/{receipt_id}/pdf"
+        f"?sig={sign_receipt_id(receipt_id)}"
+    )
+
+
+# =========================================================
+# PUBLISH
+# =========================================================
+
+def create_lazy_receipt(
+    db: Session,
+    receipt_type: str,
+    payload: dict,
+    render_pdf: bool = False,
+) -> str:
+    """
+    Store the receipt payload and return its signed link.
+
+    The HTML page is never uploaded. The PDF is rendered and
+    uploaded now when render_pdf is set, otherwise on first
+    download.
+    """
+
+    receipt_id = secrets.token_urlsafe(9)
+    pdf_blob = None
+
+    if render_pdf:
+        pdf_blob = f"receipt_{receipt_id}.pdf"
+
+        upload_to_blob(
+            pdf_blob,
+            RECEIPT_RENDERERS[receipt_type]["render_pdf"](payload),
+            content_type="application/pdf",
+        )
+
+    db.add(
+        ReceiptRecord(
+            receipt_id=receipt_id,
+            receipt_type=receipt_type,
+            payload=json.dumps(payload),
+            pdf_blob=pdf_blob,
+        )
+    )
+    db.commit()
+
+    return build_receipt_url(receipt_id)
+
+
+def publish_receipt(
+    db: Session,
+    receipt_type: str,
+    payload: dict,
+) -> str:
+    """
+    Return the URL that the receipt QR code should encode.
+    """
+
+    renderer = RECEIPT_RENDERERS[receipt_type]
+
+    # Same JSON shape in both modes, so renderers only handle one form.
+    payload = jsonable_encoder(payload)
+
+    if RECEIPT_RENDER_MODE in ("lazy", "served"):
+        return create_lazy_receipt(
+            db,
+            receipt_type,
+            payload,
+            render_pdf=RECEIPT_RENDER_MODE == "served",
+        )
+
+    base_filename = renderer["filename"](payload)
+
+    upload_to_blob(
+        f"{base_filename}.pdf",
+        renderer["render_pdf"](payload),
+        content_type="application/pdf",
+    )
+
+    receipt_html = renderer["render_html"](
+        payload,
+        create_short_link(
+            db,
+            f"{base_filename}.pdf",
+        ),
+    )
+
+    upload_to_blob(
+        f"{base_filename}.html",
+        receipt_html.encode("utf-8"),
+        content_type="text/html",
+    )
+
+    return create_short_link(
+        db,
+        f"{base_filename}.html",
+    )
+
+
+# =========================================================
+# RENDER ON FIRST OPEN
+# =========================================================
+
+def receipt_etag(record: ReceiptRecord) -> str:
+    """
+    Strong ETag of the receipt page.
+
+    The page only depends on the stored payload and on the
+    templates, so the ETag is a hash of both. It changes when
+    a deploy changes any template.
+    """
+
+    digest = hashlib.sha256(
+        (
+            f"{templates_fingerprint()}:"
+            f"{record.receipt_type}:"
+            f"{record.payload}"
+        ).encode("utf-8")
+    ).hexdigest()
+
+    return f'"{digest[:20]}"'
+
+
+def get_cached_receipt(receipt_id: str):
+    """
+    {"etag": ..., "html": ...} of an already rendered receipt,
+    or None. Needs no database access.
+    """
+
+    with _html_cache_lock:
+        cached = _html_cache.get(receipt_id)
+
+        if cached is not None:
+            _html_cache.move_to_end(receipt_id)
+
+        return cached
+
+
+def get_receipt_html(record: ReceiptRecord) -> dict:
+    """
+    Render the receipt page (or take it from the cache) as
+    {"etag": ..., "html": ...}.
+    """
+
+    cached = get_cached_receipt(record.receipt_id)
+
+    if cached is not None:
+        return cached
+
+    renderer = RECEIPT_RENDERERS[record.receipt_type]
+
+    rendered = {
+        "etag": receipt_etag(record),
+        "html": renderer["render_html"](
+            json.loads(record.payload),
+            build_receipt_pdf_url(record.receipt_id),
+        ),
+    }
+
+    with _html_cache_lock:
+        _html_cache[record.receipt_id] = rendered
+
+        while len(_html_cache) > _HTML_CACHE_SIZE:
+            _html_cache.popitem(last=False)
+
+    return rendered
+
+
+def get_receipt_pdf_url(
+    db: Session,
+    record: ReceiptRecord,
+) -> str:
+    """
+    Return a fresh SAS URL for the receipt PDF, rendering and
+    uploading it the first time it is requested.
+    """
+
+    if record.pdf_blob:
+        return generate_blob_url(record.pdf_blob)
+
+    renderer = RECEIPT_RENDERERS[record.receipt_type]
+
+    pdf_blob = f"receipt_{record.receipt_id}.pdf"
+
+    pdf_url = upload_to_blob(
+        pdf_blob,
+        renderer["render_pdf"](
+            json.loads(record.payload)
+        ),
+        content_type="application/pdf",
+    )
+
+    record.pdf_blob = pdf_blob
+    db.commit()
+
+    return pdf_url
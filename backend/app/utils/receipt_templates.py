@@ -0,0 +1,480 @@
+import gzip
+import hashlib
+import html
+import re
+import threading
+from pathlib import Path
+from string import Formatter
+
+from app.utils.blob_upload import upload_asset
+from app.utils.config import PUBLIC_API_URL
+
+
+# =========================================================
+# HTML RECEIPT TEMPLATES
+# =========================================================
+#
+# The HTML receipt pages live in app/templates/receipts:
+#
+#   base.html          shared page shell ({page}, {title},
+#                      {stylesheet}, {body})
+#   <page>.html        page body with {field} placeholders
+#   <page>.css         page styles
+#   <page>_row.html    one table row, for multi-item receipts
+#
+# Each page is compiled once per process: the shell and title
+# are joined with the static parts of the body, so a render
+# only fills in the fields and joins once.
+#
+# The styles are normally not inlined. Every page links to one
+# shared, fingerprinted stylesheet (see RECEIPT STYLESHEET
+# below), so an uploaded receipt only carries its data.
+#
+# Every value is escaped when it is filled in. Pass raw values,
+# never pre-escaped HTML. Rendered rows and fragments are
+# SafeHTML and are inserted as they are.
+# =========================================================
+
+TEMPLATES_DIR = (
+    Path(__file__)
+    .resolve()
+    .parent          # utils
+    .parent          # app
+    / "templates"
+    / "receipts"
+)
+
+RECEIPT_PAGES = {
+    "parking": "E-Resit Parkir / Parking E-Receipt",
+    "compound_single": "E-Resit Kompaun / Compound E-Receipt",
+    "compound_multi": "Resit Pelbagai Kompaun / Multiple Compound Receipt",
+    "license_single": "E-Resit Lesen / License E-Receipt",
+    "license_multi": "Resit Pelbagai Lesen / Multiple License Receipt",
+    "tax_multi": "Resit Pelbagai Cukai / Multiple Tax Receipt",
+    "tax_bentong": "Resit Cukai Taksiran / Assessment Tax Receipt",
+    "sewaan_bentong": "Resit Bayaran Sewaan / Rental Payment Receipt",
+    "bill": "Resit Bayaran Bil / Bill Payment Receipt",
+}
+
+STYLESHEET_ROUTE = "/api/v2/receipts/assets"
+
+# Blob folder of the uploaded stylesheet
+STYLESHEET_BLOB_FOLDER = "assets"
+
+# Fingerprinted stylesheet URLs never change content.
+STYLESHEET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_templates = {}
+_stylesheet = None
+# False until decided; None means inline the styles
+_stylesheet_url = False
+_fingerprint = None
+# Re-entrant: compiling a page builds the stylesheet first.
+_lock = threading.RLock()
+
+
+class SafeHTML(str):
+    """
+    Markup that is already escaped (rendered rows and fragments).
+    """
+
+
+# =========================================================
+# VALUE FORMATTING
+# =========================================================
+
+def text(value, fallback="-"):
+    """
+    Trimmed text, or the fallback when empty.
+    """
+
+    if value is None:
+        return fallback
+
+    value = str(value).strip()
+
+    return value or fallback
+
+
+def money(value):
+    """
+    Amount with thousands separator and 2 decimals.
+    """
+
+    try:
+        return f"{float(value or 0):,.2f}"
+    except (TypeError, ValueError):
+        return "0.00"
+
+
+def datetime_text(value, pattern="%d/%m/%Y"):
+    """
+    Format a date, time or datetime. Anything else is shown
+    as text.
+    """
+
+    if not value:
+        return "-"
+
+    try:
+        return value.strftime(pattern)
+    except (AttributeError, ValueError):
+        return text(value)
+
+
+# =========================================================
+# RECEIPT STYLESHEET
+# =========================================================
+#
+# All <page>.css files are combined into receipt.<hash>.css.
+# The <html> element of each page carries class="receipt-<page>"
+# and every rule of <page>.css is scoped to it, so the pages
+# keep their own look inside one file.
+#
+# The hash changes whenever any page style changes, so the
+# file can be cached forever by browsers and proxies.
+#
+# Receipts are opened from https blob links, where a browser
+# blocks a stylesheet served over plain http. So pages link:
+#
+#   1. the stylesheet uploaded once to blob storage (same https
+#      domain as the receipts, immutable Cache-Control)
+#   2. if the upload fails, GET {STYLESHEET_ROUTE}/receipt.<hash>.css
+#      on this backend, but only when PUBLIC_API_URL is https
+#   3. otherwise nothing: each page inlines its own styles
+#
+# The choice is made once per process, when the pages compile.
+# =========================================================
+
+def _scope_selector(selector, scope):
+    selector = " ".join(selector.split())
+
+    if selector == "html":
+        return scope
+
+    if selector.startswith("html "):
+        return scope + selector[4:]
+
+    return f"{scope} {selector}"
+
+
+def _scope_css(css, scope):
+    """
+    Prefix every selector with the page scope. Handles plain
+    rules and @media blocks, which is all the page styles use.
+    """
+
+    output = []
+    position = 0
+
+    while True:
+        start = css.find("{", position)
+
+        if start == -1:
+            break
+
+        prelude = css[position:start].strip()
+
+        if prelude.startswith("@"):
+            depth = 1
+            end = start + 1
+
+            while depth:
+                if css[end] == "{":
+                    depth += 1
+                elif css[end] == "}":
+                    depth -= 1
+                end += 1
+
+            output.append(
+                prelude
+                + "{"
+                + _scope_css(css[start + 1:end - 1], scope)
+                + "}"
+            )
+
+        else:
+            end = css.index("}", start) + 1
+
+            selectors = ",".join(
+                _scope_selector(selector, scope)
+                for selector in prelude.split(",")
+            )
+
+            output.append(selectors + css[start:end])
+
+        position = end
+
+    return "\n".join(output)
+
+
+def _minify_css(css):
+    css = " ".join(css.split())
+
+    return re.sub(r"\s*([{};])\s*", r"\1", css)
+
+
+def _page_css(page):
+    return _minify_css(
+        _scope_css(
+            _read(f"{page}.css"),
+            f"html.receipt-{page}",
+        )
+    )
+
+
+def receipt_stylesheet():
+    """
+    Combined receipt stylesheet:
+    {"css": bytes, "gzip": bytes, "fingerprint": str}.
+    """
+
+    global _stylesheet
+
+    if _stylesheet is not None:
+        return _stylesheet
+
+    with _lock:
+        if _stylesheet is None:
+            css = "\n".join(
+                _page_css(page)
+                for page in RECEIPT_PAGES
+            ).encode("utf-8")
+
+            _stylesheet = {
+                "css": css,
+                "gzip": gzip.compress(css, mtime=0),
+                "fingerprint": hashlib.sha256(css).hexdigest()[:16],
+            }
+
+    return _stylesheet
+
+
+def receipt_stylesheet_url():
+    """
+    https URL of the shared stylesheet, or None when the pages
+    have to inline it.
+    """
+
+    global _stylesheet_url
+
+    if _stylesheet_url is not False:
+        return _stylesheet_url
+
+    with _lock:
+        if _stylesheet_url is not False:
+            return _stylesheet_url
+
+        stylesheet = receipt_stylesheet()
+        filename = f"receipt.{stylesheet['fingerprint']}.css"
+
+        try:
+            _stylesheet_url = upload_asset(
+                f"{STYLESHEET_BLOB_FOLDER}/{filename}",
+                stylesheet["css"],
+                "text/css",
+                STYLESHEET_CACHE_CONTROL,
+            )
+
+        except Exception as error:
+            print(
+                "[WARN] Receipt stylesheet upload failed: "
+                f"{error}"
+            )
+
+            if PUBLIC_API_URL.startswith("https://"):
+                _stylesheet_url = (
+                    f"{PUBLIC_API_URL}{STYLESHEET_ROUTE}/{filename}"
+                )
+
+            else:
+                print(
+                    "[WARN] PUBLIC_API_URL is not https; "
+                    "receipt styles are inlined."
+                )
+
+                _stylesheet_url = None
+
+    return _stylesheet_url
+
+
+def _stylesheet_tag(page):
+    url = receipt_stylesheet_url()
+
+    if url is None:
+        return f"<style>{_page_css(page)}</style>"
+
+    return f'<link rel="stylesheet" href="{html.escape(url)}">'
+
+
+# =========================================================
+# COMPILE
+# =========================================================
+#
+# A compiled template is (parts, slots): the static markup
+# split around the {field} placeholders, and the position and
+# name of each placeholder. Rendering copies parts, drops the
+# escaped values into the slots and joins once.
+# =========================================================
+
+def _read(filename):
+    return (TEMPLATES_DIR / filename).read_text(encoding="utf-8")
+
+
+def _compile(source, prefix="", suffix=""):
+    parts = [prefix]
+    slots = []
+
+    for literal, field, _, _ in Formatter().parse(source):
+        parts[-1] += literal
+
+        if field is not None:
+            slots.append((len(parts), field))
+            parts.append(None)
+            parts.append("")
+
+    parts[-1] += suffix
+
+    return parts, slots
+
+
+def _compile_page(page):
+    head, tail = _read("base.html").split("{body}")
+
+    head = (
+        head
+        .replace("{page}", page)
+        .replace("{title}", html.escape(RECEIPT_PAGES[page]))
+        .replace(
+            "{stylesheet}",
+            _stylesheet_tag(page),
+        )
+    )
+
+    return _compile(
+        _read(f"{page}.html"),
+        prefix=head,
+        suffix=tail,
+    )
+
+
+def _compile_fragment(name):
+    return _compile(_read(f"{name}.html"))
+
+
+def templates_fingerprint():
+    """
+    Hash of every template file. Changes whenever a deploy
+    changes how any receipt page looks.
+    """
+
+    global _fingerprint
+
+    if _fingerprint is None:
+        digest = hashlib.sha256()
+
+        for path in sorted(TEMPLATES_DIR.iterdir()):
+            digest.update(path.name.encode("utf-8"))
+            digest.update(path.read_bytes())
+
+        _fingerprint = digest.hexdigest()[:16]
+
+    return _fingerprint
+
+
+def _get_template(key, compile_template):
+    if key in _templates:
+        return _templates[key]
+
+    with _lock:
+        if key not in _templates:
+            _templates[key] = compile_template(key[1])
+
+    return _templates[key]
+
+
+def _fill(template, context):
+    parts, slots = template
+    parts = parts.copy()
+
+    for index, field in slots:
+        value = context[field]
+
+        parts[index] = (
+            value
+            if isinstance(value, SafeHTML)
+            else html.escape(text(value))
+        )
+
+    return "".join(parts)
+
+
+# =========================================================
+# PUBLIC
+# =========================================================
+
+def render_receipt_html(page: str, **context) -> str:
+    """
+    Render a full receipt page (a key of RECEIPT_PAGES).
+    """
+
+    template = _get_template(
+        ("page", page),
+        _compile_page,
+    )
+
+    return _fill(template, context)
+
+
+def render_fragment(name: str, **context) -> SafeHTML:
+    """
+    Render a partial template, e.g. an optional detail row.
+    """
+
+    template = _get_template(
+        ("fragment", name),
+        _compile_fragment,
+    )
+
+    return SafeHTML(
+        _fill(template, context)
+    )
+
+
+def render_rows(name: str, rows) -> SafeHTML:
+    """
+    Render one fragment per row (a dict of fields) and join them.
+    """
+
+    template = _get_template(
+        ("fragment", name),
+        _compile_fragment,
+    )
+
+    return SafeHTML(
+        "".join(
+            _fill(template, row)
+            for row in rows
+        )
+    )
+
+
+def warm_up_receipt_templates():
+    """
+    Build the stylesheet and compile every receipt page at
+    startup.
+    """
+
+    receipt_stylesheet()
+    receipt_stylesheet_url()
+    templates_fingerprint()
+
+    for page in RECEIPT_PAGES:
+        _get_template(
+            ("page", page),
+            _compile_page,
+        )
+
+    print(
+        f"[INFO] {len(RECEIPT_PAGES)} receipt templates compiled."
+    )
@@ -0,0 +1,205 @@
+from datetime import date, datetime
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.schema.settlement.settlement_schema import SettlementRollup
+from app.utils.ticket_sequences import clean_terminal_id
+
+
+# =========================================================
+# SETTLEMENT ROLLUPS
+# =========================================================
+#
+# Daily takings per terminal used to be summed from the payment
+# tables on every request, scanning months of rows. Each payment
+# now adds itself to one row of settlement_rollups
+#
+#   (day, terminal, module, payment_type) -> count, amount
+#
+# inside the transaction that writes the payment, so the rollup
+# commits (or rolls back) with it. The settlement API reads a
+# day's handful of rows by primary key.
+#
+# What each module counts (the same rules as the backfill in
+# app/db/settlement_backfill.py, which rebuilds the rows from
+# the tables):
+#
+#   parking          transaction_parkings, day of the ticket ID,
+#                    payment_type = transaction_type
+#   pegepay          pegepay_orders with order_status
+#                    "successful", day of the order number
+#   compound         multi_compound rows, amount of the
+#                    compound, day of paid_at
+#   tax_bentong      payment_updates_cukaitaksiran_bentong,
+#   sewaan_bentong   payment_updates_sewaan_bentong: day of
+#                    paid_date, payment_type = payment_method
+#
+# Terminals are cleaned like parking terminals; "" where the
+# module does not record one (Bentong payments, compounds paid
+# without a terminal).
+# =========================================================
+
+SETTLEMENT_MODULES = (
+    "parking",
+    "pegepay",
+    "compound",
+    "tax_bentong",
+    "sewaan_bentong",
+)
+
+
+def settlement_terminal(terminal: str | None) -> str:
+    return clean_terminal_id(terminal) if terminal else ""
+
+
+def settlement_key(terminal, day, module, payment_type) -> tuple:
+    """
+    (day, terminal, module, payment_type) as stored.
+    """
+
+    return (
+        day,
+        settlement_terminal(terminal),
+        module,
+        payment_type or "",
+    )
+
+
+def pegepay_order_day(order_no: str) -> date | None:
+    """
+    Day of a PegePay order number (TTTT + DDMMYY + CCC), None
+    when it does not follow the format.
+    """
+
+    try:
+        return datetime.strptime(order_no[-9:-3], "%d%m%y").date()
+
+    except (TypeError, ValueError):
+        return None
+
+
+def record_settlement(
+    db: Session,
+    module: str,
+    terminal: str | None,
+    day: date,
+    payment_type: str | None,
+    amount: float,
+    count: int = 1,
+) -> None:
+    """
+    Add count payments totalling amount to the day's rollup.
+    Committed with the caller's transaction; the row stays
+    locked until then, so call it just before the commit.
+    """
+
+    day, terminal, module, payment_type = settlement_key(
+        terminal,
+        day,
+        module,
+        payment_type,
+    )
+
+    while True:
+        result = db.execute(
+            update(SettlementRollup)
+            .where(
+                SettlementRollup.day == day,
+                SettlementRollup.terminal == terminal,
+                SettlementRollup.module == module,
+                SettlementRollup.payment_type == payment_type,
+            )
+            .values(
+                count=SettlementRollup.count + count,
+                amount=SettlementRollup.amount + amount,
+            )
+        )
+
+        if result.rowcount:
+            return
+
+        # First payment of the row; a racing insert wins and
+        # this one adds to it.
+        try:
+            with db.begin_nested():
+                db.add(
+                    SettlementRollup(
+                        day=day,
+                        terminal=terminal,
+                        module=module,
+                        payment_type=payment_type,
+                        count=count,
+                        amount=amount,
+                    )
+                )
+
+            return
+
+        except IntegrityError:
+            continue
+
+
+def read_settlement(
+    db: Session,
+    day: date,
+    terminal: str | None = None,
+) -> list[dict]:
+    """
+    The day's rollup rows, of one terminal or of all of them.
+    """
+
+    query = db.query(
+        SettlementRollup.terminal,
+        SettlementRollup.module,
+        SettlementRollup.payment_type,
+        SettlementRollup.count,
+        SettlementRollup.amount,
+    ).filter(SettlementRollup.day == day)
+
+    if terminal is not None:
+        query = query.filter(
+            SettlementRollup.terminal == settlement_terminal(terminal)
+        )
+
+    return [
+        {
+            "terminal": row.terminal,
+            "module": row.module,
+            "payment_type": row.payment_type,
+            "count": row.count,
+            "amount": round(row.amount, 2),
+        }
+        for row in query.order_by(
+            SettlementRollup.terminal,
+            SettlementRollup.module,
+            SettlementRollup.payment_type,
+        )
+    ]
+
+
+def record_pegepay_settlement(
+    db: Session,
+    order_no: str,
+    terminal_id: str | None,
+    order_amount,
+) -> None:
+    """
+    Add a PegePay order that has just become successful.
+    """
+
+    day = pegepay_order_day(order_no)
+
+    if day is None:
+        print(f"[WARN] PegePay order {order_no} has no date, left out of settlements")
+        return
+
+    record_settlement(
+        db,
+        "pegepay",
+        terminal_id,
+        day,
+        "QR",
+        float(order_amount or 0),
+    )
@@ -0,0 +1,143 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.schema.receipt.receipt_schema import ShortLink
+from app.utils.blob_upload import SAS_LIFETIME, generate_blob_url
+from app.utils.config import PUBLIC_API_URL
+
+
+# =========================================================
+# SHORT LINKS
+# =========================================================
+#
+# Receipt QR codes used to encode the full blob SAS URL
+# (~200 characters), which needs a dense QR version and
+# expires after SAS_LIFETIME. A short link stores only the blob
+# name under a random code:
+#
+#   {PUBLIC_API_URL}/r/<code>  ->  302 to a fresh SAS URL
+#
+# The signed URL is cached per code and re-signed once it is
+# close to expiry, so a link keeps working as long as the blob
+# exists.
+#
+# A blob has one code: asking again for the same blob (the same
+# receipt's QR requested twice) returns the stored code, so the
+# QR image is identical (and cached) and no row is added.
+# =========================================================
+
+SHORT_LINK_ROUTE = "/r"
+
+# 6 random bytes = 8 URL-safe characters (48 bits).
+_CODE_BYTES = 6
+
+# Re-sign this long before the cached SAS URL expires, so a
+# redirect never hands out a link that is about to die.
+_RESIGN_MARGIN = timedelta(minutes=10)
+
+_CACHE_SIZE = 1024
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def create_short_link(
+    db: Session,
+    blob_name: str,
+) -> str:
+    """
+    Return the short URL of an uploaded blob, storing a new
+    code only when the blob has none yet.
+    """
+
+    code = db.execute(
+        select(ShortLink.code)
+        .where(ShortLink.blob_name == blob_name)
+        .order_by(ShortLink.id)
+        .limit(1)
+    ).scalar()
+
+    if code is None:
+        code = secrets.token_urlsafe(_CODE_BYTES)
+
+        db.add(
+            ShortLink(
+                code=code,
+                blob_name=blob_name,
+            )
+        )
+        db.commit()
+
+    return f"{PUBLIC_API_URL}{SHORT_LINK_ROUTE}/{code}"
+
+
+def _cached_blob_name(code):
+    """
+    (blob_name, signed_url or None) from the cache, or None.
+    """
+
+    with _cache_lock:
+        entry = _cache.get(code)
+
+        if entry is None:
+            return None
+
+        _cache.move_to_end(code)
+
+        if time.monotonic() < entry["valid_until"]:
+            return entry["blob_name"], entry["url"]
+
+        return entry["blob_name"], None
+
+
+def resolve_short_link(
+    db: Session,
+    code: str,
+) -> str | None:
+    """
+    Current signed URL of the blob behind code, or None when
+    the code does not exist.
+    """
+
+    cached = _cached_blob_name(code)
+
+    if cached is not None:
+        blob_name, url = cached
+
+        if url:
+            return url
+
+    else:
+        link = (
+            db.query(ShortLink)
+            .filter(ShortLink.code == code)
+            .first()
+        )
+
+        if not link:
+            return None
+
+        blob_name = link.blob_name
+
+    url = generate_blob_url(blob_name)
+
+    with _cache_lock:
+        _cache[code] = {
+            "blob_name": blob_name,
+            "url": url,
+            "valid_until": (
+                time.monotonic()
+                + (SAS_LIFETIME - _RESIGN_MARGIN).total_seconds()
+            ),
+        }
+        _cache.move_to_end(code)
+
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return url
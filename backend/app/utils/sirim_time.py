@@ -29,12 +29,17 @@ class SirimTime:
     _offset = timedelta(0)
     _has_synced = False
     _last_synced_at: Optional[datetime] = None
+    _last_failed_at: Optional[float] = None
 
     _lock = threading.Lock()
 
     # Re-sync after 30 minutes
     _sync_interval_seconds = 30 * 60
 
+    # After all servers fail, wait this long before trying again,
+    # so callers are not blocked by NTP timeouts on every request.
+    _retry_interval_seconds = 60
+
     # NTP request timeout
     _timeout_seconds = 3
 
@@ -57,6 +62,9 @@ class SirimTime:
             if not force and cls._is_sync_still_valid():
                 return True
 
+            if not force and cls._is_retry_pending():
+                return cls._has_synced
+
             client = ntplib.NTPClient()
 
             for host in cls._hosts:
@@ -71,6 +79,7 @@ class SirimTime:
                     # NTP server time and this server's system time.
                     cls._offset = timedelta(seconds=response.offset)
                     cls._has_synced = True
+                    cls._last_failed_at = None
                     cls._last_synced_at = datetime.now(
                         tz=cls._malaysia_timezone
                     )
@@ -91,6 +100,8 @@ class SirimTime:
                         error,
                     )
 
+            cls._last_failed_at = time.monotonic()
+
             # Keep the previous valid offset when synchronization later fails.
             if cls._has_synced:
                 logger.warning(
@@ -160,6 +171,15 @@ class SirimTime:
 
         return elapsed < cls._sync_interval_seconds
 
+    @classmethod
+    def _is_retry_pending(cls) -> bool:
+        if cls._last_failed_at is None:
+            return False
+
+        elapsed = time.monotonic() - cls._last_failed_at
+
+        return elapsed < cls._retry_interval_seconds
+
 
 def sirim_now() -> datetime:
     """
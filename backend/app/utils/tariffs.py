@@ -0,0 +1,293 @@
+import threading
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, time as day_time, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.schema.parking.tariff_schema import (
+    ParkingTariff,
+    ParkingTariffBand,
+    TerminalZone,
+)
+from app.utils.cache_versions import read_cache_version
+from app.utils.config import RATE_PER_HOUR, TARIFF_CHECK_SECONDS
+
+
+# =========================================================
+# PARKING TARIFFS
+# =========================================================
+#
+# Tariffs live in parking_tariffs / parking_tariff_bands, per
+# terminal, per zone (terminal_zones) or as the default, with
+# time-of-day bands, a daily cap and free grace minutes. With
+# no rows at all every terminal pays RATE_PER_HOUR around the
+# clock, as before.
+#
+# Each tariff is compiled once into the day's runs of equal
+# rate and the cost of the day before each run starts, so a
+# session costs two bisects per calendar day it covers:
+#
+#   cost(from, to) = partial first run + cumulative between
+#                    + partial last run
+#
+# Within one run the cost is hours * rate, so a flat tariff
+# prices exactly like the old hours * RATE_PER_HOUR.
+#
+# The compiled tariffs are reloaded when the "parking_tariffs"
+# row in cache_versions changes (checked at most every
+# TARIFF_CHECK_SECONDS); bump it after editing the tables.
+# =========================================================
+
+TARIFF_CACHE = "parking_tariffs"
+
+_MINUTES_PER_DAY = 24 * 60
+
+_lock = threading.Lock()
+
+_state = {
+    "tariffs": None,
+    "version": None,
+    "checked_at": None,
+}
+
+
+# =========================================================
+# COMPILE
+# =========================================================
+
+def _band_minutes(start_time, end_time):
+    first = start_time.hour * 60 + start_time.minute
+    last = end_time.hour * 60 + end_time.minute
+
+    if last <= first:
+        return list(range(first, _MINUTES_PER_DAY)) + list(range(last))
+
+    return range(first, last)
+
+
+def _compile_tariff(bands, daily_cap=None, grace_minutes=0):
+    """
+    bands: [(start_time, end_time, rate_per_hour)], later
+    bands override earlier ones.
+    """
+
+    rates = [0.0] * _MINUTES_PER_DAY
+
+    for start_time, end_time, rate_per_hour in bands:
+        for minute in _band_minutes(start_time, end_time):
+            rates[minute] = rate_per_hour
+
+    # Runs of equal rate: start (seconds after midnight), RM per
+    # hour, and the cost of the day before the run starts.
+    starts = []
+    run_rates = []
+    cumulative = []
+    cost = 0.0
+
+    for minute, rate in enumerate(rates):
+        if run_rates and run_rates[-1] == rate:
+            continue
+
+        if starts:
+            cost += (minute * 60 - starts[-1]) / 3600 * run_rates[-1]
+
+        starts.append(minute * 60)
+        run_rates.append(rate)
+        cumulative.append(cost)
+
+    return {
+        "starts": starts,
+        "rates": run_rates,
+        "cumulative": cumulative,
+        "daily_cap": daily_cap,
+        "grace": timedelta(minutes=grace_minutes or 0),
+    }
+
+
+def _flat_tariff():
+    return _compile_tariff(
+        [(day_time(0), day_time(0), RATE_PER_HOUR)]
+    )
+
+
+def _load_tariffs(db):
+    bands = defaultdict(list)
+
+    for band in (
+        db.query(ParkingTariffBand)
+        .order_by(ParkingTariffBand.id)
+        .all()
+    ):
+        bands[band.tariff_id].append(
+            (band.start_time, band.end_time, band.rate_per_hour)
+        )
+
+    compiled = {
+        "terminals": {},
+        "zones": {},
+        "default": _flat_tariff(),
+        "terminal_zones": dict(
+            db.query(TerminalZone.terminal, TerminalZone.zone).all()
+        ),
+    }
+
+    for tariff in db.query(ParkingTariff).all():
+        entry = _compile_tariff(
+            bands[tariff.id],
+            tariff.daily_cap,
+            tariff.grace_minutes,
+        )
+
+        if tariff.terminal:
+            compiled["terminals"][tariff.terminal] = entry
+        elif tariff.zone:
+            compiled["zones"][tariff.zone] = entry
+        else:
+            compiled["default"] = entry
+
+    return compiled
+
+
+def _current_tariffs(db):
+    with _lock:
+        checked_at = _state["checked_at"]
+
+        if (
+            checked_at is not None
+            and time.monotonic() - checked_at < TARIFF_CHECK_SECONDS
+        ):
+            return _state["tariffs"]
+
+    version = read_cache_version(db, TARIFF_CACHE)
+
+    if version == _state["version"] and _state["tariffs"] is not None:
+        tariffs = _state["tariffs"]
+    else:
+        tariffs = _load_tariffs(db)
+        print(f"[INFO] Parking tariffs loaded (version {version})")
+
+    with _lock:
+        _state["tariffs"] = tariffs
+        _state["version"] = version
+        _state["checked_at"] = time.monotonic()
+
+    return tariffs
+
+
+def _tariff_for(db, terminal):
+    tariffs = _current_tariffs(db)
+
+    return (
+        tariffs["terminals"].get(terminal)
+        or tariffs["zones"].get(tariffs["terminal_zones"].get(terminal))
+        or tariffs["default"]
+    )
+
+
+# =========================================================
+# PRICE
+# =========================================================
+
+def _day_cost(tariff, first, last):
+    """
+    Cost between first and last seconds after midnight.
+    """
+
+    starts = tariff["starts"]
+    rates = tariff["rates"]
+
+    run = bisect_right(starts, first) - 1
+    last_run = bisect_right(starts, last) - 1
+
+    if run == last_run:
+        return (last - first) / 3600 * rates[run]
+
+    return (
+        (starts[run + 1] - first) / 3600 * rates[run]
+        + tariff["cumulative"][last_run]
+        - tariff["cumulative"][run + 1]
+        + (last - starts[last_run]) / 3600 * rates[last_run]
+    )
+
+
+def _session_price(tariff, start, hours):
+    charged_from = start + tariff["grace"]
+    end = start + timedelta(hours=hours)
+    total = 0.0
+
+    # One rate all day and no cap (the RATE_PER_HOUR tariff):
+    # no need to split the session at midnight.
+    if len(tariff["rates"]) == 1 and tariff["daily_cap"] is None:
+        if charged_from >= end:
+            return 0.0
+
+        hours = (end - charged_from).total_seconds() / 3600
+
+        return round(hours * tariff["rates"][0], 2)
+
+    # One step per calendar day; the daily cap applies per day.
+    while charged_from < end:
+        midnight = datetime.combine(charged_from.date(), day_time(0))
+        day_end = min(end, midnight + timedelta(days=1))
+
+        cost = _day_cost(
+            tariff,
+            (charged_from - midnight).total_seconds(),
+            (day_end - midnight).total_seconds(),
+        )
+
+        if tariff["daily_cap"] is not None:
+            cost = min(cost, tariff["daily_cap"])
+
+        total += cost
+        charged_from = day_end
+
+    return round(total, 2)
+
+
+def quote_parking(
+    db: Session,
+    terminal: str,
+    start: datetime,
+    durations: list[float],
+    used_hours: float = 0.0,
+) -> list[dict]:
+    """
+    Price many durations of one session in one call.
+
+    Args:
+        terminal:
+            Cleaned terminal ID (selects the tariff).
+
+        start:
+            Session start (timein).
+
+        used_hours:
+            Hours already paid for; each duration is then priced
+            as an extension of them.
+
+    Returns:
+        [{"hours", "amount" (to pay now), "total_amount" (whole
+        session), "timeout"}], in the order of durations
+    """
+
+    tariff = _tariff_for(db, terminal)
+    paid = _session_price(tariff, start, used_hours)
+
+    quotes = []
+
+    for hours in durations:
+        total = _session_price(tariff, start, used_hours + hours)
+
+        quotes.append(
+            {
+                "hours": hours,
+                "amount": round(max(total - paid, 0.0), 2),
+                "total_amount": total,
+                "timeout": start + timedelta(hours=used_hours + hours),
+            }
+        )
+
+    return quotes
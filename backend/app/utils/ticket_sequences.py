@@ -0,0 +1,208 @@
+import re
+from datetime import date
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.schema.parking.transaction_parking_schema import (
+    TicketSequence,
+    TransactionParking,
+)
+from app.utils.sirim_time import sirim_now_naive
+
+
+# =========================================================
+# DAILY TICKET NUMBERS
+# =========================================================
+#
+# Each terminal numbers its parking tickets from 1 every day.
+# The numbers come from one counter row per (terminal, day) in
+# ticket_sequences instead of counting the day's tickets:
+#
+# - the UPDATE ... + 1 locks the row until the caller commits,
+#   so two payments at one terminal can never get the same
+#   number, whatever the isolation level
+# - the cost no longer grows with the ticket history
+#
+# The caller must insert the TransactionParking row and commit
+# in the same transaction, which also releases the row lock.
+# =========================================================
+
+def _legacy_daily_count(db, terminal, day):
+    """
+    Tickets already issued today without the counter.
+
+    Runs for the first ticket of every day at every terminal
+    (the counter row is per day). Only the day of the deploy
+    finds any; on other days it is one range read on the
+    ticket_id index that comes back empty.
+    """
+
+    return (
+        db.query(func.count(TransactionParking.id))
+        .filter(
+            TransactionParking.terminal == terminal,
+            TransactionParking.ticket_id.like(
+                f"P-{day:%Y%m%d}-%-{terminal}-%"
+            ),
+        )
+        .scalar()
+        or 0
+    )
+
+
+def _increment(db, terminal, day):
+    """
+    New number, or None when the row does not exist yet.
+
+    One round trip: UPDATE ... RETURNING where the database
+    supports it (SQLite, PostgreSQL); on MySQL the new value is
+    passed back through LAST_INSERT_ID(expr), which the driver
+    returns with the UPDATE result.
+    """
+
+    statement = update(TicketSequence).where(
+        TicketSequence.terminal == terminal,
+        TicketSequence.day == day,
+    )
+
+    dialect = db.get_bind().dialect
+
+    if dialect.update_returning:
+        return db.execute(
+            statement
+            .values(last_number=TicketSequence.last_number + 1)
+            .returning(TicketSequence.last_number)
+        ).scalar()
+
+    if dialect.name == "mysql":
+        result = db.execute(
+            statement.values(
+                last_number=func.last_insert_id(
+                    TicketSequence.last_number + 1
+                )
+            )
+        )
+
+        return result.lastrowid if result.rowcount else None
+
+    result = db.execute(
+        statement.values(last_number=TicketSequence.last_number + 1)
+    )
+
+    if not result.rowcount:
+        return None
+
+    return (
+        db.query(TicketSequence.last_number)
+        .filter(
+            TicketSequence.terminal == terminal,
+            TicketSequence.day == day,
+        )
+        .scalar()
+    )
+
+
+def next_ticket_number(
+    db: Session,
+    terminal: str,
+    day: date,
+) -> int:
+    """
+    Allocate the next daily ticket number for a terminal.
+
+    The counter row stays locked until the caller's commit or
+    rollback (a rollback gives the number back).
+    """
+
+    while True:
+        number = _increment(db, terminal, day)
+
+        if number is not None:
+            return number
+
+        # First ticket of the day for this terminal. When two
+        # payments race here both try the insert; the loser
+        # falls back to incrementing the winner's row.
+        number = _legacy_daily_count(db, terminal, day) + 1
+
+        try:
+            with db.begin_nested():
+                db.add(
+                    TicketSequence(
+                        terminal=terminal,
+                        day=day,
+                        last_number=number,
+                    )
+                )
+
+            return number
+
+        except IntegrityError:
+            continue
+
+
+# =========================================================
+# TICKET ID
+# =========================================================
+
+def clean_terminal_id(terminal: str) -> str:
+    """
+    Clean terminal ID before placing it inside the ticket ID.
+
+    Examples:
+        "TIP 01" -> "TIP01"
+        "tip-01" -> "TIP-01"
+        "TIP_01" -> "TIP_01"
+    """
+    cleaned_terminal = re.sub(
+        r"[^A-Za-z0-9_-]",
+        "",
+        terminal.strip(),
+    ).upper()
+
+    return cleaned_terminal or "UNKNOWN"
+
+
+def generate_ticket_id(
+    db: Session,
+    terminal: str,
+    current_time=None,
+) -> str:
+    """
+    Ticket format:
+
+    P-YYYYMMDD-HHMMSS-TERMINAL-DAILYNUMBER
+
+    Daily number is separate for each terminal.
+
+    Examples:
+        P-20260710-103000-TIP01-01
+        P-20260710-103500-TIP01-02
+        P-20260710-104000-TIP02-01
+    """
+
+    # SIRIM time is the first priority.
+    now = current_time or sirim_now_naive()
+
+    date_part = now.strftime("%Y%m%d")
+    time_part = now.strftime("%H%M%S")
+    terminal_part = clean_terminal_id(terminal)
+
+    # Counter row per terminal and day, locked until the
+    # transaction that inserts the ticket commits.
+    next_daily_number = next_ticket_number(
+        db,
+        terminal_part,
+        now.date(),
+    )
+
+    sequence_part = f"{next_daily_number:02d}"
+
+    return (
+        f"P-{date_part}-"
+        f"{time_part}-"
+        f"{terminal_part}-"
+        f"{sequence_part}"
+    )
@@ -0,0 +1,241 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.schema.compound.compound_schema import Compound, StatusTypeEnum
+from app.utils.cache_versions import read_cache_version
+from app.utils.config import (
+    UNPAID_COMPOUND_CACHE_SIZE,
+    UNPAID_COMPOUND_CACHE_TTL_SECONDS,
+    UNPAID_COMPOUND_CHECK_SECONDS,
+    UNPAID_COMPOUND_NEGATIVE_TTL_SECONDS,
+)
+from app.utils.plates import normalize_plate
+
+
+# =========================================================
+# UNPAID COMPOUNDS BY PLATE (READ CACHE)
+# =========================================================
+#
+# Every kiosk customer checks /compound/unpaid/{plate} before
+# paying, usually several times, and most plates have none.
+# Each worker keeps the answer per normalized plate:
+#
+#   plate_norm -> (expires_at, loaded_at, [compound dicts])
+#
+# for UNPAID_COMPOUND_CACHE_TTL_SECONDS, or the shorter
+# UNPAID_COMPOUND_NEGATIVE_TTL_SECONDS when the plate has none
+# (compounds inserted straight into the table only show up
+# after the TTL).
+#
+# Writers through this API (create, pay, multi pay, multi
+# update) bump the "unpaid_compounds" row in cache_versions
+# before their commit and call forget_unpaid_compounds() after
+# it. Other workers read the version at most every
+# UNPAID_COMPOUND_CHECK_SECONDS and empty their cache when
+# someone else wrote (they do not know which plates).
+#
+# A load that raced with a write in this worker is not stored
+# (the generation counter moved), so it cannot cache a compound
+# this worker has just paid as unpaid.
+# =========================================================
+
+UNPAID_COMPOUNDS = "unpaid_compounds"
+
+COMPOUND_FIELDS = [
+    "id",
+    "name",
+    "compoundnum",
+    "plate",
+    "date",
+    "time",
+    "offense",
+    "amount",
+    "status",
+]
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+_state = {
+    "generation": 0,
+    "version": None,
+    "own_bumps": 0,
+    "checked_at": None,
+}
+
+_metrics = {
+    "hits": 0,
+    "negative_hits": 0,
+    "misses": 0,
+    "expired": 0,
+    "invalidated_plates": 0,
+    "remote_resets": 0,
+    "hit_age_total": 0.0,
+    "hit_age_max": 0.0,
+}
+
+
+def _reset(reason):
+    """
+    Drop every entry. Call with _lock held.
+    """
+
+    _cache.clear()
+    _state["generation"] += 1
+    _metrics[reason] += 1
+
+
+def _check_version(db):
+    now = time.monotonic()
+
+    with _lock:
+        checked_at = _state["checked_at"]
+
+        if (
+            checked_at is not None
+            and now - checked_at < UNPAID_COMPOUND_CHECK_SECONDS
+        ):
+            return
+
+        # Claimed before the query, so one request checks.
+        _state["checked_at"] = now
+
+    version = read_cache_version(db, UNPAID_COMPOUNDS)
+
+    with _lock:
+        last = _state["version"]
+
+        # Every bump since the last check was this worker's own
+        # (already forgotten plate by plate): keep the entries.
+        if last is not None and version != last + _state["own_bumps"]:
+            _reset("remote_resets")
+
+        _state["version"] = version
+        _state["own_bumps"] = 0
+
+
+def unpaid_compounds(
+    db: Session,
+    plate: str,
+) -> list[dict]:
+    """
+    Unpaid compounds of the plate (COMPOUND_FIELDS dicts), [] when
+    it has none. The list is shared with the cache: read only.
+    """
+
+    plate_norm = normalize_plate(plate)
+
+    _check_version(db)
+
+    now = time.monotonic()
+
+    with _lock:
+        entry = _cache.get(plate_norm)
+
+        if entry is not None:
+            expires_at, loaded_at, compounds = entry
+
+            if now < expires_at:
+                _cache.move_to_end(plate_norm)
+
+                age = now - loaded_at
+                _metrics["hits"] += 1
+                _metrics["negative_hits"] += not compounds
+                _metrics["hit_age_total"] += age
+                _metrics["hit_age_max"] = max(_metrics["hit_age_max"], age)
+
+                return compounds
+
+            del _cache[plate_norm]
+            _metrics["expired"] += 1
+
+        _metrics["misses"] += 1
+        generation = _state["generation"]
+
+    compounds = [
+        dict(row._mapping)
+        for row in db.execute(
+            select(
+                *(getattr(Compound, field) for field in COMPOUND_FIELDS)
+            ).where(
+                Compound.plate_norm == plate_norm,
+                Compound.status == StatusTypeEnum.unpaid,
+            )
+        )
+    ]
+
+    ttl = (
+        UNPAID_COMPOUND_CACHE_TTL_SECONDS
+        if compounds
+        else UNPAID_COMPOUND_NEGATIVE_TTL_SECONDS
+    )
+
+    with _lock:
+        if _state["generation"] == generation:
+            _cache[plate_norm] = (now + ttl, now, compounds)
+
+            while len(_cache) > UNPAID_COMPOUND_CACHE_SIZE:
+                _cache.popitem(last=False)
+
+    return compounds
+
+
+def forget_unpaid_compounds(plates_norm) -> None:
+    """
+    Call after committing a compound write that bumped
+    UNPAID_COMPOUNDS, with the normalized plates it touched.
+    """
+
+    with _lock:
+        for plate_norm in set(plates_norm):
+            if _cache.pop(plate_norm, None) is not None:
+                _metrics["invalidated_plates"] += 1
+
+        _state["generation"] += 1
+        _state["own_bumps"] += 1
+
+
+def cache_metrics() -> dict:
+    """
+    Hit ratio and staleness of this worker's cache since start.
+    """
+
+    now = time.monotonic()
+
+    with _lock:
+        hits = _metrics["hits"]
+        lookups = hits + _metrics["misses"]
+        checked_at = _state["checked_at"]
+
+        return {
+            "entries": len(_cache),
+            "negative_entries": sum(
+                1
+                for _, _, compounds in _cache.values()
+                if not compounds
+            ),
+            "lookups": lookups,
+            "hits": hits,
+            "negative_hits": _metrics["negative_hits"],
+            "misses": _metrics["misses"],
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "expired": _metrics["expired"],
+            "invalidated_plates": _metrics["invalidated_plates"],
+            "remote_resets": _metrics["remote_resets"],
+            # Age of the entries served from the cache
+            "hit_age_seconds": {
+                "mean": round(_metrics["hit_age_total"] / hits, 3) if hits else None,
+                "max": round(_metrics["hit_age_max"], 3),
+            },
+            "version_checked_seconds_ago": (
+                round(now - checked_at, 3)
+                if checked_at is not None
+                else None
+            ),
+            "ttl_seconds": UNPAID_COMPOUND_CACHE_TTL_SECONDS,
+            "negative_ttl_seconds": UNPAID_COMPOUND_NEGATIVE_TTL_SECONDS,
+        }
@@ -0,0 +1,262 @@
+"""
+Parking pay / extend benchmark.
+
+Runs the old pay and extend flows (commit + refresh of the
+Parking row, COUNT(*) ticket number, commit + refresh of the
+transaction) and record_parking_payment() against a local
+SQLite database. Every statement and commit waits --latency-ms
+first, to stand in for the round trip to the remote MySQL
+server. Prints p50 / p99 latency and round trips per payment.
+
+Usage (from the backend folder):
+    python -m benchmarks.parking_payment_benchmark
+    python -m benchmarks.parking_payment_benchmark --latency-ms 5 --runs 100
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+
+from app.schema.cache.cache_version_schema import CacheVersion
+from app.schema.parking.parking_schema import Parking, PaymentStatusEnum
+from app.schema.parking.transaction_parking_schema import (
+    TicketOverviewEnum,
+    TicketSequence,
+    TransactionParking,
+)
+from app.schema.parking.tariff_schema import (
+    ParkingTariff,
+    ParkingTariffBand,
+    TerminalZone,
+)
+from app.schema.settlement.settlement_schema import SettlementRollup
+from app.utils.config import RATE_PER_HOUR
+from app.utils.parking_payments import record_parking_payment
+from app.utils.sirim_time import sirim_now_naive
+from benchmarks.stats import percentile
+
+
+load_dotenv()
+
+TERMINAL = "BENCH01"
+
+
+class RoundTrips:
+    """
+    Counts statements and commits, sleeping before each one.
+    """
+
+    def __init__(self, engine, latency_ms):
+        self.count = 0
+        self.latency = latency_ms / 1000
+
+        event.listen(engine, "before_cursor_execute", self._wait)
+        event.listen(engine, "commit", self._wait)
+
+    def _wait(self, *args, **kwargs):
+        self.count += 1
+        time.sleep(self.latency)
+
+
+# =========================================================
+# OLD FLOW (before record_parking_payment)
+# =========================================================
+
+def calculate_amount(hours):
+    return round(hours * RATE_PER_HOUR, 2)
+
+
+def _legacy_active(db, plate, now):
+    latest = (
+        db.query(Parking)
+        .filter(
+            Parking.plate == plate,
+            Parking.payment_status == PaymentStatusEnum.yes,
+        )
+        .order_by(Parking.timeout.desc())
+        .first()
+    )
+
+    if latest and now < latest.timeout:
+        return latest
+
+    return None
+
+
+def _legacy_ticket(db, now, overview, hours):
+    count = (
+        db.query(func.count(TransactionParking.id))
+        .filter(
+            TransactionParking.terminal == TERMINAL,
+            TransactionParking.ticket_id.like(
+                f"P-{now:%Y%m%d}-%-{TERMINAL}-%"
+            ),
+        )
+        .scalar()
+        or 0
+    )
+
+    transaction = TransactionParking(
+        ticket_id=f"P-{now:%Y%m%d}-{now:%H%M%S}-{TERMINAL}-{count + 1:02d}",
+        plate="n/a",
+        terminal=TERMINAL,
+        hours=hours,
+        amount=calculate_amount(hours),
+        transaction_type="QR",
+        Ticket_Overview=overview,
+    )
+
+    db.add(transaction)
+    db.commit()
+    db.refresh(transaction)
+
+    return transaction
+
+
+def legacy_pay(db, plate, hours):
+    now = sirim_now_naive()
+
+    if _legacy_active(db, plate, now):
+        raise RuntimeError("already active")
+
+    parking = Parking(
+        plate=plate,
+        terminal=TERMINAL,
+        time_used=hours,
+        timein=now,
+        timeout=now + timedelta(hours=hours),
+        payment_status=PaymentStatusEnum.yes,
+        amount=calculate_amount(hours),
+    )
+
+    db.add(parking)
+    db.commit()
+    db.refresh(parking)
+
+    _legacy_ticket(db, now, TicketOverviewEnum.new, hours)
+
+    return parking
+
+
+def legacy_extend(db, plate, hours):
+    now = sirim_now_naive()
+    active = _legacy_active(db, plate, now)
+
+    active.time_used += hours
+    active.timeout += timedelta(hours=hours)
+    active.amount = calculate_amount(active.time_used)
+
+    db.commit()
+    db.refresh(active)
+
+    _legacy_ticket(db, now, TicketOverviewEnum.extend, hours)
+
+    return active
+
+
+# =========================================================
+# NEW FLOW
+# =========================================================
+
+def unit_pay(db, plate, hours):
+    return record_parking_payment(db, plate, hours, TERMINAL, "QR")
+
+
+def unit_extend(db, plate, hours):
+    return record_parking_payment(db, plate, hours, TERMINAL, "QR", extend=True)
+
+
+# =========================================================
+# RUN
+# =========================================================
+
+FLOWS = {
+    "legacy pay": legacy_pay,
+    "legacy extend": legacy_extend,
+    "unit pay": unit_pay,
+    "unit extend": unit_extend,
+}
+
+
+def run(runs, latency_ms):
+    path = Path(tempfile.mkdtemp()) / "parking_payment_benchmark.db"
+    engine = create_engine(f"sqlite:///{path}")
+
+    Parking.metadata.create_all(
+        engine,
+        tables=[
+            Parking.__table__,
+            TransactionParking.__table__,
+            TicketSequence.__table__,
+            CacheVersion.__table__,
+            ParkingTariff.__table__,
+            ParkingTariffBand.__table__,
+            TerminalZone.__table__,
+            SettlementRollup.__table__,
+        ],
+    )
+
+    Session = sessionmaker(bind=engine, autoflush=False)
+    round_trips = RoundTrips(engine, latency_ms)
+
+    # Warm up SIRIM time and the connection pool.
+    sirim_now_naive()
+    Session().close()
+
+    print(
+        f"{'flow':14} {'p50 ms':>8} {'p99 ms':>8} {'round trips':>12}"
+    )
+
+    for prefix in ("legacy", "unit"):
+        timings = {"pay": [], "extend": []}
+        trips = {"pay": 0, "extend": 0}
+
+        for index in range(runs):
+            plate = f"{prefix[0].upper()}BM{index:05d}"
+
+            for action in ("pay", "extend"):
+                db = Session()
+
+                try:
+                    round_trips.count = 0
+                    started = time.perf_counter()
+
+                    FLOWS[f"{prefix} {action}"](db, plate, 1.0)
+
+                    timings[action].append(
+                        (time.perf_counter() - started) * 1000
+                    )
+                    trips[action] += round_trips.count
+
+                finally:
+                    db.close()
+
+        for action in ("pay", "extend"):
+            print(
+                f"{prefix + ' ' + action:14} "
+                f"{percentile(timings[action], 50):8.2f} "
+                f"{percentile(timings[action], 99):8.2f} "
+                f"{trips[action] / runs:12.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark parking pay / extend."
+    )
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+
+    args = parser.parse_args()
+
+    run(args.runs, args.latency_ms)
+
+
+if __name__ == "__main__":
+    main()
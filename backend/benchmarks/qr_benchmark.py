@@ -0,0 +1,156 @@
+"""
+Receipt QR benchmark.
+
+Encodes sample receipt links of typical lengths with the old
+per-controller code (qrcode's PIL image, saved as PNG) and with
+app.utils.qr_service, and prints p50 / p99 encode time and PNG
+size for every QR profile, plus the SVG and bit-packed matrix
+output of the default profile. "cached" is a repeat request for
+the same link, served from the LRU cache; "fixed mask" is the
+profile with mask_pattern 0 (no search for the best mask).
+
+Usage (from the backend folder):
+    python -m benchmarks.qr_benchmark
+    python -m benchmarks.qr_benchmark --runs 500
+"""
+
+import argparse
+import time
+from io import BytesIO
+
+import qrcode
+
+from app.utils import qr_service
+from app.utils.config import QR_PROFILES
+from benchmarks.stats import percentile
+
+
+SAMPLE_URLS = {
+    # Short link (eager receipts)
+    "short_link": "http://4.194.122.32:8000/r/Xk3v9Qe1",
+    # Signed backend link (lazy / served receipts)
+    "backend_link": (
+        "http://4.194.122.32:8000/api/v2/receipts/"
+        "Xk3v9Qe1ZpLm?sig=9f2c4be17a0d5e63"
+    ),
+    # Blob SAS link (eager receipts before short links)
+    "sas_link": (
+        "https://tipintar.juaraipasifik.com/receipts/"
+        "receipt_KN08150126001_20260115103000.html"
+        "?se=2026-01-15T11%3A30%3A00Z&sp=r&sv=2025-01-05&sr=b"
+        "&sig=Jq7cD2lO9sV4bN1xR8tY5uE3wQ6zA0mK%2FhGfLpIo%3D"
+    ),
+}
+
+
+def legacy_qr_png(url):
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+
+    qr.add_data(url)
+    qr.make(fit=True)
+
+    image = qr.make_image(
+        fill_color="black",
+        back_color="white",
+    )
+
+    buffer = BytesIO()
+    image.save(buffer, "PNG")
+
+    return buffer.getvalue()
+
+
+def measure(encode, runs):
+    timings = []
+
+    for _ in range(runs):
+        started = time.perf_counter()
+        png = encode()
+        timings.append(
+            (time.perf_counter() - started) * 1000
+        )
+
+    return {
+        "p50_ms": percentile(timings, 50),
+        "p99_ms": percentile(timings, 99),
+        "size_b": len(png),
+    }
+
+
+def _uncached(url, profile, qr_format="png"):
+    def encode():
+        qr_service._qr_cache.clear()
+        return qr_service.generate_qr(url, profile, qr_format)
+
+    return encode
+
+
+def _fixed_mask(url, profile):
+    settings = QR_PROFILES[profile]
+
+    return lambda: qr_service._encode(
+        url,
+        settings["box_size"],
+        settings["border"],
+        settings["error_correction"],
+        0,
+        "png",
+    )
+
+
+def run(runs):
+    print(
+        f"{'link':14} {'encoder':20} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'bytes':>10}"
+    )
+
+    for link, url in SAMPLE_URLS.items():
+        cases = {
+            "legacy": lambda: legacy_qr_png(url),
+        }
+
+        for profile in QR_PROFILES:
+            cases[profile] = _uncached(url, profile)
+            cases[f"{profile} fixed mask"] = _fixed_mask(url, profile)
+            cases[f"{profile} cached"] = (
+                lambda profile=profile: qr_service.generate_qr_png(
+                    url,
+                    profile,
+                )
+            )
+
+        for qr_format in ("svg", "matrix"):
+            cases[f"default {qr_format}"] = _uncached(
+                url,
+                "default",
+                qr_format,
+            )
+
+        for name, encode in cases.items():
+            result = measure(encode, runs)
+
+            print(
+                f"{link:14} {name:20} "
+                f"{result['p50_ms']:8.3f} {result['p99_ms']:8.3f} "
+                f"{result['size_b']:10d}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark receipt QR encoding."
+    )
+    parser.add_argument("--runs", type=int, default=200)
+
+    args = parser.parse_args()
+
+    run(args.runs)
+
+
+if __name__ == "__main__":
+    main()
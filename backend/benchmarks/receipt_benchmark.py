@@ -0,0 +1,643 @@
+"""
+Receipt benchmark.
+
+Renders every receipt PDF and every HTML receipt page with
+sample data and prints p50 / p99 latency, peak memory and
+output size per receipt. Results are compared against the
+stored baseline (benchmarks/receipt_baseline.json) when it
+exists, so each optimization can be measured.
+
+The HTML builders live in the controllers, which need
+TIP_API_KEY and TIP_HMAC_SECRET in the environment (the same
+as when running the API).
+
+Usage (from the backend folder):
+    python -m benchmarks.receipt_benchmark
+    python -m benchmarks.receipt_benchmark --runs 200
+    python -m benchmarks.receipt_benchmark --only pdf
+
+    # Store the current results as the new baseline
+    python -m benchmarks.receipt_benchmark --save-baseline
+
+    # Multi-item receipts at 10, 100 and 1000 items
+    python -m benchmarks.receipt_benchmark --scale
+
+    # File size regression check (exit code 1 when a receipt
+    # is over its budget)
+    python -m benchmarks.receipt_benchmark --sizes
+
+Timings depend on the machine. Save a baseline on the same
+machine before comparing.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+
+from app.controllers.v2.bill.bill_receipt import generate_bill_receipt
+from app.controllers.v2.compound.compound_receipt import (
+    generate_multi_compound_pdf,
+    render_single_compound_pdf,
+)
+from app.controllers.v2.licenses.licenses_receipt import (
+    generate_multi_license_pdf,
+    render_single_license_pdf,
+)
+from app.controllers.v2.parking.parking_receipt import (
+    generate_parking_receipt,
+)
+from app.controllers.v2.sewaan.sewaan_receipt_bentong import (
+    generate_sewaan_receipt_bentong,
+)
+from app.controllers.v2.tax.tax_receipt import generate_multi_tax_pdf
+from app.controllers.v2.tax.tax_receipt_bentong import (
+    generate_tax_receipt_bentong,
+)
+from app.utils import receipt_templates
+from benchmarks.stats import percentile
+
+
+load_dotenv()
+
+PAID_DATE = datetime.datetime(2026, 1, 15, 10, 30)
+ORDER_NO = "KN08150126001"
+BANK_TRX_NO = "TRX0001"
+PDF_URL = "https://example.blob.core.windows.net/receipts/receipt.pdf"
+ASSET_URL = "https://example.blob.core.windows.net/receipts"
+
+BASELINE_PATH = Path(__file__).resolve().parent / "receipt_baseline.json"
+
+MULTI_ITEM_RECEIPTS = [
+    "compound_multi",
+    "license_multi",
+    "tax_multi",
+]
+
+SCALE_ITEMS = [10, 100, 1000]
+
+# Largest accepted PDF size in KB for each receipt type at
+# SIZE_CHECK_ITEMS items. Roughly 25% above the current size,
+# so a logo at full resolution or an uncompressed stream
+# shows up straight away.
+SIZE_CHECK_ITEMS = 5
+
+SIZE_BUDGETS_KB = {
+    "parking": 55,
+    "compound_single": 55,
+    "compound_multi": 55,
+    "license_single": 55,
+    "license_multi": 55,
+    "tax_multi": 20,
+    "tax_bentong": 50,
+    "sewaan_bentong": 50,
+    "bill": 20,
+}
+
+# A p50 this much slower than the baseline is flagged.
+SLOWER_THRESHOLD = 0.10
+
+
+# =========================================================
+# SAMPLE DATA
+# =========================================================
+
+def _items(count, build):
+    return [
+        build(index)
+        for index in range(1, count + 1)
+    ]
+
+
+def build_fixtures(items):
+    """
+    Realistic sample records, shared by the PDF and HTML cases.
+    """
+
+    return {
+        "parking": {
+            "ticket_id": ORDER_NO,
+            "plate": "WXY1234",
+            "hours": 2,
+            "time_in": PAID_DATE,
+            "time_out": PAID_DATE + datetime.timedelta(hours=2),
+            "amount": 2.0,
+            "transaction_type": "QR",
+            "order_no": ORDER_NO,
+            "bank_trx_no": BANK_TRX_NO,
+        },
+        "compound": SimpleNamespace(
+            name="Ahmad bin Abdullah",
+            compoundnum="KMP000123",
+            plate="WXY1234",
+            date=PAID_DATE.date(),
+            time=PAID_DATE.time(),
+            offense="Meletak kenderaan tanpa tiket yang sah",
+            amount=50,
+        ),
+        "compounds": _items(
+            items,
+            lambda index: {
+                "compoundnum": f"KMP{index:06d}",
+                "amount": 50,
+            },
+        ),
+        "license": SimpleNamespace(
+            licensenum="LSN000123",
+            licensetype="Perniagaan",
+            ic="900101015555",
+            amount=120,
+            start_date=PAID_DATE.date(),
+            end_date=PAID_DATE.date(),
+        ),
+        "licenses": _items(
+            items,
+            lambda index: {
+                "licensenumber": f"LSN{index:06d}",
+                "licensetype": "Perniagaan",
+                "expired_date": PAID_DATE.date(),
+                "amount": 120,
+            },
+        ),
+        "taxes": _items(
+            items,
+            lambda index: {
+                "bill_no": f"CT{index:08d}",
+                "property_type": "Kediaman",
+                "house_no": str(index),
+                "street": "Jalan Besar",
+                "zone": "Kuantan",
+                "amount": 80,
+            },
+        ),
+        "tax_bentong_items": _items(
+            items,
+            lambda index: {
+                "account_number": f"A{index:08d}",
+                "owner_name": "Ahmad bin Abdullah",
+                "property_address": "No. 1, Jalan Besar, Bentong",
+                "amount": 80,
+            },
+        ),
+        "sewaan_items": _items(
+            items,
+            lambda index: {
+                "account_number": f"S{index:08d}",
+                "tenant_name": "Ahmad bin Abdullah",
+                "premise_address": "Gerai 1, Pasar Bentong",
+                "amount": 150,
+            },
+        ),
+        "bill": {
+            "paid_date": PAID_DATE,
+            "payment_method": "QR",
+            "bill_type": "TNB",
+            "bill_code": "TNB",
+            "account_number": "220012345678",
+            "bill_amount": 100,
+            "total_amount": 100,
+            "order_no": ORDER_NO,
+            "bank_trx_no": BANK_TRX_NO,
+        },
+    }
+
+
+def build_cases(items):
+    """
+    One zero-argument callable per receipt PDF.
+
+    compound_single times render_single_compound_pdf, which is
+    generate_single_compound_pdf without the blob upload.
+    """
+
+    data = build_fixtures(items)
+
+    return {
+        "parking": lambda: generate_parking_receipt(
+            **data["parking"]
+        ),
+        "compound_single": lambda: render_single_compound_pdf(
+            data["compound"]
+        ),
+        "compound_multi": lambda: generate_multi_compound_pdf(
+            data["compounds"],
+            50 * items,
+        ),
+        "license_single": lambda: render_single_license_pdf(
+            data["license"],
+            "Ahmad bin Abdullah",
+        ),
+        "license_multi": lambda: generate_multi_license_pdf(
+            data["licenses"],
+            120 * items,
+        ),
+        "tax_multi": lambda: generate_multi_tax_pdf(
+            data["taxes"],
+            80 * items,
+        ),
+        "tax_bentong": lambda: generate_tax_receipt_bentong(
+            paid_date=PAID_DATE,
+            payment_method="QR",
+            tax_items=data["tax_bentong_items"],
+            order_no=ORDER_NO,
+            bank_trx_no=BANK_TRX_NO,
+        ),
+        "sewaan_bentong": lambda: generate_sewaan_receipt_bentong(
+            paid_date=PAID_DATE,
+            payment_method="QR",
+            sewaan_items=data["sewaan_items"],
+            order_no=ORDER_NO,
+            bank_trx_no=BANK_TRX_NO,
+        ),
+        "bill": lambda: generate_bill_receipt(
+            **data["bill"]
+        ),
+    }
+
+
+def _skip_asset_upload(filename, content, content_type, cache_control):
+    return f"{ASSET_URL}/{filename}"
+
+
+def build_html_cases(items):
+    """
+    One zero-argument callable per HTML receipt builder.
+
+    The shared stylesheet is not uploaded: the pages link to
+    it at ASSET_URL, so nothing is written to the blob storage.
+    """
+
+    receipt_templates.upload_asset = _skip_asset_upload
+
+    from app.controllers.v2.bill.bill_receipt_route import (
+        generate_bill_receipt_html,
+    )
+    from app.controllers.v2.compound.compound_controller import (
+        build_multi_compound_html,
+        build_single_compound_html,
+    )
+    from app.controllers.v2.licenses.licenses_controller import (
+        _build_multi_license_html,
+        _build_single_license_html,
+    )
+    from app.controllers.v2.parking.transaction_parking_controller import (
+        _generate_parking_receipt_html,
+    )
+    from app.controllers.v2.sewaan.sewaan_controller import (
+        generate_sewaan_receipt_bentong_html,
+    )
+    from app.controllers.v2.tax.tax_controller import (
+        _build_multi_tax_html,
+        generate_tax_receipt_bentong_html,
+    )
+
+    data = build_fixtures(items)
+    compound = data["compound"]
+
+    return {
+        "html_parking": lambda: _generate_parking_receipt_html(
+            **data["parking"],
+            pdf_url=PDF_URL,
+        ),
+        "html_compound_single": lambda: build_single_compound_html(
+            compound.name,
+            compound.compoundnum,
+            compound.plate,
+            compound.date,
+            compound.time,
+            compound.offense,
+            compound.amount,
+            PDF_URL,
+        ),
+        "html_compound_multi": lambda: build_multi_compound_html(
+            data["compounds"],
+            50 * items,
+            PDF_URL,
+        ),
+        "html_license_single": lambda: _build_single_license_html(
+            data["license"],
+            "Ahmad bin Abdullah",
+            PDF_URL,
+        ),
+        "html_license_multi": lambda: _build_multi_license_html(
+            data["licenses"],
+            120 * items,
+            PDF_URL,
+        ),
+        "html_tax_multi": lambda: _build_multi_tax_html(
+            data["taxes"],
+            80 * items,
+            PDF_URL,
+        ),
+        "html_tax_bentong": lambda: generate_tax_receipt_bentong_html(
+            paid_date=PAID_DATE,
+            payment_method="QR",
+            tax_items=data["tax_bentong_items"],
+            pdf_url=PDF_URL,
+            order_no=ORDER_NO,
+            bank_trx_no=BANK_TRX_NO,
+        ),
+        "html_sewaan_bentong": lambda: generate_sewaan_receipt_bentong_html(
+            paid_date=PAID_DATE,
+            payment_method="QR",
+            sewaan_items=data["sewaan_items"],
+            pdf_url=PDF_URL,
+            order_no=ORDER_NO,
+            bank_trx_no=BANK_TRX_NO,
+        ),
+        "html_bill": lambda: generate_bill_receipt_html(
+            **data["bill"],
+            pdf_url=PDF_URL,
+        ),
+    }
+
+
+# =========================================================
+# MEASURE
+# =========================================================
+
+def _output_size(result):
+    if hasattr(result, "getvalue"):
+        return len(result.getvalue())
+
+    if isinstance(result, str):
+        return len(result.encode("utf-8"))
+
+    return len(result)
+
+
+def measure(render, runs):
+    """
+    Time one receipt and return its results.
+
+    The first render loads fonts and images and is not timed.
+    Peak memory comes from one separate traced render, because
+    tracemalloc slows the timed runs down.
+    """
+
+    size = _output_size(render())
+
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+
+    for _ in range(runs):
+        started = time.perf_counter()
+        render()
+        timings.append(
+            (time.perf_counter() - started) * 1000
+        )
+
+    return {
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "peak_kb": round(peak / 1024, 1),
+        "size_kb": round(size / 1024, 1),
+    }
+
+
+# =========================================================
+# BASELINE
+# =========================================================
+
+def load_baseline(path):
+    if not path.exists():
+        return None
+
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(path, results, runs, items):
+    with open(path, "w") as baseline_file:
+        json.dump(
+            {
+                "created_at": datetime.datetime.now().isoformat(
+                    timespec="seconds"
+                ),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "runs": runs,
+                "items": items,
+                "results": results,
+            },
+            baseline_file,
+            indent=2,
+        )
+        baseline_file.write("\n")
+
+    print(f"Baseline saved to {path}")
+
+
+def _change(current, previous):
+    if not previous:
+        return ""
+
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+# =========================================================
+# RUN
+# =========================================================
+
+def run(runs, items, only=None, baseline_path=BASELINE_PATH, save=False):
+    cases = {}
+
+    if only in (None, "pdf"):
+        cases.update(build_cases(items))
+
+    if only in (None, "html"):
+        cases.update(build_html_cases(items))
+
+    baseline = None if save else load_baseline(baseline_path)
+    previous_results = (baseline or {}).get("results", {})
+
+    if baseline and baseline.get("items") != items:
+        print(
+            f"[WARN] Baseline was recorded with "
+            f"--items {baseline.get('items')}, "
+            f"not {items}."
+        )
+
+    print(
+        f"{'receipt':<22}"
+        f"{'p50 ms':>10}"
+        f"{'p99 ms':>10}"
+        f"{'peak KB':>10}"
+        f"{'size KB':>10}"
+        + (
+            f"{'p50 vs base':>13}{'peak vs base':>14}"
+            if previous_results
+            else ""
+        )
+    )
+
+    results = {}
+    slower = []
+
+    for name, render in cases.items():
+        result = measure(render, runs)
+        results[name] = result
+
+        line = (
+            f"{name:<22}"
+            f"{result['p50_ms']:>10.3f}"
+            f"{result['p99_ms']:>10.3f}"
+            f"{result['peak_kb']:>10.0f}"
+            f"{result['size_kb']:>10.1f}"
+        )
+
+        previous = previous_results.get(name)
+
+        if previous:
+            line += (
+                f"{_change(result['p50_ms'], previous['p50_ms']):>13}"
+                f"{_change(result['peak_kb'], previous['peak_kb']):>14}"
+            )
+
+            if result["p50_ms"] > previous["p50_ms"] * (
+                1 + SLOWER_THRESHOLD
+            ):
+                slower.append(name)
+                line += "  SLOWER"
+
+        print(line)
+
+    if save:
+        save_baseline(
+            baseline_path,
+            results,
+            runs,
+            items,
+        )
+    elif slower:
+        print(
+            f"\n{len(slower)} receipt(s) more than "
+            f"{SLOWER_THRESHOLD:.0%} slower than the baseline: "
+            f"{', '.join(slower)}"
+        )
+
+    return results
+
+
+def run_scale(runs):
+    """
+    Render time per item and peak memory for growing item
+    counts. Time per item should stay roughly flat.
+    """
+
+    print(
+        f"{'receipt':<18}"
+        f"{'items':>7}"
+        f"{'p50 ms':>10}"
+        f"{'ms/item':>10}"
+        f"{'peak KB':>10}"
+        f"{'size KB':>10}"
+    )
+
+    for items in SCALE_ITEMS:
+        cases = build_cases(items)
+
+        for name in MULTI_ITEM_RECEIPTS:
+            result = measure(cases[name], runs)
+
+            print(
+                f"{name:<18}"
+                f"{items:>7}"
+                f"{result['p50_ms']:>10.2f}"
+                f"{result['p50_ms'] / items:>10.3f}"
+                f"{result['peak_kb']:>10.0f}"
+                f"{result['size_kb']:>10.1f}"
+            )
+
+
+def run_sizes():
+    """
+    Compare every receipt type against SIZE_BUDGETS_KB.
+
+    Returns the number of receipts over budget.
+    """
+
+    print(
+        f"{'receipt':<18}"
+        f"{'size KB':>10}"
+        f"{'budget KB':>11}"
+        f"{'':>6}"
+    )
+
+    over_budget = 0
+
+    for name, render in build_cases(SIZE_CHECK_ITEMS).items():
+        size = _output_size(render()) / 1024
+        budget = SIZE_BUDGETS_KB[name]
+
+        if size > budget:
+            over_budget += 1
+
+        print(
+            f"{name:<18}"
+            f"{size:>10.1f}"
+            f"{budget:>11}"
+            f"{'OK' if size <= budget else 'OVER':>6}"
+        )
+
+    return over_budget
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark receipt PDF and HTML rendering."
+    )
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument(
+        "--only",
+        choices=["pdf", "html"],
+        help="Only benchmark the PDF or the HTML receipts.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help="Baseline file to compare with or save to.",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as the new baseline.",
+    )
+    parser.add_argument(
+        "--scale",
+        action="store_true",
+        help="Render multi-item receipts at 10, 100 and 1000 items.",
+    )
+    parser.add_argument(
+        "--sizes",
+        action="store_true",
+        help="Check every receipt against its file size budget.",
+    )
+
+    args = parser.parse_args()
+
+    if args.sizes:
+        sys.exit(1 if run_sizes() else 0)
+    elif args.scale:
+        run_scale(min(args.runs, 3))
+    else:
+        run(
+            args.runs,
+            args.items,
+            only=args.only,
+            baseline_path=args.baseline,
+            save=args.save_baseline,
+        )
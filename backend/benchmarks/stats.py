@@ -0,0 +1,16 @@
+"""
+Helpers shared by the benchmark scripts.
+"""
+
+import math
+
+
+def percentile(values, percent):
+    """
+    Nearest-rank percentile of a list of numbers.
+    """
+
+    ordered = sorted(values)
+    rank = math.ceil(percent / 100 * len(ordered))
+
+    return ordered[max(rank, 1) - 1]
@@ -83,11 +83,34 @@ from app.controllers.v2.bill import (
     bill_receipt_route,
 )
 
+from app.controllers.v2.receipt import (
+    receipt_controller as receipt_controller_v2,
+)
+
+from app.controllers.v2.receipt import (
+    short_link_controller,
+)
+
+from app.controllers.v2.settlement import (
+    settlement_controller as settlement_controller_v2,
+)
+
 # =========================================================
 # DATABASE AND UTILITIES
 # =========================================================
 
 from app.db.database import Base, engine
+from app.utils.parking_expiry import (
+    start_expiry_scheduler,
+    stop_expiry_scheduler,
+)
+from app.utils.parking_index import (
+    start_parking_index,
+    stop_parking_index,
+)
+from app.utils.qr_service import use_kiosk_qr_profile
+from app.utils.receipt_engine import warm_up_receipt_engine
+from app.utils.receipt_templates import warm_up_receipt_templates
 from app.utils.sirim_time import sync_sirim_time
 
 
@@ -122,8 +145,47 @@ async def lifespan(app: FastAPI):
             "Using server time as fallback."
         )
 
+    # Load fonts and drawing code before the first receipt request.
+    try:
+        warm_up_receipt_engine()
+
+    except Exception as error:
+        print(
+            f"[ReceiptEngine] Warm-up error: {error}"
+        )
+
+    # Compile the HTML receipt templates.
+    try:
+        warm_up_receipt_templates()
+
+    except Exception as error:
+        print(
+            f"[ReceiptTemplates] Warm-up error: {error}"
+        )
+
+    # Keep active parkings in memory for /parking/check.
+    try:
+        start_parking_index()
+
+    except Exception as error:
+        print(
+            f"[ParkingIndex] Warm-up error: {error}"
+        )
+
+    # Expiry events for enforcement (fed by the parking index).
+    try:
+        start_expiry_scheduler()
+
+    except Exception as error:
+        print(
+            f"[ParkingExpiry] Start error: {error}"
+        )
+
     yield
 
+    stop_expiry_scheduler()
+    stop_parking_index()
+
 
 # =========================================================
 # DATABASE
@@ -183,6 +245,7 @@ app.add_middleware(
         "X-Signature",
         "Idempotency-Key",
         "X-Request-ID",
+        "X-Kiosk-Model",
     ],
 
     # Optional response headers that browser JavaScript
@@ -475,6 +538,7 @@ api_v2_router = APIRouter(
     prefix="/api/v2",
     dependencies=[
         Depends(require_api_key_and_hmac),
+        Depends(use_kiosk_qr_profile),
     ],
 )
 
@@ -510,10 +574,24 @@ api_v2_router.include_router(
     bill_receipt_route.router
 )
 
+api_v2_router.include_router(
+    receipt_controller_v2.router
+)
+
+api_v2_router.include_router(
+    settlement_controller_v2.router
+)
+
 app.include_router(
     api_v2_router
 )
 
+# Short receipt links (/r/<code>) are opened by phones and
+# need no API key or HMAC signature.
+app.include_router(
+    short_link_controller.router
+)
+
 
 
 # =========================================================